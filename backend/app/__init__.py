@@ -1,10 +1,38 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from pydantic import ValidationError
 
 from .api import router
+from .api.routes import admission, cache_snapshot, run_warm_up
+from .core.admission import AdmissionMiddleware
 from .core.config import API_TITLE, API_DESCRIPTION, API_VERSION, CORS_ORIGINS
 from .core.exceptions import PayrollAPIError
+from .core.executor import shutdown_executors
+from .core.responses import FastJSONResponse
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup and shutdown hooks."""
+    # Warm up in the background so /health answers while caches are restored
+    background = [asyncio.create_task(run_warm_up()), asyncio.create_task(cache_snapshot.run_periodic())]
+    yield
+    for task in background:
+        task.cancel()
+    try:
+        cache_snapshot.save()
+    except Exception as e:
+        logger.warning(f"Cache snapshot at shutdown failed: {e}")
+    cache_snapshot.release()
+    shutdown_executors(wait=False)
+
 
 def create_app() -> FastAPI:
     """Create and configure the FastAPI application."""
@@ -12,9 +40,14 @@ def create_app() -> FastAPI:
     app = FastAPI(
         title=API_TITLE,
         description=API_DESCRIPTION,
-        version=API_VERSION
+        version=API_VERSION,
+        lifespan=lifespan,
+        default_response_class=FastJSONResponse
     )
 
+    # Admission control runs inside CORS, so rejections carry CORS headers too
+    app.add_middleware(AdmissionMiddleware, controller=admission)
+
     # Configure CORS
     app.add_middleware(
         CORSMiddleware,
@@ -27,19 +60,27 @@ def create_app() -> FastAPI:
     # Add exception handlers
     @app.exception_handler(PayrollAPIError)
     async def payroll_api_error_handler(request, exc: PayrollAPIError):
-        return {
-            "status_code": exc.status_code,
-            "detail": exc.message,
-            "type": exc.__class__.__name__
-        }
+        retry_after = getattr(exc, "retry_after", None)
+        return JSONResponse(
+            status_code=exc.status_code,
+            content={
+                "status_code": exc.status_code,
+                "detail": exc.message,
+                "type": exc.__class__.__name__
+            },
+            headers={"Retry-After": str(retry_after)} if retry_after else None
+        )
 
     @app.exception_handler(ValidationError)
     async def validation_error_handler(request, exc: ValidationError):
-        return {
-            "status_code": 422,
-            "detail": str(exc),
-            "type": "ValidationError"
-        }
+        return JSONResponse(
+            status_code=422,
+            content={
+                "status_code": 422,
+                "detail": str(exc),
+                "type": "ValidationError"
+            }
+        )
 
     # Include routers
     app.include_router(router)
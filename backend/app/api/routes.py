@@ -1,23 +1,60 @@
-from fastapi import APIRouter, File, UploadFile, HTTPException, Depends
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, File, Form, Header, UploadFile, HTTPException, Depends
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from datetime import datetime
 import logging
-import pandas as pd
 import io
 import json
+from typing import List, Optional, Union
+
+import pandas as pd
 from ..models import (
     PayrollData, 
     AnalysisResponse, 
     CSVResponse, 
+    DatasetResponse,
     MappingRequest, 
     MappingResponse,
+    MappingLookupRequest,
+    StoredMappingResponse,
     PolicySimulationRequest,
     PolicySimulationResponse,
+    ScenarioMatrixRequest,
+    ScenarioMatrixResponse,
+    RiskSimulationRequest,
+    RiskSimulationResponse,
+    ProjectionRequest,
+    ProjectionResponse,
+    ShadowPayrollRequest,
+    ShadowPayrollResponse,
+    ComplianceAnalysisRequest,
+    ComplianceAnalysisResponse,
+    ValidationRequest,
+    ValidationResponse,
     ExportStandardizedRequest
 )
-from ..services import PayrollService, CSVService, ComplianceAnalysisService
-from ..core.config import STANDARD_FIELDS
-from ..utils.mapping_utils import construct_standardized_row
+from ..services import (
+    PayrollService, CSVService, ComplianceAnalysisService, ExportService, ValidationService
+)
+from ..core.admission import AdmissionController, AdmissionLimit
+from ..core.config import (
+    ADMISSION_BULK_CONCURRENCY,
+    ADMISSION_BULK_QUEUE,
+    ADMISSION_COMPUTE_CONCURRENCY,
+    ADMISSION_COMPUTE_QUEUE,
+    ADMISSION_LLM_CONCURRENCY,
+    ADMISSION_LLM_QUEUE,
+    MAX_DATASET_FILE_SIZE,
+    SAMPLE_ROWS_LIMIT,
+    STANDARD_FIELDS,
+)
+from ..core.exceptions import ValidationAPIError
+from ..core.executor import get_executor_stats, run_io_bound
+from ..core.responses import fast_response, frame_rows
+from ..services.cache_snapshot import CacheSnapshot, WarmUp
+from ..services.cost_engine import rows_frame
+from ..services.dataset_service import create_dataset_store
+from ..services.fx_history import load_fx_history
+from ..utils.upload_spool import spool_upload
 
 router = APIRouter()
 
@@ -25,9 +62,80 @@ router = APIRouter()
 payroll_service = PayrollService()
 csv_service = CSVService()
 compliance_service = ComplianceAnalysisService()
+export_service = ExportService()
+dataset_store = create_dataset_store()
+validation_service = ValidationService()
+
+# Hot caches saved across restarts, and the startup readiness signal
+cache_snapshot = CacheSnapshot({
+    "mapping_suggestions": payroll_service.suggestion_cache,
+    "simulation_results": payroll_service.policy_service.result_cache,
+    "compliance_heatmap": compliance_service.heatmap_cache,
+})
+warm_up = WarmUp()
+
+# Admission control classes of the expensive routes; all other routes are never queued
+admission = AdmissionController(
+    {
+        name: AdmissionLimit(name, concurrency, queue)
+        for name, concurrency, queue in [
+            ("llm", ADMISSION_LLM_CONCURRENCY, ADMISSION_LLM_QUEUE),
+            ("compute", ADMISSION_COMPUTE_CONCURRENCY, ADMISSION_COMPUTE_QUEUE),
+            ("bulk", ADMISSION_BULK_CONCURRENCY, ADMISSION_BULK_QUEUE),
+        ]
+        if concurrency > 0
+    },
+    {
+        "/analyze": "llm",
+        "/simulate_policy_impact": "compute",
+        "/simulate_scenarios": "compute",
+        "/simulate_risk": "compute",
+        "/simulate_projection": "compute",
+        "/shadow_payroll": "compute",
+        "/compliance_analysis": "compute",
+        "/validate_dataset": "compute",
+        "/upload": "bulk",
+        "/upload_dataset": "bulk",
+        "/validate_file": "bulk",
+        "/export_standardized": "bulk",
+        "/export_standardized_file": "bulk",
+    }
+)
 
 logger = logging.getLogger(__name__)
 
+
+def _load_reference_data() -> None:
+    """Build the lazily loaded reference data (FX history, heatmap) before serving."""
+    load_fx_history()
+    compliance_service.heatmap_snapshot()
+
+
+async def run_warm_up() -> None:
+    """Startup warm-up: restore the cache snapshot, then load reference data."""
+    await warm_up.run(cache_snapshot.restore, _load_reference_data)
+
+
+def _validate_reporting_currency(currency: Optional[str]) -> None:
+    """Reject export reporting currencies the currency engine cannot convert to."""
+    if currency and currency not in export_service.currency_engine:
+        raise ValidationAPIError(f"Unsupported reporting currency: {currency}")
+
+
+def _validate_fx_date_column(column: str, headers: List[str]) -> None:
+    """Reject FX date columns that are neither a standard field nor a source header."""
+    if column not in STANDARD_FIELDS and column not in headers:
+        raise ValidationAPIError(f"Unknown FX date column: {column}")
+
+
+def _request_frame(request: Union[ComplianceAnalysisRequest, ValidationRequest]) -> pd.DataFrame:
+    """The stored dataset a request names, or its inline headers and rows."""
+    if request.dataset_id:
+        return dataset_store.get(request.dataset_id)
+    if request.headers:
+        return rows_frame(request.headers, request.rows)
+    raise ValidationAPIError("Either dataset_id or headers and rows are required")
+
 @router.get("/ping")
 async def ping_check():
     """Simple ping check endpoint."""
@@ -38,8 +146,29 @@ async def health_check():
     """Health check endpoint for Docker."""
     return {"status": "ok", "message": "API is running"}
 
+@router.get("/ready")
+async def readiness_check():
+    """Readiness probe: 503 until the startup warm-up (cache restore, reference data) has finished."""
+    content = {**warm_up.stats(), "cache_snapshot": cache_snapshot.stats()}
+    return JSONResponse(status_code=200 if warm_up.ready else 503, content=content)
+
+@router.get("/metrics")
+async def get_metrics():
+    """Runtime metrics for the executor pools, dataset store, caches and admission control."""
+    return {
+        "executors": get_executor_stats(),
+        "datasets": dataset_store.stats(),
+        "simulation_cache": payroll_service.policy_service.result_cache.stats(),
+        "simulation_intermediates": payroll_service.policy_service.intermediates.stats(),
+        "mapping_suggestions": payroll_service.suggestion_cache.stats(),
+        "cache_snapshot": cache_snapshot.stats(),
+        "admission": admission.stats()
+    }
+
 @router.post("/analyze", response_model=AnalysisResponse)
-async def analyze_payroll_data(data: PayrollData) -> AnalysisResponse:
+async def analyze_payroll_data(
+    data: PayrollData, accept_encoding: Optional[str] = Header(default=None)
+) -> Response:
     """
     Analyze payroll data headers and suggest field mappings.
 
@@ -51,16 +180,20 @@ async def analyze_payroll_data(data: PayrollData) -> AnalysisResponse:
     """
     result = await payroll_service.analyze_payroll_data(data.headers, data.rows)
     
-    return AnalysisResponse(
+    return await fast_response(AnalysisResponse(
         mappings=result["mappings"],
         notes=result["notes"]
-    )
+    ), accept_encoding)
 
 @router.post("/upload", response_model=CSVResponse)
-async def upload_csv(file: UploadFile = File(...)) -> CSVResponse:
+async def upload_csv(
+    file: UploadFile = File(...), accept_encoding: Optional[str] = Header(default=None)
+) -> Response:
     """
     Upload and parse a CSV file.
 
+    Rows are serialized directly, without building a response model.
+
     Args:
         file (UploadFile): The CSV file to upload and parse
 
@@ -69,31 +202,88 @@ async def upload_csv(file: UploadFile = File(...)) -> CSVResponse:
     """
     headers, sample_rows = await csv_service.parse_csv(file)
     
-    return CSVResponse(
-        headers=headers,
-        rows=sample_rows
-    )
+    return await fast_response({"headers": headers, "rows": sample_rows}, accept_encoding)
+
+@router.post("/upload_dataset", response_model=DatasetResponse)
+async def upload_dataset(
+    file: UploadFile = File(...), accept_encoding: Optional[str] = Header(default=None)
+) -> Response:
+    """
+    Upload a complete CSV file and store the parsed dataset.
+
+    Large files are parsed in parallel across worker processes.
+
+    Args:
+        file (UploadFile): The CSV file to ingest
+
+    Returns:
+        DatasetResponse: Dataset id, headers, row count and sample rows
+    """
+    df, ingestion = await csv_service.load_dataset(file)
+    dataset_id = dataset_store.put(df, {"filename": file.filename, **ingestion})
+
+    return await fast_response({
+        "dataset_id": dataset_id,
+        "content_hash": ingestion["sha256"],
+        "headers": [str(header) for header in df.columns],
+        "row_count": len(df),
+        "rows": frame_rows(df.head(SAMPLE_ROWS_LIMIT)),
+        "memory": ingestion["memory"]
+    }, accept_encoding)
 
 @router.post("/finalize", response_model=MappingResponse)
 async def finalize_mappings(mapping_request: MappingRequest) -> MappingResponse:
     """
     Finalize and store the field mappings.
     
+    Mappings are persisted and shared by all worker processes.
+    
     Args:
         mapping_request: MappingRequest object containing field mappings
         
     Returns:
         MappingResponse indicating success status
     """
-    result = payroll_service.finalize_mappings(mapping_request.mappings)
+    result = await run_io_bound(
+        payroll_service.finalize_mappings,
+        mapping_request.mappings,
+        mapping_request.headers,
+        mapping_request.source_system
+    )
     
     return MappingResponse(
         status=result["status"],
-        mapping_saved=result["mapping_saved"]
+        mapping_saved=result["mapping_saved"],
+        mapping_id=result["mapping_id"]
+    )
+
+@router.post("/lookup_mapping", response_model=StoredMappingResponse)
+async def lookup_mapping(request: MappingLookupRequest) -> StoredMappingResponse:
+    """
+    Get the most recently finalized mapping for a schema.
+    
+    Args:
+        request: MappingLookupRequest with the source headers
+        
+    Returns:
+        StoredMappingResponse with the mapping, or found=False
+    """
+    record = await run_io_bound(payroll_service.latest_mapping, request.headers, request.source_system)
+    if record is None:
+        return StoredMappingResponse(found=False)
+    
+    return StoredMappingResponse(
+        found=True,
+        mapping_id=record["mapping_id"],
+        source_system=record["source_system"],
+        mappings=record["mappings"],
+        created_at=record["created_at"]
     )
 
 @router.post("/simulate_policy_impact", response_model=PolicySimulationResponse)
-async def simulate_policy_impact(request: PolicySimulationRequest) -> PolicySimulationResponse:
+async def simulate_policy_impact(
+    request: PolicySimulationRequest, accept_encoding: Optional[str] = Header(default=None)
+) -> Response:
     """
     Simulate the impact of policy changes on payroll data.
     
@@ -106,45 +296,240 @@ async def simulate_policy_impact(request: PolicySimulationRequest) -> PolicySimu
     result = await payroll_service.simulate_policy_impact(
         headers=request.headers,
         rows=request.rows,
-        policy_change=request.policy_change
+        policy_change=request.policy_change,
+        mappings=request.mappings,
+        fx_date_column=request.fx_date_column
     )
     
-    return PolicySimulationResponse(
+    return await fast_response(PolicySimulationResponse(
         impact_summary=result["impact_summary"],
         cost_analysis=result["cost_analysis"],
         compliance_notes=result["compliance_notes"],
         recommendations=result["recommendations"]
+    ), accept_encoding)
+
+
+@router.post("/simulate_scenarios", response_model=ScenarioMatrixResponse)
+async def simulate_scenarios(request: ScenarioMatrixRequest) -> ScenarioMatrixResponse:
+    """
+    Compare many policy changes (or every supported country) on one dataset.
+    
+    Args:
+        request: ScenarioMatrixRequest containing headers, rows and policy changes
+        
+    Returns:
+        ScenarioMatrixResponse with scenarios ranked by projected employer cost
+    """
+    result = await payroll_service.simulate_scenarios(
+        headers=request.headers,
+        rows=request.rows,
+        policy_changes=request.policy_changes,
+        all_countries=request.all_countries,
+        reporting_currency=request.reporting_currency,
+        mappings=request.mappings,
+        fx_date_column=request.fx_date_column
     )
+    
+    return ScenarioMatrixResponse(**result)
+
+
+@router.post("/simulate_risk", response_model=RiskSimulationResponse)
+async def simulate_risk(request: RiskSimulationRequest) -> RiskSimulationResponse:
+    """
+    Monte Carlo FX and tax-rate sensitivity analysis for policy changes.
+    
+    Args:
+        request: RiskSimulationRequest with the dataset, policy changes and simulation options
+        
+    Returns:
+        RiskSimulationResponse with P5/P50/P95 costs and value-at-risk
+    """
+    result = await payroll_service.simulate_risk(
+        headers=request.headers,
+        rows=request.rows,
+        policy_changes=request.policy_changes,
+        all_countries=request.all_countries,
+        paths=request.paths,
+        fx_volatility=request.fx_volatility,
+        rate_volatility=request.rate_volatility,
+        horizon_years=request.horizon_years,
+        confidence=request.confidence,
+        seed=request.seed,
+        currency_volatility=request.currency_volatility,
+        mappings=request.mappings
+    )
+    
+    return RiskSimulationResponse(**result)
+
+
+@router.post("/simulate_projection", response_model=ProjectionResponse)
+async def simulate_projection(request: ProjectionRequest) -> ProjectionResponse:
+    """
+    Month-by-month cost projection of a policy change.
+    
+    Args:
+        request: ProjectionRequest with the dataset, policy change and time assumptions
+        
+    Returns:
+        ProjectionResponse with monthly and cumulative current and projected costs
+    """
+    result = await payroll_service.simulate_projection(
+        headers=request.headers,
+        rows=request.rows,
+        policy_change=request.policy_change,
+        horizon_months=request.horizon_months,
+        start_month=request.start_month,
+        raise_phases=request.raise_phases,
+        annual_raise=request.annual_raise,
+        bonus_months=request.bonus_months,
+        fx_drift=request.fx_drift,
+        mappings=request.mappings
+    )
+    
+    return ProjectionResponse(**result)
+
+
+@router.post("/shadow_payroll", response_model=ShadowPayrollResponse)
+async def shadow_payroll(request: ShadowPayrollRequest) -> ShadowPayrollResponse:
+    """
+    Host-country tax and social security for employees working outside their home payroll country.
+    
+    Args:
+        request: ShadowPayrollRequest with the dataset and home payroll country
+        
+    Returns:
+        ShadowPayrollResponse with liabilities per home/host country pair
+    """
+    result = await payroll_service.simulate_shadow_payroll(
+        headers=request.headers,
+        rows=request.rows,
+        home_country=request.home_country,
+        home_country_column=request.home_country_column,
+        reporting_currency=request.reporting_currency,
+        mappings=request.mappings
+    )
+    
+    return ShadowPayrollResponse(**result)
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches ``etag`` (weak comparison, lists and "*")."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
 
 
 @router.get("/compliance_heatmap")
-async def get_compliance_heatmap():
+async def get_compliance_heatmap(if_none_match: Optional[str] = Header(default=None)):
     """
     Get global compliance risk heatmap
     
     Returns a heatmap showing compliance risk levels for different countries
     based on regulatory complexity, data protection requirements, and other factors.
+    The body is built once per version of the risk data and served with an
+    ETag; a matching If-None-Match gets 304 Not Modified.
     """
-    logger.info("Received request for compliance heatmap")
-    
     try:
-        # Generate compliance risk analysis
-        # Note: In a real implementation, this might use actual mapping data
-        # from recent uploads or policy simulations to improve accuracy
-        compliance_heatmap = compliance_service.analyze_compliance_risks()
-        
-        logger.info(f"Generated compliance heatmap for {len(compliance_heatmap)} countries")
-        
-        return {
-            "compliance_heatmap": compliance_heatmap,
-            "last_updated": datetime.utcnow().isoformat(),
-            "total_countries": len(compliance_heatmap)
-        }
-        
+        snapshot = compliance_service.heatmap_snapshot()
     except Exception as e:
         logger.error(f"Error generating compliance heatmap: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error generating compliance heatmap: {str(e)}")
 
+    # Clients may cache but must revalidate, which is a 304 while nothing changed
+    headers = {"ETag": snapshot.etag, "Cache-Control": "no-cache"}
+    if _etag_matches(if_none_match, snapshot.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
+
+
+@router.post("/compliance_analysis", response_model=ComplianceAnalysisResponse)
+async def compliance_analysis(request: ComplianceAnalysisRequest) -> ComplianceAnalysisResponse:
+    """
+    Compliance risk of a dataset, per country its employees are located in.
+    
+    Args:
+        request: ComplianceAnalysisRequest with inline rows or an uploaded dataset id
+        
+    Returns:
+        ComplianceAnalysisResponse with exposure-weighted risk and data gaps per country
+    """
+    result = await run_io_bound(
+        compliance_service.analyze_dataset,
+        _request_frame(request),
+        mapping=request.mappings,
+        reporting_currency=request.reporting_currency
+    )
+    
+    return ComplianceAnalysisResponse(**result)
+
+
+@router.post("/validate_dataset", response_model=ValidationResponse)
+async def validate_dataset(request: ValidationRequest) -> ValidationResponse:
+    """
+    Check payroll values row by row (ids, salaries, tax rates, currencies, dates).
+    
+    Args:
+        request: ValidationRequest with inline rows or an uploaded dataset id
+        
+    Returns:
+        ValidationResponse with counts and first offending rows per rule
+    """
+    result = await validation_service.validate_dataset(
+        _request_frame(request),
+        mapping=request.mappings,
+        max_errors=request.max_errors,
+        sample_rows=request.sample_rows
+    )
+    
+    return ValidationResponse(**result)
+
+
+@router.post("/validate_file", response_model=ValidationResponse)
+async def validate_file(
+    file: UploadFile = File(...),
+    mappings: Optional[str] = Form(None),
+    max_errors: Optional[int] = Form(None)
+) -> ValidationResponse:
+    """
+    Check payroll values of an uploaded file of any size, out-of-core.
+
+    With ``max_errors`` the file is read in growing chunks and rejected as
+    soon as more rows than the budget have an error.
+
+    Args:
+        file: The source CSV file
+        mappings: Optional JSON object of field mappings (inferred from the headers when omitted)
+        max_errors: Optional error budget
+
+    Returns:
+        ValidationResponse with counts and first offending rows per rule
+    """
+    field_mappings = None
+    if mappings:
+        try:
+            field_mappings = json.loads(mappings)
+        except json.JSONDecodeError:
+            raise ValidationAPIError("mappings must be a JSON object")
+        if not isinstance(field_mappings, dict):
+            raise ValidationAPIError("mappings must be a JSON object")
+    if max_errors is not None and max_errors < 0:
+        raise ValidationAPIError("max_errors must not be negative")
+
+    csv_service.validate_file(file)
+    try:
+        upload = await spool_upload(file, MAX_DATASET_FILE_SIZE)
+    finally:
+        await file.close()
+
+    with upload:
+        encoding = await run_io_bound(csv_service.detect_encoding, upload.path)
+        result = await validation_service.validate_upload(
+            upload.path, field_mappings, max_errors, encoding=encoding
+        )
+
+    return ValidationResponse(**result)
+
 
 @router.post("/export_standardized")
 async def export_standardized(request: ExportStandardizedRequest):
@@ -175,11 +560,11 @@ async def export_standardized(request: ExportStandardizedRequest):
         }
     """
     logger.info(f"Received export request with {len(request.rows)} rows and {len(request.mappings)} mappings")
+    _validate_reporting_currency(request.reporting_currency)
+    if request.fx_date_column and request.rows:
+        _validate_fx_date_column(request.fx_date_column, list(request.rows[0].keys()))
     
     try:
-        # Convert input data to the format expected by construct_standardized_row
-        # The function expects headers (list) and rows (list of lists), but we have list of dicts
-        
         if not request.rows:
             logger.warning("No rows provided for export")
             raise HTTPException(status_code=400, detail="No data rows provided for export")
@@ -188,60 +573,106 @@ async def export_standardized(request: ExportStandardizedRequest):
             logger.warning("No mappings provided for export")
             raise HTTPException(status_code=400, detail="No field mappings provided for export")
         
-        # Extract headers from the first row (all rows should have same keys)
-        headers = list(request.rows[0].keys())
-        logger.info(f"Detected headers: {headers}")
-        
-        # Convert list of dicts to list of lists (rows format)
-        data_rows = []
-        for row_dict in request.rows:
-            # Ensure consistent ordering based on headers
-            row_list = [row_dict.get(header, "") for header in headers]
-            data_rows.append(row_list)
-        
-        # Process each row to create standardized data
-        standardized_data = []
-        for row in data_rows:
-            standardized_row = construct_standardized_row(row, headers, request.mappings)
-            standardized_data.append(standardized_row)
-        
-        logger.info(f"Successfully processed {len(standardized_data)} rows")
-        
-        # Create pandas DataFrame with standardized data
-        df = pd.DataFrame(standardized_data)
-        
-        # Ensure all STANDARD_FIELDS are present as columns (add missing ones as empty)
-        for field in STANDARD_FIELDS:
-            if field not in df.columns:
-                df[field] = ""
-        
-        # Reorder columns to match STANDARD_FIELDS order
-        df = df[STANDARD_FIELDS]
-        
-        # Fill NaN values with empty strings for cleaner export
-        df = df.fillna("")
-        
-        # Convert DataFrame to CSV
-        csv_buffer = io.StringIO()
-        df.to_csv(csv_buffer, index=False, encoding='utf-8')
-        csv_content = csv_buffer.getvalue()
+        (
+            csv_content, row_count, column_count, unknown_currencies, unconverted_rows
+        ) = await export_service.export_standardized(
+            request.rows, request.mappings, request.reporting_currency, request.fx_date_column
+        )
         
         # Create filename with timestamp
         timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
         filename = f"standardized_export_{timestamp}.csv"
         
-        logger.info(f"Generated CSV export with {len(df)} rows and {len(df.columns)} columns: {filename}")
+        logger.info(f"Generated CSV export with {row_count} rows and {column_count} columns: {filename}")
+        
+        headers = {
+            "Content-Disposition": f"attachment; filename={filename}",
+            "Content-Type": "text/csv; charset=utf-8"
+        }
+        if unknown_currencies:
+            # Rows in these currencies were exported unconverted
+            headers["X-Unknown-Currencies"] = ",".join(unknown_currencies)
+        if unconverted_rows:
+            # Rows whose amounts did not parse keep their amounts and currency
+            headers["X-Unconverted-Rows"] = str(unconverted_rows)
         
         # Return CSV as downloadable file
         return StreamingResponse(
             io.BytesIO(csv_content.encode('utf-8')),
             media_type="text/csv",
-            headers={
-                "Content-Disposition": f"attachment; filename={filename}",
-                "Content-Type": "text/csv; charset=utf-8"
-            }
+            headers=headers
         )
         
     except Exception as e:
         logger.error(f"Error in export_standardized: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Error generating standardized export: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Error generating standardized export: {str(e)}")
+
+
+@router.post("/export_standardized_file")
+async def export_standardized_file(
+    file: UploadFile = File(...),
+    mappings: str = Form(...),
+    reporting_currency: Optional[str] = Form(None),
+    fx_date_column: Optional[str] = Form(None)
+):
+    """
+    Export a standardized CSV for an uploaded file of any size.
+
+    The file is processed out-of-core: it is read in PIPELINE_CHUNK_ROWS row
+    chunks, each chunk is mapped to STANDARD_FIELDS, normalized and streamed
+    to the client before the next chunk is read.
+
+    Args:
+        file: The source CSV file
+        mappings: JSON object of field mappings from source to standard fields
+        reporting_currency: Optional currency to convert salary and bonus into;
+            rows in unknown currencies keep their original amount and currency
+        fx_date_column: Optional standard field or source column whose dates
+            select historical exchange rates for the conversion
+
+    Returns:
+        StreamingResponse with CSV file download
+    """
+    try:
+        field_mappings = json.loads(mappings)
+    except json.JSONDecodeError:
+        raise ValidationAPIError("mappings must be a JSON object")
+    if not isinstance(field_mappings, dict) or not field_mappings:
+        raise ValidationAPIError("No field mappings provided for export")
+    _validate_reporting_currency(reporting_currency)
+
+    csv_service.validate_file(file)
+    try:
+        upload = await spool_upload(file, MAX_DATASET_FILE_SIZE)
+    finally:
+        await file.close()
+
+    try:
+        encoding = await run_io_bound(csv_service.detect_encoding, upload.path)
+        if fx_date_column and fx_date_column not in STANDARD_FIELDS:
+            headers = await run_io_bound(ExportService.read_source_headers, upload.path, encoding)
+            _validate_fx_date_column(fx_date_column, headers)
+    except Exception:
+        upload.cleanup()
+        raise
+
+    async def stream():
+        with upload:
+            async for piece in export_service.stream_standardized_csv(
+                upload.path, field_mappings, encoding,
+                reporting_currency=reporting_currency, fx_date_column=fx_date_column
+            ):
+                yield piece
+
+    timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    filename = f"standardized_export_{timestamp}.csv"
+    logger.info(f"Streaming out-of-core standardized export: {filename}")
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/csv",
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}",
+            "Content-Type": "text/csv; charset=utf-8"
+        }
+    )
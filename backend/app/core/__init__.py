@@ -1,5 +1,5 @@
 from .config import STANDARD_FIELDS, CORS_ORIGINS, API_TITLE, API_DESCRIPTION, API_VERSION
-from .exceptions import PayrollAPIError, ValidationAPIError, ProcessingAPIError, ServiceUnavailableError
+from .exceptions import PayrollAPIError, ValidationAPIError, NotFoundAPIError, PayloadTooLargeError, ProcessingAPIError, ServiceUnavailableError
 
 __all__ = [
     "STANDARD_FIELDS",
@@ -9,6 +9,8 @@ __all__ = [
     "API_VERSION",
     "PayrollAPIError",
     "ValidationAPIError", 
+    "NotFoundAPIError",
+    "PayloadTooLargeError",
     "ProcessingAPIError",
     "ServiceUnavailableError"
 ] 
\ No newline at end of file
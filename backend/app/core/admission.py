@@ -0,0 +1,275 @@
+"""
+Admission control for expensive routes.
+
+Expensive routes are grouped in classes (LLM-bound mapping analysis,
+compute-bound simulations, long-running uploads and exports). Each class
+admits a fixed number of concurrent requests per worker. Further
+requests wait in a bounded queue for at most ADMISSION_QUEUE_TIMEOUT_SECONDS
+and are rejected fast otherwise, so a burst of heavy calls cannot pile up
+on the executor pools and starve light routes (/health,
+/compliance_heatmap), which are never queued:
+
+- 503 with Retry-After when the class queue is full or the wait timed out;
+- 429 with Retry-After when the client already has ADMISSION_CLIENT_QUEUE
+  requests waiting in the class.
+
+Freed slots go to waiting clients in round-robin order (first in, first
+out per client), so one client submitting many requests cannot delay
+everybody else's. Clients are identified by their peer address; behind
+a proxy listed in TRUSTED_PROXIES, by the rightmost X-Forwarded-For address
+that is not a trusted proxy itself (clients can put anything in front of
+it). Retry-After is the expected time to drain the queue from the recent
+average service time.
+
+Admission runs as ASGI middleware, before the request body is read, and
+a slot is held until the response (including a streamed body) is sent.
+Limits apply per worker process.
+"""
+
+import asyncio
+import ipaddress
+import math
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Iterable, List, Mapping, Optional, Union
+
+from fastapi.responses import JSONResponse
+
+from .config import ADMISSION_CLIENT_QUEUE, ADMISSION_QUEUE_TIMEOUT_SECONDS, TRUSTED_PROXIES
+from .exceptions import PayrollAPIError, ServerBusyError, TooManyRequestsError
+
+# Smoothing of the average service time used for Retry-After
+_SERVICE_TIME_WEIGHT = 0.2
+_MAX_RETRY_AFTER_SECONDS = 60
+
+
+class AdmissionLimit:
+    """Concurrency cap with a bounded, per-client fair wait queue."""
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrent: int,
+        max_queue: int,
+        queue_timeout: float = ADMISSION_QUEUE_TIMEOUT_SECONDS,
+        client_queue: int = ADMISSION_CLIENT_QUEUE,
+    ):
+        """
+        Args:
+            name: Route class name
+            max_concurrent: Requests served at once
+            max_queue: Requests waiting at once (beyond that: 503)
+            queue_timeout: Longest wait for a slot in seconds (then 503)
+            client_queue: Requests one client may have waiting (beyond that: 429)
+        """
+        self.name = name
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        self.client_queue = max(1, client_queue)
+        self._active = 0
+        self._queued = 0
+        self._waiters: "OrderedDict[str, Deque[asyncio.Future]]" = OrderedDict()
+        self._service_seconds = 1.0
+        self._admitted = 0
+        self._rejected_queue_full = 0
+        self._rejected_client = 0
+        self._timeouts = 0
+        self._max_queue_depth = 0
+        self._total_wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+        self._waited = 0
+
+    def retry_after(self) -> int:
+        """Seconds until the current queue is expected to drain (1-60)."""
+        seconds = self._service_seconds * (self._queued + 1) / self.max_concurrent
+        return max(1, min(_MAX_RETRY_AFTER_SECONDS, math.ceil(seconds)))
+
+    async def acquire(self, client: str) -> float:
+        """
+        Wait for a slot.
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            ServerBusyError: If the queue is full or the wait timed out
+            TooManyRequestsError: If the client has too many requests waiting
+        """
+        if self._active < self.max_concurrent and not self._queued:
+            self._active += 1
+            self._admitted += 1
+            return 0.0
+        if self._queued >= self.max_queue:
+            self._rejected_queue_full += 1
+            raise ServerBusyError(f"Too many {self.name} requests in progress", self.retry_after())
+        waiters = self._waiters.get(client)
+        if waiters is not None and len(waiters) >= self.client_queue:
+            self._rejected_client += 1
+            raise TooManyRequestsError(f"Too many {self.name} requests waiting for this client", self.retry_after())
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(client, deque()).append(future)
+        self._queued += 1
+        self._max_queue_depth = max(self._max_queue_depth, self._queued)
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.shield(future), self.queue_timeout)
+        except asyncio.TimeoutError:
+            # A slot handed over as the timeout fired is still ours
+            if not future.done():
+                self._withdraw(client, future)
+                self._timeouts += 1
+                raise ServerBusyError(
+                    f"Timed out waiting for a {self.name} slot", self.retry_after()
+                )
+        except asyncio.CancelledError:
+            if future.done():
+                self.release()
+            else:
+                self._withdraw(client, future)
+                future.cancel()
+            raise
+
+        waited = time.perf_counter() - started
+        self._waited += 1
+        self._total_wait_seconds += waited
+        self._max_wait_seconds = max(self._max_wait_seconds, waited)
+        return waited
+
+    def _withdraw(self, client: str, future: asyncio.Future) -> None:
+        waiters = self._waiters.get(client)
+        if waiters is not None and future in waiters:
+            waiters.remove(future)
+            self._queued -= 1
+            if not waiters:
+                del self._waiters[client]
+
+    def release(self, service_seconds: Optional[float] = None) -> None:
+        """Free a slot, handing it to the next client in round-robin order."""
+        if service_seconds is not None:
+            self._service_seconds += _SERVICE_TIME_WEIGHT * (service_seconds - self._service_seconds)
+        while self._waiters:
+            client, waiters = next(iter(self._waiters.items()))
+            future = waiters.popleft()
+            self._queued -= 1
+            if waiters:
+                self._waiters.move_to_end(client)
+            else:
+                del self._waiters[client]
+            if not future.done():
+                future.set_result(None)
+                self._admitted += 1
+                return
+        self._active -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return a snapshot of the admission metrics."""
+        return {
+            "max_concurrent": self.max_concurrent,
+            "active": self._active,
+            "queue_depth": self._queued,
+            "max_queue": self.max_queue,
+            "max_queue_depth": self._max_queue_depth,
+            "waiting_clients": len(self._waiters),
+            "admitted": self._admitted,
+            "rejected_queue_full": self._rejected_queue_full,
+            "rejected_client": self._rejected_client,
+            "timeouts": self._timeouts,
+            "avg_wait_seconds": round(self._total_wait_seconds / self._waited, 6) if self._waited else 0.0,
+            "max_wait_seconds": round(self._max_wait_seconds, 6),
+            "avg_service_seconds": round(self._service_seconds, 6),
+        }
+
+
+class AdmissionController:
+    """Route paths -> admission limits."""
+
+    def __init__(self, limits: Mapping[str, AdmissionLimit], routes: Mapping[str, str]):
+        """
+        Args:
+            limits: Route class name -> limit; classes without a limit are not queued
+            routes: Route path -> route class name
+        """
+        self.limits = dict(limits)
+        self.routes = {path: self.limits[name] for path, name in routes.items() if name in self.limits}
+
+    def limit_for(self, path: str) -> Optional[AdmissionLimit]:
+        return self.routes.get(path)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: limit.stats() for name, limit in self.limits.items()}
+
+
+Network = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+
+def proxy_networks(proxies: Iterable[str]) -> List[Network]:
+    """Parse proxy addresses and CIDR networks."""
+    return [ipaddress.ip_network(proxy, strict=False) for proxy in proxies]
+
+
+_TRUSTED_NETWORKS = proxy_networks(TRUSTED_PROXIES)
+
+
+def _trusted(address: str, networks: List[Network]) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in networks)
+
+
+def client_key(scope: Mapping[str, Any], trusted: Optional[List[Network]] = None) -> str:
+    """
+    Client address of a request.
+
+    The peer address, unless the peer is a trusted proxy: then the rightmost
+    X-Forwarded-For address that is not a trusted proxy (the leftmost when
+    every hop is trusted).
+    """
+    networks = _TRUSTED_NETWORKS if trusted is None else trusted
+    client = scope.get("client")
+    peer = client[0] if client else ""
+    if not _trusted(peer, networks):
+        return peer
+    hops = [
+        hop.strip()
+        for name, value in scope.get("headers", [])
+        if name == b"x-forwarded-for"
+        for hop in value.decode("latin-1").split(",")
+    ]
+    hops = [hop for hop in hops if hop]
+    for hop in reversed(hops):
+        if not _trusted(hop, networks):
+            return hop
+    return hops[0] if hops else peer
+
+
+class AdmissionMiddleware:
+    """ASGI middleware holding an admission slot for each request to a limited route."""
+
+    def __init__(self, app, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send) -> None:
+        limit = self.controller.limit_for(scope["path"]) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+        try:
+            await limit.acquire(client_key(scope))
+        except PayrollAPIError as exc:
+            response = JSONResponse(
+                status_code=exc.status_code,
+                content={"status_code": exc.status_code, "detail": exc.message, "type": exc.__class__.__name__},
+                headers={"Retry-After": str(exc.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limit.release(time.perf_counter() - started)
@@ -37,5 +37,124 @@ API_VERSION = "0.1.0"
 
 # File upload settings
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+MAX_DATASET_FILE_SIZE = int(os.getenv("MAX_DATASET_FILE_SIZE", 2 * 1024 * 1024 * 1024))  # 2GB
+UPLOAD_CHUNK_BYTES = int(os.getenv("UPLOAD_CHUNK_BYTES", 1024 * 1024))
+UPLOAD_SPOOL_DIR = os.getenv("UPLOAD_SPOOL_DIR") or None  # None uses the system temp dir
 ALLOWED_FILE_EXTENSIONS = [".csv"]
-SAMPLE_ROWS_LIMIT = 10 
\ No newline at end of file
+SAMPLE_ROWS_LIMIT = 10
+
+# Executor settings - thread pool for GIL-releasing pandas/NumPy work,
+# process pool for pure-Python-heavy stages (0 disables the process pool)
+EXECUTOR_THREAD_WORKERS = int(os.getenv("EXECUTOR_THREAD_WORKERS", min(32, (os.cpu_count() or 1) + 4)))
+EXECUTOR_PROCESS_WORKERS = int(os.getenv("EXECUTOR_PROCESS_WORKERS", os.cpu_count() or 1)) 
+
+# Admission control (per worker) - concurrent requests per route class
+# ("llm": /analyze, "compute": simulations and dataset analysis, "bulk": file
+# uploads, validation and exports; 0 disables a class), requests waiting
+# beyond that (then 503), the longest wait for a slot (then 503) and the
+# requests one client may have waiting per class (then 429)
+ADMISSION_LLM_CONCURRENCY = int(os.getenv("ADMISSION_LLM_CONCURRENCY", 4))
+ADMISSION_LLM_QUEUE = int(os.getenv("ADMISSION_LLM_QUEUE", 16))
+ADMISSION_COMPUTE_CONCURRENCY = int(os.getenv("ADMISSION_COMPUTE_CONCURRENCY", max(2, os.cpu_count() or 1)))
+ADMISSION_COMPUTE_QUEUE = int(os.getenv("ADMISSION_COMPUTE_QUEUE", 32))
+ADMISSION_BULK_CONCURRENCY = int(os.getenv("ADMISSION_BULK_CONCURRENCY", 4))
+ADMISSION_BULK_QUEUE = int(os.getenv("ADMISSION_BULK_QUEUE", 8))
+ADMISSION_QUEUE_TIMEOUT_SECONDS = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", 10.0))
+ADMISSION_CLIENT_QUEUE = int(os.getenv("ADMISSION_CLIENT_QUEUE", 4))
+# Proxies (comma-separated addresses or CIDR networks) whose X-Forwarded-For
+# header identifies the client; requests from any other peer are keyed by
+# the peer address, since clients can send any X-Forwarded-For they like
+TRUSTED_PROXIES = [
+    proxy.strip() for proxy in os.getenv("TRUSTED_PROXIES", "127.0.0.1,::1").split(",") if proxy.strip()
+]
+
+# Full-dataset ingestion - files at least PARALLEL_PARSE_MIN_BYTES large are
+# split on record boundaries and parsed on the process pool
+PARALLEL_PARSE_MIN_BYTES = int(os.getenv("PARALLEL_PARSE_MIN_BYTES", 32 * 1024 * 1024))
+PARALLEL_PARSE_CHUNKS = int(os.getenv("PARALLEL_PARSE_CHUNKS", EXECUTOR_PROCESS_WORKERS))
+DATASET_STORE_MAX_DATASETS = int(os.getenv("DATASET_STORE_MAX_DATASETS", 8))
+# Simulation results kept for identical re-runs (0 disables the cache)
+SIMULATION_CACHE_MAX_ENTRIES = int(os.getenv("SIMULATION_CACHE_MAX_ENTRIES", 256))
+# Per-dataset intermediates (employee vectors, current-payroll terms per
+# reporting currency) reused when only policy parameters change
+SIMULATION_INTERMEDIATE_MAX_ENTRIES = int(os.getenv("SIMULATION_INTERMEDIATE_MAX_ENTRIES", 32))
+# Mapping suggestions kept per set of headers (0 disables the cache)
+MAPPING_SUGGESTION_CACHE_MAX_ENTRIES = int(os.getenv("MAPPING_SUGGESTION_CACHE_MAX_ENTRIES", 1024))
+# Multi-worker mode - with a directory (a tmpfs such as /dev/shm/smartpaymap)
+# datasets and caches are shared by all workers on the host instead of held
+# per process; each worker also keeps this many deserialized intermediates
+SHARED_STATE_DIR = os.getenv("SHARED_STATE_DIR") or None
+SHARED_CACHE_LOCAL_ENTRIES = int(os.getenv("SHARED_CACHE_LOCAL_ENTRIES", 4))
+# Compact dtypes for stored datasets: text columns with at most this
+# distinct/non-null ratio become categoricals; floats other than salary,
+# bonus and tax rate columns become float32 when they survive the round
+# trip to this many decimal places
+DTYPE_CATEGORICAL_MAX_RATIO = float(os.getenv("DTYPE_CATEGORICAL_MAX_RATIO", 0.5))
+DTYPE_FLOAT32_MAX_DECIMALS = int(os.getenv("DTYPE_FLOAT32_MAX_DECIMALS", 4))
+
+# Persistent mapping store - SQLite database shared by all workers on the
+# host (defaults to backend/data, the mounted data volume in Docker), and how
+# long a write waits for another process holding the write lock
+MAPPING_STORE_PATH = os.getenv("MAPPING_STORE_PATH") or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "data", "mappings.sqlite3"
+)
+MAPPING_STORE_BUSY_TIMEOUT_MS = int(os.getenv("MAPPING_STORE_BUSY_TIMEOUT_MS", 5_000))
+
+# Cache snapshots - hot caches (mapping suggestions, simulation results,
+# compliance heatmap) are saved to this file every CACHE_SNAPSHOT_INTERVAL_SECONDS
+# and at shutdown by one worker, and restored at startup by every worker (an
+# empty path disables snapshots, an interval of 0 saves only at shutdown).
+# Restoring unpickles the file: the path must be writable only by the backend user
+CACHE_SNAPSHOT_PATH = os.getenv("CACHE_SNAPSHOT_PATH", os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "data", "cache_snapshot.bin"
+))
+CACHE_SNAPSHOT_INTERVAL_SECONDS = int(os.getenv("CACHE_SNAPSHOT_INTERVAL_SECONDS", 300))
+
+# Response compression - JSON bodies of row-heavy endpoints of at least
+# GZIP_MIN_BYTES are gzipped for clients that accept it (0 disables), at
+# GZIP_LEVEL (1 fastest - 9 smallest)
+GZIP_MIN_BYTES = int(os.getenv("GZIP_MIN_BYTES", 64 * 1024))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", 5))
+
+# Out-of-core pipeline - rows per chunk held in memory while streaming exports
+PIPELINE_CHUNK_ROWS = int(os.getenv("PIPELINE_CHUNK_ROWS", 50_000))
+
+# Row validation - offending row indices reported per rule, and the first
+# chunk size when an error budget allows stopping early (chunks then double)
+VALIDATION_SAMPLE_ROWS = int(os.getenv("VALIDATION_SAMPLE_ROWS", 20))
+VALIDATION_FIRST_CHUNK_ROWS = int(os.getenv("VALIDATION_FIRST_CHUNK_ROWS", 1_000))
+
+# Monte Carlo sensitivity analysis - path count bounds and default volatilities
+# (annualized log-normal FX volatility, absolute tax/social security rate shift)
+MONTE_CARLO_DEFAULT_PATHS = int(os.getenv("MONTE_CARLO_DEFAULT_PATHS", 10_000))
+MONTE_CARLO_MAX_PATHS = int(os.getenv("MONTE_CARLO_MAX_PATHS", 100_000))
+MONTE_CARLO_FX_VOLATILITY = float(os.getenv("MONTE_CARLO_FX_VOLATILITY", 0.10))
+MONTE_CARLO_RATE_VOLATILITY = float(os.getenv("MONTE_CARLO_RATE_VOLATILITY", 0.01))
+
+# Historical FX rates (wide CSV: date column plus units per USD per currency)
+FX_HISTORY_PATH = os.getenv("FX_HISTORY_PATH") or os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "data", "fx_history.csv"
+)
+
+# Progressive tax / social security schedules - versioned JSON files
+# (<version>.json); an empty TAX_SCHEDULE_VERSION selects the latest file
+TAX_SCHEDULE_DIR = os.getenv("TAX_SCHEDULE_DIR") or os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "data", "tax_schedules"
+)
+TAX_SCHEDULE_VERSION = os.getenv("TAX_SCHEDULE_VERSION") or None
+
+# Multi-period projections - default and maximum horizon in months
+PROJECTION_DEFAULT_MONTHS = int(os.getenv("PROJECTION_DEFAULT_MONTHS", 24))
+PROJECTION_MAX_MONTHS = int(os.getenv("PROJECTION_MAX_MONTHS", 60))
+
+# Gazetteer of country names, aliases and cities for resolving location
+# columns; spelling matches need at least LOCATION_FUZZY_CUTOFF similarity
+GAZETTEER_PATH = os.getenv("GAZETTEER_PATH") or os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "data", "gazetteer.json"
+)
+LOCATION_FUZZY_CUTOFF = float(os.getenv("LOCATION_FUZZY_CUTOFF", 0.85))
+
+# Declarative compliance risk factors and scoring rules
+COMPLIANCE_RULES_PATH = os.getenv("COMPLIANCE_RULES_PATH") or os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "data", "compliance_rules.json"
+)
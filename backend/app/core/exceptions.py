@@ -10,6 +10,16 @@ class ValidationAPIError(PayrollAPIError):
     def __init__(self, message: str):
         super().__init__(message, status_code=422)
 
+class NotFoundAPIError(PayrollAPIError):
+    """Raised when a requested resource does not exist."""
+    def __init__(self, message: str):
+        super().__init__(message, status_code=404)
+
+class PayloadTooLargeError(PayrollAPIError):
+    """Raised when an upload exceeds the configured size limit."""
+    def __init__(self, message: str):
+        super().__init__(message, status_code=413)
+
 class ProcessingAPIError(PayrollAPIError):
     """Raised when data processing fails."""
     def __init__(self, message: str):
@@ -18,4 +28,16 @@ class ProcessingAPIError(PayrollAPIError):
 class ServiceUnavailableError(PayrollAPIError):
     """Raised when external services are unavailable."""
     def __init__(self, message: str):
-        super().__init__(message, status_code=503) 
\ No newline at end of file
+        super().__init__(message, status_code=503) 
+
+class TooManyRequestsError(PayrollAPIError):
+    """Raised when a client has too many requests waiting."""
+    def __init__(self, message: str, retry_after: int = 1):
+        super().__init__(message, status_code=429)
+        self.retry_after = retry_after
+
+class ServerBusyError(ServiceUnavailableError):
+    """Raised when a route is saturated and cannot queue the request."""
+    def __init__(self, message: str, retry_after: int = 1):
+        super().__init__(message)
+        self.retry_after = retry_after
@@ -0,0 +1,169 @@
+"""
+Shared executor layer for CPU-bound and blocking work.
+
+Route handlers are ``async def`` and run on the event loop, so pandas parsing,
+DataFrame construction and simulation math must be dispatched to a worker pool
+instead of running inline. Two pools are provided:
+
+- ``io``: a thread pool for pandas I/O and NumPy work that releases the GIL.
+- ``cpu``: a process pool for pure-Python-heavy stages (per-row loops).
+
+Both pools record queue depth and run-time metrics exposed via ``/metrics``.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+from .config import EXECUTOR_PROCESS_WORKERS, EXECUTOR_THREAD_WORKERS
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def _timed_call(func: Callable[..., T], args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Tuple[T, float]:
+    """Run ``func`` in the worker and return its result with the run time in seconds."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+class ExecutorPool:
+    """A lazily created worker pool with queue-depth and run-time metrics."""
+
+    def __init__(self, name: str, kind: str, max_workers: int):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown executor kind: {kind}")
+        self.name = name
+        self.kind = kind
+        self.max_workers = max(1, max_workers)
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._total_run_seconds = 0.0
+        self._max_run_seconds = 0.0
+        self._total_wait_seconds = 0.0
+        self._max_queue_depth = 0
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.kind == "thread":
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix=f"smartpaymap-{self.name}"
+                    )
+                else:
+                    self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                logger.info(f"Started {self.kind} pool '{self.name}' with {self.max_workers} workers")
+            return self._executor
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run ``func(*args, **kwargs)`` in the pool without blocking the event loop.
+
+        For process pools ``func`` and its arguments must be picklable
+        (module-level functions or static methods).
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+
+        with self._lock:
+            self._submitted += 1
+            self._in_flight += 1
+            self._max_queue_depth = max(self._max_queue_depth, self._in_flight - self.max_workers)
+
+        submitted_at = time.perf_counter()
+        try:
+            result, run_seconds = await loop.run_in_executor(
+                executor, partial(_timed_call, func, args, kwargs)
+            )
+        except BrokenProcessPool:
+            # A crashed worker poisons the whole pool; drop it so the next call starts fresh
+            with self._lock:
+                self._failed += 1
+                self._in_flight -= 1
+                self._executor = None
+            raise
+        except BaseException:
+            with self._lock:
+                self._failed += 1
+                self._in_flight -= 1
+            raise
+
+        elapsed = time.perf_counter() - submitted_at
+        with self._lock:
+            self._in_flight -= 1
+            self._completed += 1
+            self._total_run_seconds += run_seconds
+            self._max_run_seconds = max(self._max_run_seconds, run_seconds)
+            self._total_wait_seconds += max(0.0, elapsed - run_seconds)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Return a snapshot of the pool metrics."""
+        with self._lock:
+            completed = self._completed
+            return {
+                "kind": self.kind,
+                "max_workers": self.max_workers,
+                "started": self._executor is not None,
+                "in_flight": self._in_flight,
+                "queue_depth": max(0, self._in_flight - self.max_workers),
+                "max_queue_depth": self._max_queue_depth,
+                "submitted": self._submitted,
+                "completed": completed,
+                "failed": self._failed,
+                "total_run_seconds": round(self._total_run_seconds, 6),
+                "avg_run_seconds": round(self._total_run_seconds / completed, 6) if completed else 0.0,
+                "max_run_seconds": round(self._max_run_seconds, 6),
+                "avg_wait_seconds": round(self._total_wait_seconds / completed, 6) if completed else 0.0,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down the underlying executor; it is recreated on next use."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+io_pool = ExecutorPool("io", "thread", EXECUTOR_THREAD_WORKERS)
+# EXECUTOR_PROCESS_WORKERS=0 disables the process pool (e.g. constrained containers)
+cpu_pool = (
+    ExecutorPool("cpu", "process", EXECUTOR_PROCESS_WORKERS) if EXECUTOR_PROCESS_WORKERS > 0 else None
+)
+
+
+async def run_io_bound(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run GIL-releasing work (pandas I/O, NumPy) on the shared thread pool."""
+    return await io_pool.run(func, *args, **kwargs)
+
+
+async def run_cpu_bound(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run pure-Python-heavy work on the shared process pool (thread pool if disabled)."""
+    pool = cpu_pool or io_pool
+    return await pool.run(func, *args, **kwargs)
+
+
+def get_executor_stats() -> Dict[str, Dict[str, Any]]:
+    """Return metrics for all shared pools."""
+    stats = {"io": io_pool.stats()}
+    if cpu_pool is not None:
+        stats["cpu"] = cpu_pool.stats()
+    return stats
+
+
+def shutdown_executors(wait: bool = True) -> None:
+    """Shut down all shared pools (called on application shutdown)."""
+    io_pool.shutdown(wait=wait)
+    if cpu_pool is not None:
+        cpu_pool.shutdown(wait=wait)
@@ -2,12 +2,37 @@ from .payroll import (
     PayrollData, 
     AnalysisResponse, 
     CSVResponse, 
+    DatasetResponse,
     MappingRequest, 
     MappingResponse,
+    MappingLookupRequest,
+    StoredMappingResponse,
     PolicyChange,
     PolicySimulationRequest,
     CostAnalysis,
     PolicySimulationResponse,
+    ScenarioMatrixRequest,
+    ScenarioResult,
+    ScenarioMatrixResponse,
+    RiskSimulationRequest,
+    DistributionSummary,
+    CurrencyExposure,
+    RiskScenarioResult,
+    RiskSimulationResponse,
+    RaisePhase,
+    ProjectionRequest,
+    MonthlyProjection,
+    ProjectionResponse,
+    ShadowPayrollRequest,
+    ShadowPayrollTotals,
+    CountryPairLiability,
+    ShadowPayrollResponse,
+    ComplianceAnalysisRequest,
+    CountryCompliance,
+    ComplianceAnalysisResponse,
+    ValidationRequest,
+    RuleViolation,
+    ValidationResponse,
     ExportStandardizedRequest
 )
 
@@ -15,11 +40,36 @@ __all__ = [
     "PayrollData",
     "AnalysisResponse", 
     "CSVResponse",
+    "DatasetResponse",
     "MappingRequest",
     "MappingResponse",
+    "MappingLookupRequest",
+    "StoredMappingResponse",
     "PolicyChange",
     "PolicySimulationRequest", 
     "CostAnalysis",
     "PolicySimulationResponse",
+    "ScenarioMatrixRequest",
+    "ScenarioResult",
+    "ScenarioMatrixResponse",
+    "RiskSimulationRequest",
+    "DistributionSummary",
+    "CurrencyExposure",
+    "RiskScenarioResult",
+    "RiskSimulationResponse",
+    "RaisePhase",
+    "ProjectionRequest",
+    "MonthlyProjection",
+    "ProjectionResponse",
+    "ShadowPayrollRequest",
+    "ShadowPayrollTotals",
+    "CountryPairLiability",
+    "ShadowPayrollResponse",
+    "ComplianceAnalysisRequest",
+    "CountryCompliance",
+    "ComplianceAnalysisResponse",
+    "ValidationRequest",
+    "RuleViolation",
+    "ValidationResponse",
     "ExportStandardizedRequest"
 ] 
\ No newline at end of file
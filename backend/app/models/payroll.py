@@ -1,6 +1,14 @@
 from pydantic import BaseModel, Field
 from typing import List, Dict, Any, Annotated, Optional
 
+from ..core.config import (
+    MONTE_CARLO_DEFAULT_PATHS,
+    MONTE_CARLO_FX_VOLATILITY,
+    MONTE_CARLO_RATE_VOLATILITY,
+    PROJECTION_DEFAULT_MONTHS,
+    VALIDATION_SAMPLE_ROWS,
+)
+
 class PayrollData(BaseModel):
     """Request model for payroll data analysis."""
     headers: List[str] = Field(..., min_length=1, description="List of CSV column headers")
@@ -16,17 +24,42 @@ class CSVResponse(BaseModel):
     headers: List[str] = Field(..., description="CSV column headers")
     rows: List[List[str]] = Field(..., description="Sample data rows")
 
+class DatasetResponse(BaseModel):
+    """Response model for full-dataset CSV upload."""
+    dataset_id: str = Field(..., description="Identifier of the stored dataset")
+    content_hash: str = Field(..., description="SHA-256 of the uploaded file")
+    headers: List[str] = Field(..., description="CSV column headers")
+    row_count: int = Field(..., description="Number of data rows ingested")
+    rows: List[List[str]] = Field(..., description="Sample data rows")
+    memory: Dict[str, Any] = Field(..., description="Per-column memory before and after dtype optimization")
+
 class MappingRequest(BaseModel):
     """
     Request model for field mappings.
     Each key in mappings dict is a CSV field name, value is the standard field it maps to.
     """
     mappings: Dict[str, Annotated[str, Field(min_length=1)]]  # Ensures all values are non-empty strings
+    headers: Optional[List[str]] = Field(default=None, description="Source headers the mapping was made for (defaults to the mapped fields)")
+    source_system: str = Field(default="", description="Origin of the source file (e.g. workday, sap)")
 
 class MappingResponse(BaseModel):
     """Response model for mapping submission"""
     status: str
     mapping_saved: bool
+    mapping_id: Optional[int] = None
+
+class MappingLookupRequest(BaseModel):
+    """Request model for looking up the latest mapping of a schema"""
+    headers: List[str] = Field(..., min_length=1, description="Source headers (order and case are ignored)")
+    source_system: Optional[str] = Field(default=None, description="Only mappings from this source system")
+
+class StoredMappingResponse(BaseModel):
+    """Response model for a stored mapping lookup"""
+    found: bool = Field(..., description="Whether a mapping exists for the schema")
+    mapping_id: Optional[int] = Field(default=None, description="Id of the stored mapping")
+    source_system: Optional[str] = Field(default=None, description="Origin of the source file")
+    mappings: Dict[str, str] = Field(default={}, description="Source field -> standard field")
+    created_at: Optional[str] = Field(default=None, description="When the mapping was finalized (UTC)")
 
 class PolicyChange(BaseModel):
     """Request model for policy change parameters"""
@@ -40,12 +73,30 @@ class PolicySimulationRequest(BaseModel):
     headers: List[str] = Field(..., description="CSV column headers")
     rows: List[List[str]] = Field(..., description="CSV data rows")
     policy_change: PolicyChange = Field(..., description="Policy change parameters")
+    mappings: Optional[Dict[str, str]] = Field(default=None, description="Field mappings (inferred from headers when omitted)")
+    fx_date_column: Optional[str] = Field(default=None, description="Standard field or source column (e.g. employment_date) selecting as-of historical exchange rates")
 
 class CostAnalysis(BaseModel):
     """Cost analysis model for policy simulation"""
     estimated_change: str = Field(..., description="Estimated cost change")
     currency_impact: str = Field(..., description="Currency conversion impact")
     tax_implications: str = Field(..., description="Tax implications")
+    tax_schedule_version: Optional[str] = Field(default=None, description="Tax schedule version applied (None for flat rates)")
+    reporting_currency: Optional[str] = Field(default=None, description="Currency of all cost figures")
+    employee_count: int = Field(default=0, description="Employees included in the cost figures")
+    excluded_employees: int = Field(default=0, description="Employees excluded (unknown currency)")
+    unknown_currencies: List[str] = Field(default=[], description="Currencies without an exchange rate")
+    missing_salary: int = Field(default=0, description="Rows without a parseable salary")
+    historical_fx_rows: int = Field(default=0, description="Rows converted at historical (as-of) exchange rates")
+    total_current_cost: float = Field(default=0.0, description="Current employer cost (gross + social security)")
+    total_projected_cost: float = Field(default=0.0, description="Projected employer cost after the change")
+    total_delta: float = Field(default=0.0, description="Projected minus current employer cost")
+    delta_percentage: float = Field(default=0.0, description="Delta as a percentage of current cost")
+    total_current_tax: float = Field(default=0.0, description="Current employee income tax")
+    total_current_employer_social_security: float = Field(default=0.0, description="Current employer social security")
+    total_projected_tax: float = Field(default=0.0, description="Projected employee income tax")
+    total_employer_social_security: float = Field(default=0.0, description="Projected employer social security")
+    currency_breakdown: Dict[str, Dict[str, float]] = Field(default={}, description="Headcount and costs per source currency")
 
 class PolicySimulationResponse(BaseModel):
     """Response model for policy simulation"""
@@ -54,7 +105,243 @@ class PolicySimulationResponse(BaseModel):
     compliance_notes: List[str] = Field(..., description="Compliance considerations")
     recommendations: List[str] = Field(..., description="AI recommendations")
 
+class ScenarioMatrixRequest(BaseModel):
+    """Request model for comparing many policy changes on one dataset"""
+    headers: List[str] = Field(..., description="CSV column headers")
+    rows: List[List[str]] = Field(..., description="CSV data rows")
+    policy_changes: List[PolicyChange] = Field(default=[], description="Policy changes to compare")
+    all_countries: bool = Field(default=False, description="Also evaluate every supported country")
+    reporting_currency: str = Field(default="USD", description="Currency for all reported figures")
+    mappings: Optional[Dict[str, str]] = Field(default=None, description="Field mappings (inferred from headers when omitted)")
+    fx_date_column: Optional[str] = Field(default=None, description="Standard field or source column (e.g. employment_date) selecting as-of historical exchange rates")
+
+class ScenarioResult(BaseModel):
+    """Cost comparison row for one scenario"""
+    rank: int = Field(..., description="Rank by projected cost (1 = cheapest)")
+    target_country: str = Field(..., description="Target country code")
+    country_name: str = Field(..., description="Target country name")
+    currency: str = Field(..., description="Scenario payroll currency")
+    adjusted_salary: Optional[float] = Field(default=None, description="Adjusted salary in the scenario currency")
+    total_projected_cost: float = Field(..., description="Projected employer cost")
+    total_delta: float = Field(..., description="Projected minus current employer cost")
+    delta_percentage: float = Field(..., description="Delta as a percentage of current cost")
+    total_projected_tax: float = Field(..., description="Projected employee income tax")
+    total_employer_social_security: float = Field(..., description="Projected employer social security")
+
+class ScenarioMatrixResponse(BaseModel):
+    """Response model for a scenario comparison"""
+    reporting_currency: str = Field(..., description="Currency of all cost figures")
+    employee_count: int = Field(..., description="Employees included in the cost figures")
+    excluded_employees: int = Field(..., description="Employees excluded (unknown currency)")
+    unknown_currencies: List[str] = Field(..., description="Currencies without an exchange rate")
+    historical_fx_rows: int = Field(default=0, description="Rows converted at historical (as-of) exchange rates")
+    tax_schedule_version: Optional[str] = Field(default=None, description="Tax schedule version applied")
+    total_current_cost: float = Field(..., description="Current employer cost")
+    scenarios: List[ScenarioResult] = Field(..., description="Scenarios ranked by projected cost")
+
+class RiskSimulationRequest(BaseModel):
+    """Request model for a Monte Carlo FX and tax-rate sensitivity analysis"""
+    headers: List[str] = Field(..., description="CSV column headers")
+    rows: List[List[str]] = Field(..., description="CSV data rows")
+    policy_changes: List[PolicyChange] = Field(default=[], description="Policy changes to simulate")
+    all_countries: bool = Field(default=False, description="Also simulate every supported country")
+    paths: int = Field(default=MONTE_CARLO_DEFAULT_PATHS, description="Number of sampled paths")
+    fx_volatility: float = Field(default=MONTE_CARLO_FX_VOLATILITY, ge=0, description="Annualized FX volatility against USD")
+    currency_volatility: Optional[Dict[str, float]] = Field(default=None, description="Per-currency FX volatility overrides")
+    rate_volatility: float = Field(default=MONTE_CARLO_RATE_VOLATILITY, ge=0, description="Std. deviation of tax/social security rate shifts")
+    horizon_years: float = Field(default=1.0, gt=0, description="Horizon the rates are sampled at")
+    confidence: float = Field(default=0.95, description="Confidence level for value-at-risk")
+    seed: Optional[int] = Field(default=None, description="RNG seed for reproducible results")
+    mappings: Optional[Dict[str, str]] = Field(default=None, description="Field mappings (inferred from headers when omitted)")
+
+class DistributionSummary(BaseModel):
+    """Mean and percentiles of a sampled cost distribution"""
+    mean: float = Field(..., description="Mean over all paths")
+    p5: float = Field(..., description="5th percentile")
+    p50: float = Field(..., description="Median")
+    p95: float = Field(..., description="95th percentile")
+
+class CurrencyExposure(BaseModel):
+    """Current payroll cost expressed in one target currency"""
+    current_cost: DistributionSummary = Field(..., description="Current employer cost distribution")
+    value_at_risk: float = Field(..., description="Cost increase over the mean at the confidence level")
+
+class RiskScenarioResult(BaseModel):
+    """Sampled cost distribution for one scenario (in the scenario currency)"""
+    target_country: str = Field(..., description="Target country code")
+    country_name: str = Field(..., description="Target country name")
+    currency: str = Field(..., description="Scenario payroll currency")
+    adjusted_salary: Optional[float] = Field(default=None, description="Adjusted salary in the scenario currency")
+    projected_cost: DistributionSummary = Field(..., description="Projected employer cost distribution")
+    delta: DistributionSummary = Field(..., description="Projected minus current cost distribution")
+    projected_tax: DistributionSummary = Field(..., description="Projected income tax distribution")
+    value_at_risk: float = Field(..., description="Projected cost increase over the mean at the confidence level")
+    value_at_risk_percentage: float = Field(..., description="Value-at-risk as a percentage of mean projected cost")
+
+class RiskSimulationResponse(BaseModel):
+    """Response model for a Monte Carlo sensitivity analysis"""
+    paths: int = Field(..., description="Number of sampled paths")
+    horizon_years: float = Field(..., description="Horizon the rates were sampled at")
+    confidence: float = Field(..., description="Confidence level for value-at-risk")
+    seed: Optional[int] = Field(default=None, description="RNG seed used")
+    employee_count: int = Field(..., description="Employees included in the simulation")
+    excluded_employees: int = Field(..., description="Employees excluded (unknown currency)")
+    unknown_currencies: List[str] = Field(..., description="Currencies without an exchange rate")
+    currency_exposure: Dict[str, CurrencyExposure] = Field(..., description="Current payroll exposure per target currency")
+    scenarios: List[RiskScenarioResult] = Field(..., description="Per-scenario cost distributions")
+
+class RaisePhase(BaseModel):
+    """One step of a phased salary adjustment"""
+    month: int = Field(..., ge=0, description="Month offset from the projection start")
+    fraction: float = Field(..., ge=0, le=1, description="Cumulative fraction of the move to the adjusted salary from this month")
+
+class ProjectionRequest(BaseModel):
+    """Request model for a multi-period cost projection"""
+    headers: List[str] = Field(..., description="CSV column headers")
+    rows: List[List[str]] = Field(..., description="CSV data rows")
+    policy_change: PolicyChange = Field(..., description="Policy change parameters")
+    horizon_months: int = Field(default=PROJECTION_DEFAULT_MONTHS, description="Number of projected months")
+    start_month: Optional[str] = Field(default=None, description="First projected month (YYYY-MM, defaults to the current month)")
+    raise_phases: List[RaisePhase] = Field(default=[], description="Phasing of the move to the adjusted salary (immediate when empty)")
+    annual_raise: float = Field(default=0.0, ge=0, description="Merit raise applied at each hire anniversary (employment_date)")
+    bonus_months: List[int] = Field(default=[12], description="Calendar months the annual bonus is paid in (spread evenly when empty)")
+    fx_drift: Dict[str, float] = Field(default={}, description="Annual change of each currency's units per USD (e.g. {\"EUR\": 0.02})")
+    mappings: Optional[Dict[str, str]] = Field(default=None, description="Field mappings (inferred from headers when omitted)")
+
+class MonthlyProjection(BaseModel):
+    """Projected costs for one month"""
+    month: str = Field(..., description="Month (YYYY-MM)")
+    headcount: int = Field(..., description="Employees on payroll in the month")
+    current_cost: float = Field(..., description="Employer cost without the change")
+    projected_cost: float = Field(..., description="Employer cost with the change")
+    delta: float = Field(..., description="Projected minus current cost")
+    projected_tax: float = Field(..., description="Projected employee income tax")
+    employer_social_security: float = Field(..., description="Projected employer social security")
+    cumulative_current_cost: float = Field(..., description="Current cost up to and including the month")
+    cumulative_projected_cost: float = Field(..., description="Projected cost up to and including the month")
+    cumulative_delta: float = Field(..., description="Cumulative projected minus current cost")
+
+class ProjectionResponse(BaseModel):
+    """Response model for a multi-period cost projection"""
+    target_country: str = Field(..., description="Target country code")
+    country_name: str = Field(..., description="Target country name")
+    reporting_currency: str = Field(..., description="Currency of all cost figures")
+    start_month: str = Field(..., description="First projected month")
+    horizon_months: int = Field(..., description="Number of projected months")
+    employee_count: int = Field(..., description="Employees included in the projection")
+    excluded_employees: int = Field(..., description="Employees excluded (unknown currency)")
+    unknown_currencies: List[str] = Field(..., description="Currencies without an exchange rate")
+    missing_salary: int = Field(default=0, description="Rows without a parseable salary")
+    tax_schedule_version: Optional[str] = Field(default=None, description="Tax schedule version applied")
+    total_current_cost: float = Field(..., description="Current employer cost over the horizon")
+    total_projected_cost: float = Field(..., description="Projected employer cost over the horizon")
+    total_delta: float = Field(..., description="Projected minus current cost over the horizon")
+    delta_percentage: float = Field(..., description="Delta as a percentage of current cost")
+    months: List[MonthlyProjection] = Field(..., description="Monthly and cumulative totals")
+
+class ShadowPayrollRequest(BaseModel):
+    """Request model for a dual-jurisdiction shadow payroll"""
+    headers: List[str] = Field(..., description="CSV column headers")
+    rows: List[List[str]] = Field(..., description="CSV data rows")
+    home_country: str = Field(default="US", description="Home payroll country for rows without their own")
+    home_country_column: Optional[str] = Field(default=None, description="Source column holding each row's home payroll country")
+    reporting_currency: str = Field(default="USD", description="Currency for all reported figures")
+    mappings: Optional[Dict[str, str]] = Field(default=None, description="Field mappings (inferred from headers when omitted)")
+
+class ShadowPayrollTotals(BaseModel):
+    """Home payroll and host-country liabilities of assignees"""
+    gross_pay: float = Field(..., description="Gross pay (salary + bonus)")
+    home_tax: float = Field(..., description="Income tax under the home schedule")
+    home_social_security: float = Field(..., description="Employer social security under the home schedule")
+    host_tax: float = Field(..., description="Income tax under the host schedule")
+    host_social_security: float = Field(..., description="Employer social security under the host schedule")
+    host_liability: float = Field(..., description="Host income tax plus employer social security")
+
+class CountryPairLiability(ShadowPayrollTotals):
+    """Shadow payroll for the assignees of one home/host country pair"""
+    home_country: str = Field(..., description="Home payroll country code")
+    host_country: str = Field(..., description="Host (work location) country code")
+    host_country_name: str = Field(..., description="Host country name")
+    headcount: int = Field(..., description="Assignees in the pair")
+    host_currency: str = Field(..., description="Host country currency")
+    host_liability_local: float = Field(..., description="Host liability in the host currency")
+
+class ShadowPayrollResponse(BaseModel):
+    """Response model for a dual-jurisdiction shadow payroll"""
+    reporting_currency: str = Field(..., description="Currency of all cost figures")
+    employee_count: int = Field(..., description="Employees with a usable currency")
+    excluded_employees: int = Field(..., description="Employees excluded (unknown currency)")
+    unknown_currencies: List[str] = Field(..., description="Currencies without an exchange rate")
+    assignee_count: int = Field(..., description="Employees working outside their home payroll country")
+    unresolved_locations: int = Field(..., description="Employees whose location matched no supported country")
+    unresolved_location_values: List[str] = Field(default=[], description="Sample of unmatched location values")
+    totals: ShadowPayrollTotals = Field(..., description="Totals over all assignees")
+    country_pairs: List[CountryPairLiability] = Field(..., description="Liabilities per country pair, largest host liability first")
+
+class ComplianceAnalysisRequest(BaseModel):
+    """Request model for dataset compliance analysis (inline rows or an uploaded dataset)"""
+    headers: List[str] = Field(default=[], description="CSV column headers")
+    rows: List[List[str]] = Field(default=[], description="CSV data rows")
+    dataset_id: Optional[str] = Field(default=None, description="Dataset from /upload_dataset (instead of headers and rows)")
+    mappings: Optional[Dict[str, str]] = Field(default=None, description="Field mappings (inferred from headers when omitted)")
+    reporting_currency: str = Field(default="USD", description="Currency of payroll volumes")
+
+class CountryCompliance(BaseModel):
+    """Compliance risk of one country, weighted by the dataset's exposure to it"""
+    country: str = Field(..., description="Country name")
+    headcount: int = Field(..., description="Employees located in the country")
+    headcount_share: float = Field(..., description="Share of located employees")
+    payroll_volume: float = Field(..., description="Salary plus bonus in the reporting currency")
+    payroll_share: float = Field(..., description="Share of located payroll volume")
+    risk_score: float = Field(..., description="Country risk score given the data quality of its rows")
+    weighted_risk: float = Field(..., description="Risk score times the mean of headcount and payroll share")
+    assessment: str = Field(..., description="Risk level and contributing factors")
+    completeness: float = Field(..., description="Fraction of required row fields present and valid")
+    data_gaps: Dict[str, int] = Field(..., description="Rows missing or invalid per field")
+
+class ComplianceAnalysisResponse(BaseModel):
+    """Response model for dataset compliance analysis"""
+    employee_count: int = Field(..., description="Employees in the dataset")
+    reporting_currency: str = Field(..., description="Currency of payroll volumes")
+    mapping_coverage: float = Field(..., description="Percentage of standard fields mapped")
+    unknown_currencies: List[str] = Field(..., description="Currencies without an exchange rate")
+    unresolved_locations: int = Field(..., description="Employees whose location matched no country")
+    unresolved_location_values: List[str] = Field(default=[], description="Sample of unmatched location values")
+    uncovered_locations: int = Field(default=0, description="Employees located in a country without risk data")
+    uncovered_countries: Dict[str, int] = Field(default={}, description="Headcount per located country without risk data")
+    overall_risk_score: float = Field(..., description="Sum of the countries' weighted risk")
+    countries: List[CountryCompliance] = Field(..., description="Countries by weighted risk, highest first")
+    compliance_heatmap: Dict[str, str] = Field(..., description="Risk assessment of each country present")
+
+class ValidationRequest(BaseModel):
+    """Request model for row-level validation (inline rows or an uploaded dataset)"""
+    headers: List[str] = Field(default=[], description="CSV column headers")
+    rows: List[List[str]] = Field(default=[], description="CSV data rows")
+    dataset_id: Optional[str] = Field(default=None, description="Dataset from /upload_dataset (instead of headers and rows)")
+    mappings: Optional[Dict[str, str]] = Field(default=None, description="Field mappings (inferred from headers when omitted)")
+    max_errors: Optional[int] = Field(default=None, ge=0, description="Stop once more rows than this have an error (omit to check every row)")
+    sample_rows: int = Field(default=VALIDATION_SAMPLE_ROWS, ge=0, le=1000, description="Offending row indices reported per rule")
+
+class RuleViolation(BaseModel):
+    """Rows failing one validation rule"""
+    rule: str = Field(..., description="Rule identifier")
+    severity: str = Field(..., description="error (counts against the error budget) or warning")
+    description: str = Field(..., description="What the rule checks")
+    count: int = Field(..., description="Offending rows among the rows checked")
+    rows: List[int] = Field(..., description="First offending row indices (0-based data rows)")
+
+class ValidationResponse(BaseModel):
+    """Response model for row-level validation"""
+    valid: bool = Field(..., description="Every row was checked and none has an error")
+    complete: bool = Field(..., description="False when the error budget stopped the scan early")
+    rows_checked: int = Field(..., description="Rows checked")
+    invalid_rows: int = Field(..., description="Rows with at least one error")
+    error_budget: Optional[int] = Field(default=None, description="Error budget of the request")
+    rules: List[RuleViolation] = Field(..., description="Counts and sample rows per rule")
+
 class ExportStandardizedRequest(BaseModel):
     """Request model for standardized CSV export"""
     rows: List[Dict[str, str]] = Field(..., description="Parsed CSV data as list of dictionaries")
-    mappings: Dict[str, str] = Field(..., description="Field mappings from source to standard fields")
\ No newline at end of file
+    mappings: Dict[str, str] = Field(..., description="Field mappings from source to standard fields")
+    reporting_currency: Optional[str] = Field(default=None, description="Convert salary and bonus to this currency")
+    fx_date_column: Optional[str] = Field(default=None, description="Standard field or source column selecting as-of historical exchange rates")
\ No newline at end of file
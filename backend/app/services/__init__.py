@@ -2,5 +2,8 @@ from .csv_service import CSVService
 from .payroll_service import PayrollService
 from .policy_service import PolicySimulationService
 from .compliance_service import ComplianceAnalysisService
+from .export_service import ExportService
+from .dataset_service import DatasetStore
+from .validation_service import ValidationService
 
-__all__ = ["PayrollService", "CSVService", "PolicySimulationService", "ComplianceAnalysisService"]
+__all__ = ["PayrollService", "CSVService", "PolicySimulationService", "ComplianceAnalysisService", "ExportService", "DatasetStore", "ValidationService"]
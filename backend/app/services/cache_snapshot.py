@@ -0,0 +1,199 @@
+"""
+Snapshots of hot caches across restarts.
+
+A restarted backend starts with empty caches, so right after a deploy
+every /analyze call goes to the LLM and every simulation is recomputed.
+The caches registered here are written to one local file
+(CACHE_SNAPSHOT_PATH) periodically and at shutdown, and put back at
+startup before the service reports ready.
+
+The snapshot uses the shared cache entry format (a JSON header and a
+protocol-5 pickle with out-of-band NumPy buffers), written to a temporary
+file and moved into place with os.replace. The header records the snapshot
+format and the API version; a snapshot from another version is ignored
+rather than unpickled into changed classes. Cache keys already contain the
+version of the data they depend on, so entries made obsolete by new
+reference data simply never hit.
+
+Every worker restores the snapshot, but only one writes it: the worker
+holding an exclusive lock on ``<path>.lock``. The other workers keep
+trying to take the lock when they would save, so ownership passes on when
+the owner exits.
+
+Restoring unpickles the file, which can run arbitrary code. The snapshot
+path must therefore be trusted - writable only by the backend's user - and
+a file owned by another user or writable by group or others is ignored
+(the same check the shared cache applies to its entries).
+"""
+
+import asyncio
+import fcntl
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from ..core.config import API_VERSION, CACHE_SNAPSHOT_INTERVAL_SECONDS, CACHE_SNAPSHOT_PATH
+from ..core.executor import run_io_bound
+from .shared_cache import read_entry, write_entry
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = 1
+
+
+class CacheSnapshot:
+    """Saves and restores a set of named caches (SimulationCache or SharedCache)."""
+
+    def __init__(self, caches: Dict[str, Any], path: Optional[str] = CACHE_SNAPSHOT_PATH):
+        """
+        Args:
+            caches: Cache name -> cache with items() and put()
+            path: Snapshot file; empty or None disables snapshots
+        """
+        self.caches = caches
+        self.path = path or None
+        self.restored = False
+        self.restored_entries = 0
+        self.saved_entries = 0
+        self.last_saved: Optional[str] = None
+        self._lock = threading.Lock()
+        self._owner_handle = None
+
+    @property
+    def owner(self) -> bool:
+        """Whether this process writes the snapshot."""
+        return self._owner_handle is not None
+
+    def _claim(self) -> bool:
+        """Take the snapshot's owner lock unless this or another process holds it."""
+        if self._owner_handle is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            handle = open(f"{self.path}.lock", "a")
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                handle.close()
+                return False
+            self._owner_handle = handle
+        return True
+
+    def release(self) -> None:
+        """Give up snapshot ownership (the lock is also released when the process exits)."""
+        if self._owner_handle is not None:
+            self._owner_handle.close()
+            self._owner_handle = None
+
+    def save(self) -> int:
+        """
+        Write every cache to the snapshot file, if this process owns it.
+
+        Returns:
+            Number of entries saved (0 when disabled, before restore or in a
+            worker that does not own the snapshot)
+        """
+        # Saving before the restore finished would replace a warm snapshot with empty caches
+        if not self.path or not self.restored:
+            return 0
+        with self._lock:
+            if not self._claim():
+                return 0
+            caches = {name: cache.items() for name, cache in self.caches.items()}
+            entries = sum(map(len, caches.values()))
+            size = write_entry(self.path, caches, {
+                "format": SNAPSHOT_FORMAT,
+                "api_version": API_VERSION,
+                "created_at": datetime.utcnow().isoformat(),
+                "entries": entries,
+            })
+            self.saved_entries = entries
+            self.last_saved = datetime.utcnow().isoformat()
+        logger.info(f"Saved cache snapshot with {entries} entries ({size} bytes) to {self.path}")
+        return entries
+
+    def restore(self) -> int:
+        """
+        Put the snapshot's entries back into the caches.
+
+        Caches that already hold entries (e.g. shared caches another worker
+        warmed) are left alone.
+
+        Returns:
+            Number of entries restored
+        """
+        restored = 0
+        try:
+            if not self.path or not os.path.exists(self.path):
+                return 0
+            try:
+                # read_entry refuses files another user could have written
+                caches, meta = read_entry(self.path)
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable cache snapshot {self.path}: {e}")
+                return 0
+            if meta.get("format") != SNAPSHOT_FORMAT or meta.get("api_version") != API_VERSION:
+                logger.info(f"Ignoring cache snapshot from API version {meta.get('api_version')}")
+                return 0
+            for name, cache in self.caches.items():
+                if cache.stats()["entries"]:
+                    continue
+                # Oldest first, so the restored cache has the same recency order
+                for key, value in caches.get(name, []):
+                    cache.put(key, value)
+                    restored += 1
+            logger.info(f"Restored {restored} cache entries from {self.path}")
+            return restored
+        finally:
+            self.restored_entries = restored
+            self.restored = True
+
+    async def run_periodic(self, interval: int = CACHE_SNAPSHOT_INTERVAL_SECONDS) -> None:
+        """Save every ``interval`` seconds until cancelled."""
+        if not self.path or interval <= 0:
+            return
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await run_io_bound(self.save)
+            except Exception as e:
+                logger.warning(f"Cache snapshot failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "owner": self.owner,
+            "restored": self.restored,
+            "restored_entries": self.restored_entries,
+            "saved_entries": self.saved_entries,
+            "last_saved": self.last_saved,
+        }
+
+
+class WarmUp:
+    """Readiness of the service: flips once startup warm-up has finished."""
+
+    def __init__(self):
+        self.ready = False
+        self.seconds: Optional[float] = None
+        self.error: Optional[str] = None
+
+    async def run(self, *steps) -> None:
+        """Run blocking warm-up steps off the event loop, then mark the service ready."""
+        started = time.perf_counter()
+        for step in steps:
+            try:
+                await run_io_bound(step)
+            except Exception as e:
+                # A failed warm-up step only means a colder start
+                logger.warning(f"Warm-up step {getattr(step, '__name__', step)} failed: {e}")
+                self.error = str(e)
+        self.seconds = round(time.perf_counter() - started, 3)
+        self.ready = True
+        logger.info(f"Warm-up finished in {self.seconds}s")
+
+    def stats(self) -> Dict[str, Any]:
+        return {"ready": self.ready, "warm_up_seconds": self.seconds, "warm_up_error": self.error}
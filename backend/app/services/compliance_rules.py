@@ -0,0 +1,180 @@
+"""
+Data-driven compliance risk rules compiled to factor matrices.
+
+Country risk factors, scoring rules, risk levels, detail text and
+recommendations are declared in a JSON rule file (COMPLIANCE_RULES_PATH).
+A rule tests one factor of a country with one of these conditions:
+
+- ``{"equals": v}`` / ``{"in": [v, ...]}``: exact value
+- ``{"contains": s}`` / ``{"contains_ci": s}``: substring (case-insensitive)
+- ``{"present": true}``: any non-empty value
+
+Scoring rules are lists of cases, of which the first match contributes its
+points. Compiling the rules against a set of countries evaluates every
+condition once and produces a one-hot factor matrix (countries x cases)
+and a weight vector of case points, so the base scores of all countries
+are one matrix-vector product. The data quality adjustment is a band
+lookup (``np.searchsorted``) over any array of qualities, so scores for
+many datasets' quality vectors are a single broadcast. Detail text for
+every country and risk level is rendered at compile time, leaving a table
+lookup per assessment.
+"""
+
+import json
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Optional, Union
+
+import numpy as np
+
+from ..core.config import COMPLIANCE_RULES_PATH
+
+RiskFactors = Mapping[str, str]
+
+
+def matches(condition: Mapping[str, Any], value: str) -> bool:
+    """Whether a factor value satisfies a rule condition."""
+    if "equals" in condition:
+        return value == condition["equals"]
+    if "in" in condition:
+        return value in condition["in"]
+    if "contains" in condition:
+        return condition["contains"] in value
+    if "contains_ci" in condition:
+        return condition["contains_ci"].lower() in value.lower()
+    if "present" in condition:
+        return bool(value) == condition["present"]
+    raise ValueError(f"Rule condition without a test: {condition}")
+
+
+def _factor_value(rule: Mapping[str, Any], risk_factors: RiskFactors) -> str:
+    return risk_factors.get(rule["factor"], rule.get("default", ""))
+
+
+def _first_match(rule: Mapping[str, Any], risk_factors: RiskFactors) -> Optional[int]:
+    """Index of the first case of ``rule`` the country's factor satisfies."""
+    value = _factor_value(rule, risk_factors)
+    for index, case in enumerate(rule["cases"]):
+        if matches(case, value):
+            return index
+    return None
+
+
+@dataclass(frozen=True)
+class CompiledRiskModel:
+    """Compliance rules evaluated for a fixed list of countries."""
+
+    countries: List[str]
+    factor_matrix: np.ndarray  # countries x scoring cases, one-hot per rule
+    weights: np.ndarray  # points of each scoring case
+    base_scores: np.ndarray  # factor_matrix @ weights
+    quality_bounds: np.ndarray  # ascending data quality band bounds
+    quality_points: np.ndarray  # points below each bound, then 0
+    level_bounds: np.ndarray  # highest score of each level but the last
+    level_labels: List[str]
+    details: List[List[str]]  # detail text per country and level
+    recommendations: List[List[str]]
+
+    def index(self, country: str) -> int:
+        return self.countries.index(country)
+
+    def scores(self, data_quality: Union[float, np.ndarray] = 1.0) -> np.ndarray:
+        """
+        Risk scores (0-10 scale) of all countries.
+
+        Args:
+            data_quality: Data quality (0-1); a scalar, one value per country
+                or an array whose last axis is the countries, e.g. a
+                (datasets x countries) matrix or a (datasets, 1) column
+
+        Returns:
+            Scores broadcast to the shape of ``data_quality`` x countries
+        """
+        quality = np.asarray(data_quality, dtype=np.float64)
+        band = np.searchsorted(self.quality_bounds, quality, side="right")
+        return self.base_scores + self.quality_points[band]
+
+    def levels(self, scores: np.ndarray) -> np.ndarray:
+        """Risk level index of each score."""
+        return np.searchsorted(self.level_bounds, scores, side="left")
+
+    def describe(self, country_index: int, score: float) -> str:
+        """Risk assessment string ("<level> - <details>") of a country at a score."""
+        level = int(self.levels(score))
+        return f"{self.level_labels[level]} - {self.details[country_index][level]}"
+
+
+class ComplianceRules:
+    """A version of the declarative compliance rule file."""
+
+    def __init__(self, data: Mapping[str, Any]):
+        self.version = str(data.get("version", ""))
+        self.risk_factors: Dict[str, Dict[str, str]] = data["countries"]
+        self.scoring = data["scoring"]
+        self.level_rules = data["levels"]
+        self.recommendation_rules = data["recommendations"]
+
+    @classmethod
+    def from_file(cls, path: str) -> "ComplianceRules":
+        with open(path, "r", encoding="utf-8") as handle:
+            return cls(json.load(handle))
+
+    def compile(self, risk_factors: Optional[Mapping[str, RiskFactors]] = None) -> CompiledRiskModel:
+        """Evaluate the rules for every country (the rule file's own countries by default)."""
+        risk_factors = self.risk_factors if risk_factors is None else risk_factors
+        countries = list(risk_factors)
+
+        # One column per case plus one for each rule's "otherwise" points
+        weights: List[float] = []
+        offsets = []
+        for rule in self.scoring["factors"]:
+            offsets.append(len(weights))
+            weights.extend(float(case["points"]) for case in rule["cases"])
+            weights.append(float(rule.get("otherwise", 0)))
+        factor_matrix = np.zeros((len(countries), len(weights)))
+        for row, country in enumerate(countries):
+            for rule, offset in zip(self.scoring["factors"], offsets):
+                case = _first_match(rule, risk_factors[country])
+                factor_matrix[row, offset + (len(rule["cases"]) if case is None else case)] = 1.0
+        weight_vector = np.array(weights)
+
+        bands = sorted(self.scoring.get("data_quality", []), key=lambda band: band["below"])
+        return CompiledRiskModel(
+            countries=countries,
+            factor_matrix=factor_matrix,
+            weights=weight_vector,
+            base_scores=factor_matrix @ weight_vector,
+            quality_bounds=np.array([float(band["below"]) for band in bands]),
+            quality_points=np.array([float(band["points"]) for band in bands] + [0.0]),
+            level_bounds=np.array([float(level["max_score"]) for level in self.level_rules[:-1]]),
+            level_labels=[level["label"] for level in self.level_rules],
+            details=[
+                [self._details(level, country, risk_factors[country]) for level in self.level_rules]
+                for country in countries
+            ],
+            recommendations=[self._recommendations(risk_factors[country]) for country in countries],
+        )
+
+    @staticmethod
+    def _details(level: Mapping[str, Any], country: str, risk_factors: RiskFactors) -> str:
+        summary = level["summary"]
+        details = [summary.get("countries", {}).get(country, summary["default"])]
+        details.extend(
+            note["text"] for note in level.get("notes", []) if matches(note, _factor_value(note, risk_factors))
+        )
+        return "; ".join(details)
+
+    def _recommendations(self, risk_factors: RiskFactors) -> List[str]:
+        recommendations: List[str] = []
+        for rule in self.recommendation_rules["rules"]:
+            case = _first_match(rule, risk_factors)
+            if case is not None:
+                value = _factor_value(rule, risk_factors)
+                recommendations.extend(item.format(value=value) for item in rule["cases"][case]["items"])
+        return recommendations or list(self.recommendation_rules["default"])
+
+
+@lru_cache(maxsize=4)
+def load_compliance_rules(path: str = COMPLIANCE_RULES_PATH) -> ComplianceRules:
+    """Load (once) the compliance rule file."""
+    return ComplianceRules.from_file(path)
@@ -1,107 +1,104 @@
 """
 Compliance Risk Analysis Service
 Analyzes payroll data for compliance risks across different countries
+
+Risk factors and scoring rules come from the declarative rule file and
+are compiled once per version of the risk data (see compliance_rules).
 """
 
+import hashlib
+import json
 import logging
+import threading
+from dataclasses import dataclass, replace
+from datetime import datetime
 from typing import Dict, List, Any, Optional
+import numpy as np
+import pandas as pd
 from ..core.config import STANDARD_FIELDS
+from ..core.exceptions import ValidationAPIError
 # from ..utils.llm_utils import get_compliance_analysis  # Not needed for basic analysis
-from ..utils.mapping_utils import get_mapping_coverage_stats
+from ..utils.mapping_utils import get_mapping_coverage_stats, infer_mapping_from_headers
+from .cost_engine import build_employee_vectors, conversion_factors
+from .currency_engine import EXCHANGE_RATES, CurrencyEngine
+from .compliance_rules import load_compliance_rules
+from .location_index import UNRESOLVED, load_location_index
+from .shared_cache import create_cache
+from .simulation_cache import content_hash
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class HeatmapSnapshot:
+    """Serialized global heatmap for one version of the risk data."""
+
+    version: int
+    etag: str
+    body: bytes
+    total_countries: int
+
+
 class ComplianceAnalysisService:
     """Service for analyzing compliance risks across different countries"""
 
-    # Compliance risk factors by country
-    COUNTRY_RISK_FACTORS = {
-        "Germany": {
-            "tax_complexity": "high",
-            "social_security": "complex",
-            "data_protection": "GDPR strict",
-            "labor_law": "comprehensive",
-            "reporting_requirements": "extensive",
-            "base_risk": "medium"
-        },
-        "France": {
-            "tax_complexity": "high",
-            "social_security": "complex",
-            "data_protection": "GDPR strict", 
-            "labor_law": "strict",
-            "reporting_requirements": "extensive",
-            "base_risk": "medium"
-        },
-        "United Kingdom": {
-            "tax_complexity": "medium",
-            "social_security": "moderate",
-            "data_protection": "UK GDPR",
-            "labor_law": "flexible",
-            "reporting_requirements": "moderate",
-            "base_risk": "low"
-        },
-        "Netherlands": {
-            "tax_complexity": "medium",
-            "social_security": "moderate",
-            "data_protection": "GDPR strict",
-            "labor_law": "balanced",
-            "reporting_requirements": "moderate",
-            "base_risk": "low"
-        },
-        "United States": {
-            "tax_complexity": "high",
-            "social_security": "federal + state",
-            "data_protection": "state-specific",
-            "labor_law": "state-specific",
-            "reporting_requirements": "complex",
-            "base_risk": "medium"
-        },
-        "Canada": {
-            "tax_complexity": "medium",
-            "social_security": "federal + provincial",
-            "data_protection": "PIPEDA",
-            "labor_law": "provincial",
-            "reporting_requirements": "moderate",
-            "base_risk": "low"
-        },
-        "Japan": {
-            "tax_complexity": "high",
-            "social_security": "complex",
-            "data_protection": "APPI",
-            "labor_law": "traditional",
-            "reporting_requirements": "extensive",
-            "base_risk": "medium"
-        },
-        "Australia": {
-            "tax_complexity": "medium",
-            "social_security": "superannuation",
-            "data_protection": "Privacy Act",
-            "labor_law": "fair work",
-            "reporting_requirements": "moderate",
-            "base_risk": "low"
-        },
-        "Singapore": {
-            "tax_complexity": "low",
-            "social_security": "CPF",
-            "data_protection": "PDPA",
-            "labor_law": "flexible",
-            "reporting_requirements": "streamlined",
-            "base_risk": "low"
-        },
-        "Switzerland": {
-            "tax_complexity": "high",
-            "social_security": "complex",
-            "data_protection": "Swiss DPA",
-            "labor_law": "cantonal",
-            "reporting_requirements": "detailed",
-            "base_risk": "medium"
-        }
-    }
+    # Compliance risk factors by country (from the rule file)
+    COUNTRY_RISK_FACTORS = load_compliance_rules().risk_factors
 
     def __init__(self):
         """Initialize the compliance analysis service"""
+        self.rules = load_compliance_rules()
         self.risk_factors = self.COUNTRY_RISK_FACTORS
+        self.risk_model = self.rules.compile(self.risk_factors)
+        self.currency_engine = CurrencyEngine(EXCHANGE_RATES)
+        self.location_index = load_location_index()
+        self._risk_version = 0
+        self._risk_hash = content_hash([self.rules.version, self.risk_factors])
+        self._heatmap: Optional[HeatmapSnapshot] = None
+        self._heatmap_lock = threading.Lock()
+        # Workers with the same risk data serve one body (and ETag) built once per host
+        self.heatmap_cache = create_cache("compliance_heatmap", 8)
+
+    def set_risk_factors(self, risk_factors: Dict[str, Dict[str, str]]) -> None:
+        """Replace the risk data; the next heatmap request rebuilds the snapshot."""
+        risk_model = self.rules.compile(risk_factors)
+        with self._heatmap_lock:
+            self.risk_factors = risk_factors
+            self.risk_model = risk_model
+            self._risk_version += 1
+            self._risk_hash = content_hash([self.rules.version, risk_factors])
+
+    def heatmap_snapshot(self) -> HeatmapSnapshot:
+        """
+        Global heatmap (no dataset) serialized once per version of the risk data
+        (once per host in multi-worker mode).
+
+        The ETag is the SHA-256 of the body, so it changes exactly when the
+        served bytes do.
+        """
+        with self._heatmap_lock:
+            if self._heatmap is not None and self._heatmap.version == self._risk_version:
+                return self._heatmap
+            key = ("heatmap", self._risk_hash)
+            shared = self.heatmap_cache.get(key)
+            if shared is not None:
+                self._heatmap = replace(shared, version=self._risk_version)
+            else:
+                heatmap = self.analyze_compliance_risks()
+                body = json.dumps({
+                    "compliance_heatmap": heatmap,
+                    "last_updated": datetime.utcnow().isoformat(),
+                    "total_countries": len(heatmap)
+                }).encode("utf-8")
+                self._heatmap = HeatmapSnapshot(
+                    version=self._risk_version,
+                    etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+                    body=body,
+                    total_countries=len(heatmap),
+                )
+                self.heatmap_cache.put(key, self._heatmap)
+                logger.info(f"Built compliance heatmap for {len(heatmap)} countries")
+            return self._heatmap
 
     def analyze_compliance_risks(
         self, 
@@ -120,154 +117,127 @@ class ComplianceAnalysisService:
         Returns:
             Dictionary mapping country names to risk assessments
         """
-        compliance_heatmap = {}
-        
         # Calculate data quality score if data is provided
         data_quality_score = 1.0  # Default to perfect
         if headers and mapping:
             coverage_stats = get_mapping_coverage_stats(mapping)
             data_quality_score = coverage_stats.get('coverage_percentage', 100) / 100
         
-        # Analyze each country
-        for country, risk_factors in self.risk_factors.items():
-            risk_assessment = self._assess_country_risk(country, risk_factors, data_quality_score)
-            compliance_heatmap[country] = risk_assessment
-            
-        return compliance_heatmap
+        # Score every country at once
+        risk_model = self.risk_model
+        scores = risk_model.scores(data_quality_score)
+        return {
+            country: risk_model.describe(index, score)
+            for index, (country, score) in enumerate(zip(risk_model.countries, scores))
+        }
 
-    def _assess_country_risk(self, country: str, risk_factors: Dict[str, str], data_quality: float) -> str:
+    def analyze_dataset(
+        self,
+        df: pd.DataFrame,
+        mapping: Optional[Dict[str, str]] = None,
+        reporting_currency: str = "USD"
+    ) -> Dict[str, Any]:
         """
-        Assess risk for a specific country
+        Compliance risk of a dataset, per country its employees work in.
+        
+        Each employee's location is resolved to a country; employees are
+        grouped by country (factorize + bincount, no per-row Python), and each
+        country's risk score is weighted by its share of headcount and payroll
+        volume. The data quality a country is scored at is the lower of the
+        mapping coverage and its rows' completeness.
         
         Args:
-            country: Country name
-            risk_factors: Risk factors for the country
-            data_quality: Data quality score (0-1)
+            df: Source data
+            mapping: Field mapping; inferred from the headers when omitted
+            reporting_currency: Currency of payroll volumes
             
         Returns:
-            Risk assessment string
+            Dictionary with per-country weighted risk, row-level data gaps,
+            headcount in recognized countries without risk data and the
+            dataset's overall risk score
+
+        Raises:
+            ValidationAPIError: If the reporting currency has no exchange rate
         """
-        base_risk = risk_factors.get("base_risk", "medium")
-        
-        # Calculate risk score (0-10 scale)
-        risk_score = 0
-        
-        # Base risk contribution
-        if base_risk == "low":
-            risk_score += 2
-        elif base_risk == "medium":
-            risk_score += 5
-        else:  # high
-            risk_score += 8
-            
-        # Tax complexity
-        tax_complexity = risk_factors.get("tax_complexity", "medium")
-        if tax_complexity == "high":
-            risk_score += 2
-        elif tax_complexity == "medium":
-            risk_score += 1
-            
-        # Data protection requirements
-        data_protection = risk_factors.get("data_protection", "")
-        if "GDPR" in data_protection:
-            risk_score += 1.5
-        elif "strict" in data_protection.lower():
-            risk_score += 1
-            
-        # Labor law complexity
-        labor_law = risk_factors.get("labor_law", "")
-        if labor_law in ["comprehensive", "strict"]:
-            risk_score += 1
-            
-        # Adjust for data quality
-        if data_quality < 0.7:
-            risk_score += 2  # Poor data quality increases risk
-        elif data_quality < 0.9:
-            risk_score += 1  # Moderate data quality adds some risk
-            
-        # Generate risk assessment based on score
-        if risk_score <= 3:
-            level = "Low Risk"
-            details = self._get_low_risk_details(country, risk_factors)
-        elif risk_score <= 6:
-            level = "Moderate"
-            details = self._get_moderate_risk_details(country, risk_factors)
-        else:
-            level = "High Risk"
-            details = self._get_high_risk_details(country, risk_factors)
-            
-        return f"{level} - {details}"
+        if reporting_currency not in self.currency_engine:
+            raise ValidationAPIError(f"Unsupported reporting currency: {reporting_currency}")
+        headers = [str(column) for column in df.columns]
+        mapping = mapping or infer_mapping_from_headers(headers)
+        coverage = get_mapping_coverage_stats(mapping)["coverage_percentage"] / 100
 
-    def _get_low_risk_details(self, country: str, risk_factors: Dict[str, str]) -> str:
-        """Get details for low risk countries"""
-        details = []
-        
-        if country == "Singapore":
-            details.append("Streamlined tax system")
-        elif country == "Netherlands":
-            details.append("Well-structured compliance framework")
-        elif country == "Canada":
-            details.append("Clear federal/provincial structure")
-        elif country == "Australia":
-            details.append("Fair Work system provides clarity")
-        elif country == "United Kingdom":
-            details.append("Flexible employment laws")
-        else:
-            details.append("Manageable compliance requirements")
-            
-        # Add data protection note if applicable
-        if "GDPR" in risk_factors.get("data_protection", ""):
-            details.append("GDPR compliance required")
-            
-        return "; ".join(details) if details else "Standard compliance requirements"
+        vectors = build_employee_vectors(df, mapping, hire_dates=True, locations=True)
+        # Locations resolve against the whole gazetteer; only the countries
+        # with risk data are scored, the others are reported as uncovered
+        risk_model = self.risk_model
+        covered = {code: name for code, name in self.location_index.names.items() if name in risk_model.countries}
+        codes, unresolved = self.location_index.resolve(vectors.location)
+        factors, unknown = conversion_factors(vectors.currency, self.currency_engine, reporting_currency)
+        payroll = (vectors.salary + vectors.bonus) * np.nan_to_num(factors, nan=0.0)
 
-    def _get_moderate_risk_details(self, country: str, risk_factors: Dict[str, str]) -> str:
-        """Get details for moderate risk countries"""
-        details = []
-        
-        if country == "Germany":
-            details.append("Complex tax system")
-        elif country == "France":
-            details.append("Extensive labor regulations")
-        elif country == "United States":
-            details.append("Multi-state compliance complexity")
-        elif country == "Japan":
-            details.append("Traditional employment practices")
-        elif country == "Switzerland":
-            details.append("Cantonal variations")
-        else:
-            details.append("Multiple compliance areas need attention")
-            
-        # Common moderate risk factors
-        tax_complexity = risk_factors.get("tax_complexity", "")
-        if tax_complexity == "high":
-            details.append("high tax complexity")
-            
-        return "; ".join(details) if details else "Several compliance considerations"
+        # Row-level gaps in the fields compliance reporting depends on
+        gaps = {
+            "salary": vectors.salary <= 0,
+            "currency": (vectors.currency == "") | np.isnan(factors),
+            "employment_date": np.isnat(vectors.hire_date),
+            "tax_rate": np.isnan(vectors.tax_rate),
+        }
 
-    def _get_high_risk_details(self, country: str, risk_factors: Dict[str, str]) -> str:
-        """Get details for high risk countries"""
-        details = []
-        
-        # High risk typically means multiple complex factors
-        if country == "Germany":
-            details.append("Shadow payroll requirements")
-        elif country == "France":
-            details.append("Strict labor code compliance")
-        elif country == "United States":
-            details.append("Federal and state complexity")
-        elif country == "Japan":
-            details.append("Detailed reporting requirements")
-        else:
-            details.append("Multiple high-complexity factors")
-            
-        # Add specific risk factors
-        if risk_factors.get("social_security") == "complex":
-            details.append("complex social security")
-        if "extensive" in risk_factors.get("reporting_requirements", ""):
-            details.append("extensive reporting")
-            
-        return "; ".join(details) if details else "Immediate attention required"
+        groups, group_codes = pd.factorize(codes)
+        names = [covered.get(code, UNRESOLVED) for code in group_codes]
+        size = len(names)
+        headcount = np.bincount(groups, minlength=size)
+        volume = np.bincount(groups, weights=payroll, minlength=size)
+        gap_counts = {field: np.bincount(groups, weights=mask, minlength=size) for field, mask in gaps.items()}
+        resolved = np.array([name != UNRESOLVED for name in names], dtype=bool)
+        uncovered = {
+            self.location_index.names[code]: int(headcount[index])
+            for index, code in enumerate(group_codes)
+            if code != UNRESOLVED and code not in covered
+        }
+
+        total_headcount = headcount[resolved].sum()
+        total_volume = volume[resolved].sum()
+        completeness = 1 - sum(gap_counts.values()) / (len(gaps) * np.maximum(headcount, 1))
+        # Each country is scored at the data quality of its own rows
+        quality = np.ones(len(risk_model.countries))
+        model_rows = [risk_model.index(name) if name != UNRESOLVED else -1 for name in names]
+        for index in np.flatnonzero(resolved):
+            quality[model_rows[index]] = min(coverage, completeness[index])
+        scores = risk_model.scores(quality)
+
+        countries = []
+        for index in np.flatnonzero(resolved):
+            name = names[index]
+            score = scores[model_rows[index]]
+            headcount_share = headcount[index] / total_headcount
+            payroll_share = volume[index] / total_volume if total_volume else 0.0
+            countries.append({
+                "country": name,
+                "headcount": int(headcount[index]),
+                "headcount_share": round(float(headcount_share), 4),
+                "payroll_volume": round(float(volume[index]), 2),
+                "payroll_share": round(float(payroll_share), 4),
+                "risk_score": float(score),
+                "weighted_risk": round(float(score * (headcount_share + payroll_share) / 2), 4),
+                "assessment": risk_model.describe(model_rows[index], score),
+                "completeness": round(float(completeness[index]), 4),
+                "data_gaps": {field: int(counts[index]) for field, counts in gap_counts.items()},
+            })
+        countries.sort(key=lambda item: item["weighted_risk"], reverse=True)
+
+        return {
+            "employee_count": vectors.count,
+            "reporting_currency": reporting_currency,
+            "mapping_coverage": round(coverage * 100, 2),
+            "unknown_currencies": unknown,
+            "unresolved_locations": int(vectors.count - total_headcount - sum(uncovered.values())),
+            "unresolved_location_values": unresolved[:20],
+            "uncovered_locations": sum(uncovered.values()),
+            "uncovered_countries": dict(sorted(uncovered.items())),
+            "overall_risk_score": round(sum(item["weighted_risk"] for item in countries), 4),
+            "countries": countries,
+            "compliance_heatmap": {item["country"]: item["assessment"] for item in countries},
+        }
 
     def get_country_details(self, country: str) -> Dict[str, Any]:
         """
@@ -282,47 +252,13 @@ class ComplianceAnalysisService:
         if country not in self.risk_factors:
             return {"error": f"Country '{country}' not found in risk database"}
             
-        risk_factors = self.risk_factors[country]
+        risk_model = self.risk_model
+        index = risk_model.index(country)
         
         return {
             "country": country,
-            "risk_factors": risk_factors,
-            "assessment": self._assess_country_risk(country, risk_factors, 1.0),
-            "recommendations": self._get_country_recommendations(country, risk_factors)
+            "risk_factors": self.risk_factors[country],
+            "assessment": risk_model.describe(index, risk_model.scores(1.0)[index]),
+            "recommendations": list(risk_model.recommendations[index])
         }
-    
-    def _get_country_recommendations(self, country: str, risk_factors: Dict[str, str]) -> List[str]:
-        """Get recommendations for a specific country"""
-        recommendations = []
-        
-        # Tax complexity recommendations
-        if risk_factors.get("tax_complexity") == "high":
-            recommendations.append("Engage local tax expertise")
-            recommendations.append("Implement robust tax calculation system")
-            
-        # Data protection recommendations
-        data_protection = risk_factors.get("data_protection", "")
-        if "GDPR" in data_protection:
-            recommendations.append("Ensure GDPR compliance for employee data")
-            recommendations.append("Implement data subject rights procedures")
-        elif data_protection:
-            recommendations.append(f"Comply with {data_protection} requirements")
-            
-        # Labor law recommendations
-        labor_law = risk_factors.get("labor_law", "")
-        if labor_law in ["comprehensive", "strict"]:
-            recommendations.append("Review employment contracts with local counsel")
-            recommendations.append("Stay updated on labor law changes")
-            
-        # Reporting recommendations
-        reporting = risk_factors.get("reporting_requirements", "")
-        if reporting == "extensive":
-            recommendations.append("Establish comprehensive reporting procedures")
-            recommendations.append("Consider local payroll provider")
-            
-        # Default recommendations
-        if not recommendations:
-            recommendations.append("Monitor regulatory changes")
-            recommendations.append("Maintain accurate employee records")
-            
-        return recommendations 
\ No newline at end of file
+
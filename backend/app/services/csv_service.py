@@ -1,12 +1,33 @@
+import asyncio
+import codecs
 import io
-from typing import List, Tuple
+import os
+from typing import Any, Dict, List, Tuple
 
 import pandas as pd
 from fastapi import UploadFile
 from pandas.errors import EmptyDataError, ParserError
 
-from ..core.config import ALLOWED_FILE_EXTENSIONS, SAMPLE_ROWS_LIMIT
-from ..core.exceptions import ProcessingAPIError, ValidationAPIError
+from ..core.config import (
+    ALLOWED_FILE_EXTENSIONS,
+    MAX_DATASET_FILE_SIZE,
+    MAX_FILE_SIZE,
+    PARALLEL_PARSE_CHUNKS,
+    PARALLEL_PARSE_MIN_BYTES,
+    SAMPLE_ROWS_LIMIT,
+)
+from ..core.exceptions import PayrollAPIError, ProcessingAPIError, ValidationAPIError
+from ..core.executor import cpu_pool, run_cpu_bound, run_io_bound
+from ..utils.csv_chunking import (
+    find_inconsistent_columns,
+    find_record_boundaries,
+    parse_chunk,
+    read_header,
+)
+from ..utils.dtype_utils import optimize_dtypes
+from ..utils.upload_spool import MappedFileReader, spool_upload
+
+CSV_ENCODINGS = ["utf-8", "latin1", "iso-8859-1"]
 
 
 class CSVService:
@@ -26,6 +47,33 @@ class CSVService:
         if not file.filename or not any(file.filename.endswith(ext) for ext in ALLOWED_FILE_EXTENSIONS):
             raise ValidationAPIError("Only CSV files are allowed")
 
+    @staticmethod
+    def _read_dataframe(path: str) -> pd.DataFrame:
+        """
+        Parse a spooled CSV file through a memory map, trying several encodings.
+
+        Each encoding attempt maps the same file again instead of copying the
+        content. Runs on the shared thread pool; pandas releases the GIL while
+        parsing.
+
+        Raises:
+            ValidationAPIError: If no encoding yields a parseable CSV
+        """
+        last_error = None
+
+        for encoding in CSV_ENCODINGS:
+            try:
+                with MappedFileReader(path) as raw:
+                    return pd.read_csv(io.BufferedReader(raw), encoding=encoding)
+            except UnicodeDecodeError:
+                last_error = f"Failed to decode with {encoding} encoding"
+                continue
+            except Exception as e:
+                last_error = str(e)
+                break
+
+        raise ValidationAPIError(f"Failed to parse CSV file: {last_error}")
+
     @staticmethod
     async def parse_csv(file: UploadFile) -> Tuple[List[str], List[List[str]]]:
         """
@@ -43,30 +91,13 @@ class CSVService:
         """
         CSVService.validate_file(file)
 
+        upload = None
         try:
-            content = await file.read()
-            if not content:
+            upload = await spool_upload(file, MAX_FILE_SIZE)
+            if not upload.size:
                 raise ValidationAPIError("Empty file uploaded")
 
-            # Try different encodings
-            encodings = ["utf-8", "latin1", "iso-8859-1"]
-            df = None
-            last_error = None
-
-            for encoding in encodings:
-                try:
-                    file_obj = io.BytesIO(content)
-                    df = pd.read_csv(file_obj, encoding=encoding)
-                    break
-                except UnicodeDecodeError:
-                    last_error = f"Failed to decode with {encoding} encoding"
-                    continue
-                except Exception as e:
-                    last_error = str(e)
-                    break
-
-            if df is None:
-                raise ValidationAPIError(f"Failed to parse CSV file: {last_error}")
+            df = await run_io_bound(CSVService._read_dataframe, upload.path)
 
             headers = df.columns.tolist()
             sample_rows = (
@@ -79,7 +110,132 @@ class CSVService:
             raise ValidationAPIError("The CSV file is empty")
         except ParserError:
             raise ValidationAPIError("Invalid CSV format")
+        except PayrollAPIError:
+            raise
+        except Exception as e:
+            raise ProcessingAPIError(f"Error processing CSV file: {str(e)}")
+        finally:
+            if upload:
+                upload.cleanup()
+            await file.close()
+
+    @staticmethod
+    def detect_encoding(path: str, block_size: int = 1024 * 1024) -> str:
+        """
+        Pick the first encoding in CSV_ENCODINGS that decodes the whole file.
+
+        Decodes incrementally in fixed-size blocks so memory stays bounded,
+        letting streaming consumers commit to an encoding before the first
+        chunk is emitted.
+        """
+        for encoding in CSV_ENCODINGS:
+            decoder = codecs.getincrementaldecoder(encoding)()
+            try:
+                with open(path, "rb") as handle:
+                    while block := handle.read(block_size):
+                        decoder.decode(block)
+                    decoder.decode(b"", final=True)
+                return encoding
+            except UnicodeDecodeError:
+                continue
+        raise ValidationAPIError("Failed to decode CSV file with supported encodings")
+
+    @staticmethod
+    async def _read_parallel(path: str, encoding: str, n_chunks: int) -> pd.DataFrame:
+        """
+        Parse a CSV file in record-aligned chunks on the process pool.
+
+        Columns whose per-chunk inferred dtypes disagree (e.g. numeric in one
+        chunk, text in another) are re-parsed as strings in every chunk, so
+        the reassembled dataset has one consistent dtype per column.
+        """
+        header_end, ranges = await run_io_bound(find_record_boundaries, path, n_chunks)
+        headers = await run_io_bound(read_header, path, header_end, encoding)
+        if not ranges:
+            return pd.DataFrame(columns=headers)
+
+        async def parse_all(dtype=None) -> List[pd.DataFrame]:
+            return await asyncio.gather(*(
+                run_cpu_bound(parse_chunk, path, start, end, headers, encoding, dtype)
+                for start, end in ranges
+            ))
+
+        chunks = await parse_all()
+        inconsistent = find_inconsistent_columns(chunks)
+        if inconsistent:
+            chunks = await parse_all({column: str for column in inconsistent})
+
+        return await run_io_bound(pd.concat, chunks, ignore_index=True)
+
+    @staticmethod
+    async def read_dataset(path: str) -> pd.DataFrame:
+        """
+        Parse a complete spooled CSV file.
+
+        Files of at least PARALLEL_PARSE_MIN_BYTES are split on record
+        boundaries and parsed across the process pool; smaller files are
+        parsed in a single pass over a memory map on the thread pool.
+
+        Raises:
+            ValidationAPIError: If the file is empty or cannot be parsed
+        """
+        size = os.path.getsize(path)
+        if size == 0:
+            raise ValidationAPIError("Empty file uploaded")
+
+        n_chunks = PARALLEL_PARSE_CHUNKS if cpu_pool is not None else 1
+        if n_chunks <= 1 or size < PARALLEL_PARSE_MIN_BYTES:
+            return await run_io_bound(CSVService._read_dataframe, path)
+
+        last_error = None
+        for encoding in CSV_ENCODINGS:
+            try:
+                return await CSVService._read_parallel(path, encoding, n_chunks)
+            except UnicodeDecodeError:
+                last_error = f"Failed to decode with {encoding} encoding"
+                continue
+            except EmptyDataError:
+                raise ValidationAPIError("The CSV file is empty")
+            except ParserError:
+                raise ValidationAPIError("Invalid CSV format")
+
+        raise ValidationAPIError(f"Failed to parse CSV file: {last_error}")
+
+    @staticmethod
+    async def load_dataset(file: UploadFile) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """
+        Parse the full contents of an uploaded CSV file into compact dtypes.
+
+        Args:
+            file: The uploaded CSV file
+
+        Returns:
+            Tuple of (DataFrame with every row of the file, ingestion metadata).
+            The metadata holds the content ``sha256``, the optimized
+            ``memory_bytes`` and the per-column ``memory`` report.
+
+        Raises:
+            ValidationAPIError: If file is invalid or empty
+            PayloadTooLargeError: If file exceeds MAX_DATASET_FILE_SIZE
+            ProcessingAPIError: If parsing fails
+        """
+        CSVService.validate_file(file)
+
+        upload = None
+        try:
+            upload = await spool_upload(file, MAX_DATASET_FILE_SIZE)
+            df = await CSVService.read_dataset(upload.path)
+            df, memory_report = await run_io_bound(optimize_dtypes, df)
+            return df, {
+                "sha256": upload.sha256,
+                "memory_bytes": memory_report["bytes_after"],
+                "memory": memory_report,
+            }
+        except PayrollAPIError:
+            raise
         except Exception as e:
             raise ProcessingAPIError(f"Error processing CSV file: {str(e)}")
         finally:
+            if upload:
+                upload.cleanup()
             await file.close()
@@ -0,0 +1,189 @@
+"""
+Cross-rate currency conversion for mixed-currency payroll data.
+
+Rates are loaded once into a (currencies x currencies) cross-rate matrix.
+Row currencies are encoded to integer codes with ``pd.factorize`` (one
+dictionary lookup per distinct code, not per row), after which converting
+whole salary/bonus columns to any reporting currency is a single gather
+``matrix[codes, target]`` and an element-wise multiply. Unknown currencies
+map to code UNKNOWN_CURRENCY, which gathers a NaN factor and is reported.
+"""
+
+from typing import Iterable, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+# Mock rates in units per USD
+EXCHANGE_RATES = {
+    "USD": 1.0,
+    "EUR": 0.85,
+    "GBP": 0.73,
+    "JPY": 110.0,
+    "CAD": 1.25,
+    "AUD": 1.35,
+    "SGD": 1.35,
+    "CHF": 0.92,
+    "SEK": 8.5,
+    "NOK": 8.8,
+    "INR": 83.0,
+    "MXN": 17.0
+}
+
+UNKNOWN_CURRENCY = -1
+
+
+class CurrencyEngine:
+    """Precomputed cross-rate matrix over a fixed set of currencies."""
+
+    def __init__(self, rates: Mapping[str, float], default_currency: str = "USD"):
+        """
+        Args:
+            rates: Units of each currency per USD
+            default_currency: Currency assumed for rows without one
+        """
+        self.codes: List[str] = sorted(rates)
+        self.index = {code: position for position, code in enumerate(self.codes)}
+        self.default_currency = default_currency
+        per_usd = np.array([float(rates[code]) for code in self.codes], dtype=np.float64)
+        # matrix[i, j] converts one unit of currency i into currency j. The
+        # trailing NaN row is what UNKNOWN_CURRENCY (-1) gathers.
+        cross = per_usd[None, :] / per_usd[:, None]
+        self.matrix = np.vstack([cross, np.full(len(self.codes), np.nan)])
+
+    @classmethod
+    def of(cls, rates: Union["CurrencyEngine", Mapping[str, float]]) -> "CurrencyEngine":
+        """Return ``rates`` if it already is an engine, else build one from the mapping."""
+        return rates if isinstance(rates, cls) else cls(rates)
+
+    def __contains__(self, code: object) -> bool:
+        return code in self.index
+
+    def rate(self, source: str, target: str) -> float:
+        """Units of ``target`` per unit of ``source``; raises KeyError for unknown codes."""
+        return float(self.matrix[self.index[source], self.index[target]])
+
+    def encode(
+        self, currency: Iterable, default_currency: Optional[str] = None
+    ) -> Tuple[np.ndarray, List[str]]:
+        """
+        Encode currency strings to integer codes.
+
+        Blank or missing values take the default currency. Values are
+        expected in upper case without surrounding whitespace.
+
+        Returns:
+            Tuple of (code per row, UNKNOWN_CURRENCY where unsupported;
+            sorted list of unknown currency strings)
+        """
+        return encode_currencies(currency, self.index, default_currency or self.default_currency)
+
+    def factors(self, codes: np.ndarray, target: str) -> np.ndarray:
+        """Per-row factor converting each row's currency into ``target`` (NaN if unknown)."""
+        return self.matrix[codes, self.index[target]]
+
+    def convert(
+        self, amounts: np.ndarray, currency: Iterable, target: str
+    ) -> Tuple[np.ndarray, List[str]]:
+        """
+        Convert amounts from each row's own currency into ``target``.
+
+        Returns:
+            Tuple of (converted amounts, NaN for unknown currencies;
+            sorted list of unknown currency strings)
+        """
+        codes, unknown = self.encode(currency)
+        return np.asarray(amounts, dtype=np.float64) * self.factors(codes, target), unknown
+
+    def convert_frame(
+        self,
+        frame: pd.DataFrame,
+        target: str,
+        amount_columns: Tuple[str, ...] = ("salary", "bonus"),
+        currency_column: str = "currency",
+    ) -> Tuple[pd.DataFrame, List[str], int]:
+        """
+        Convert normalized string amount columns of a standardized frame.
+
+        Converted amounts are written with two decimals and the currency
+        column of rows with a converted amount is set to ``target``. Rows in
+        unknown currencies, or with an amount that does not parse, keep their
+        original amounts and currency.
+
+        Returns:
+            Tuple of (converted copy of the frame, sorted unknown currencies,
+            rows with an exchange rate but an amount left unconverted)
+        """
+        codes, unknown = self.encode(normalized_currency(frame[currency_column]))
+        converted, unconverted = apply_conversion(
+            frame, self.factors(codes, target), target, amount_columns, currency_column
+        )
+        return converted, unknown, unconverted
+
+
+def encode_currencies(
+    currency: Iterable, index: Mapping[str, int], default_currency: str
+) -> Tuple[np.ndarray, List[str]]:
+    """
+    Encode currency strings to positions in ``index`` (see CurrencyEngine.encode).
+
+    Returns:
+        Tuple of (code per row, UNKNOWN_CURRENCY where unsupported;
+        sorted list of unknown currency strings)
+    """
+    default = index.get(default_currency, UNKNOWN_CURRENCY)
+    inverse, uniques = pd.factorize(np.asarray(currency, dtype=object))
+    lookup = np.array(
+        [index.get(str(code), UNKNOWN_CURRENCY) if code else default for code in uniques]
+        + [default],  # factorize marks missing values with -1
+        dtype=np.intp,
+    )
+    unknown = sorted(
+        str(code) for code, mapped in zip(uniques, lookup) if mapped == UNKNOWN_CURRENCY and code
+    )
+    return lookup[inverse], unknown
+
+
+def normalized_currency(column: pd.Series) -> pd.Series:
+    """Trimmed upper-case currency strings ("" where missing)."""
+    return column.fillna("").astype(str).str.strip().str.upper()
+
+
+def apply_conversion(
+    frame: pd.DataFrame,
+    factors: np.ndarray,
+    target: str,
+    amount_columns: Tuple[str, ...] = ("salary", "bonus"),
+    currency_column: str = "currency",
+) -> Tuple[pd.DataFrame, int]:
+    """
+    Multiply string amount columns by per-row factors (NaN leaves the row as-is).
+
+    A row with an amount that does not parse is left entirely unconverted,
+    so no row mixes amounts in two currencies; only rows with at least one
+    converted amount are relabeled to ``target``.
+
+    Returns:
+        Tuple of (converted copy of the frame with two-decimal amounts,
+        rows with a factor left unconverted because an amount does not parse)
+    """
+    values = {
+        column: pd.to_numeric(frame[column], errors="coerce").to_numpy(dtype=np.float64)
+        for column in amount_columns
+    }
+    unparsed = np.zeros(len(frame), dtype=bool)
+    for column, amounts in values.items():
+        unparsed |= np.isnan(amounts) & (frame[column].fillna("").astype(str).str.strip() != "").to_numpy()
+    convertible = ~np.isnan(factors) & ~unparsed
+
+    converted = frame.copy()
+    relabel = np.zeros(len(frame), dtype=bool)
+    for column, amounts in values.items():
+        valid = convertible & ~np.isnan(amounts)
+        relabel |= valid
+        if valid.any():
+            text = converted[column].to_numpy(dtype=object, copy=True)
+            text[valid] = np.char.mod("%.2f", amounts[valid] * factors[valid])
+            converted[column] = text
+    converted.loc[relabel, currency_column] = target
+    return converted, int((~np.isnan(factors) & unparsed).sum())
@@ -0,0 +1,148 @@
+"""
+Dataset store for SmartPayMap.
+
+Holds fully ingested payroll datasets in memory so follow-up requests
+(simulation, compliance, export) can reference them by id instead of
+re-uploading rows. In multi-worker mode (SHARED_STATE_DIR) datasets are
+stored in the shared state directory instead, so a dataset uploaded
+through one worker is readable by all of them without a copy per worker.
+"""
+
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+from ..core.config import DATASET_STORE_MAX_DATASETS, SHARED_STATE_DIR
+from ..core.exceptions import NotFoundAPIError, ProcessingAPIError
+from .shared_cache import SharedCache
+
+
+class DatasetStore:
+    """In-memory store of ingested datasets with least-recently-used eviction."""
+
+    def __init__(self, max_datasets: int = DATASET_STORE_MAX_DATASETS):
+        self.max_datasets = max(1, max_datasets)
+        self._datasets: "OrderedDict[str, Tuple[pd.DataFrame, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, df: pd.DataFrame, metadata: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Store a dataset and return its id.
+
+        Args:
+            df: The ingested dataset
+            metadata: Optional metadata (source filename, memory_bytes, ...)
+
+        Returns:
+            The generated dataset id
+        """
+        dataset_id = uuid.uuid4().hex
+        info = self._info(dataset_id, df, metadata)
+        with self._lock:
+            self._datasets[dataset_id] = (df, info)
+            while len(self._datasets) > self.max_datasets:
+                self._datasets.popitem(last=False)
+        return dataset_id
+
+    @staticmethod
+    def _info(dataset_id: str, df: pd.DataFrame, metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        return {
+            "dataset_id": dataset_id,
+            "row_count": len(df),
+            "created_at": datetime.utcnow().isoformat(),
+            **(metadata or {}),
+        }
+
+    def get(self, dataset_id: str) -> pd.DataFrame:
+        """
+        Get a stored dataset.
+
+        Raises:
+            NotFoundAPIError: If the dataset does not exist (or was evicted)
+        """
+        return self._get_entry(dataset_id)[0]
+
+    def get_metadata(self, dataset_id: str) -> Dict[str, Any]:
+        """Get metadata for a stored dataset."""
+        return dict(self._get_entry(dataset_id)[1])
+
+    def _get_entry(self, dataset_id: str) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        with self._lock:
+            entry = self._datasets.get(dataset_id)
+            if entry is None:
+                raise NotFoundAPIError(f"Dataset '{dataset_id}' not found")
+            self._datasets.move_to_end(dataset_id)
+            return entry
+
+    def delete(self, dataset_id: str) -> bool:
+        """Remove a dataset; returns False if it did not exist."""
+        with self._lock:
+            return self._datasets.pop(dataset_id, None) is not None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return store size metrics."""
+        with self._lock:
+            entries = list(self._datasets.values())
+        return {
+            "datasets": len(entries),
+            "max_datasets": self.max_datasets,
+            "rows": sum(info["row_count"] for _, info in entries),
+            "memory_bytes": sum(info.get("memory_bytes", 0) for _, info in entries),
+        }
+
+
+class SharedDatasetStore(DatasetStore):
+    """
+    Dataset store shared by all worker processes on the host.
+
+    Frames are memory-mapped from the shared state directory: numeric
+    columns and categorical codes are not copied into the reading worker.
+    """
+
+    def __init__(self, max_datasets: int = DATASET_STORE_MAX_DATASETS, directory: Optional[str] = SHARED_STATE_DIR):
+        super().__init__(max_datasets)
+        self._shared = SharedCache("datasets", self.max_datasets, directory)
+
+    def put(self, df: pd.DataFrame, metadata: Optional[Dict[str, Any]] = None) -> str:
+        dataset_id = uuid.uuid4().hex
+        try:
+            self._shared.store(dataset_id, df, self._info(dataset_id, df, metadata))
+        except OSError as e:
+            raise ProcessingAPIError(f"Failed to store dataset: {str(e)}")
+        return dataset_id
+
+    def get_metadata(self, dataset_id: str) -> Dict[str, Any]:
+        info = self._shared.meta(dataset_id)
+        if info is None:
+            raise NotFoundAPIError(f"Dataset '{dataset_id}' not found")
+        return info
+
+    def _get_entry(self, dataset_id: str) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        entry = self._shared.load(dataset_id)
+        if entry is None:
+            raise NotFoundAPIError(f"Dataset '{dataset_id}' not found")
+        return entry
+
+    def delete(self, dataset_id: str) -> bool:
+        return self._shared.delete(dataset_id)
+
+    def stats(self) -> Dict[str, Any]:
+        entries = self._shared.metas()
+        return {
+            "datasets": len(entries),
+            "max_datasets": self.max_datasets,
+            "rows": sum(info["row_count"] for info in entries),
+            "memory_bytes": sum(info.get("memory_bytes", 0) for info in entries),
+            "shared": True,
+        }
+
+
+def create_dataset_store() -> DatasetStore:
+    """The dataset store for this deployment: shared in multi-worker mode, else in-process."""
+    if SHARED_STATE_DIR:
+        return SharedDatasetStore()
+    return DatasetStore()
@@ -0,0 +1,242 @@
+"""
+Standardized export service for SmartPayMap.
+
+Builds the unified STANDARD_FIELDS CSV export from parsed rows and field
+mappings. The build runs on the shared process pool because the per-row
+standardization is pure Python.
+
+Files larger than memory go through the out-of-core pipeline instead: the
+source is read in row chunks, each chunk is mapped and normalized with
+vectorized operations and written out before the next one is read, so peak
+memory is bounded by PIPELINE_CHUNK_ROWS rather than by the file size.
+
+Both paths can convert salary and bonus into a single reporting currency
+through the shared CurrencyEngine cross-rate matrix, optionally at the
+historical rate effective on each row's date (see fx_history).
+"""
+
+import io
+from typing import AsyncIterator, Dict, Iterator, List, Optional, TextIO, Tuple
+
+import pandas as pd
+
+from ..core.config import PIPELINE_CHUNK_ROWS, STANDARD_FIELDS
+from ..core.executor import run_cpu_bound, run_io_bound
+from .currency_engine import EXCHANGE_RATES, CurrencyEngine, apply_conversion, normalized_currency
+from .fx_history import historical_conversion_factors, load_fx_history
+from ..utils.mapping_utils import (
+    build_mapping_plan,
+    construct_standardized_frame,
+    construct_standardized_row,
+    normalize_standardized_values,
+    parse_dates,
+)
+
+
+class ExportService:
+    """Service for building standardized CSV exports."""
+
+    currency_engine = CurrencyEngine(EXCHANGE_RATES)
+
+    @staticmethod
+    def build_standardized_csv(
+        rows: List[Dict[str, str]],
+        mappings: Dict[str, str],
+        reporting_currency: Optional[str] = None,
+        fx_date_column: Optional[str] = None,
+    ) -> Tuple[str, int, int, List[str], int]:
+        """
+        Convert rows to the STANDARD_FIELDS schema and render them as CSV.
+
+        Args:
+            rows: Parsed CSV rows as list of dictionaries
+            mappings: Field mappings from source to standard fields
+            reporting_currency: Convert salary/bonus to this currency (rows in
+                unknown currencies are left as-is)
+            fx_date_column: Standard field or source column whose dates select
+                historical exchange rates for the conversion
+
+        Returns:
+            Tuple of (csv_content, row_count, column_count, unknown_currencies,
+            unconverted_rows)
+        """
+        # Extract headers from the first row (all rows should have same keys)
+        headers = list(rows[0].keys())
+
+        # Convert list of dicts to list of lists, ordered by headers
+        data_rows = [[row_dict.get(header, "") for header in headers] for row_dict in rows]
+
+        standardized_data = [
+            construct_standardized_row(row, headers, mappings) for row in data_rows
+        ]
+
+        df = pd.DataFrame(standardized_data)
+
+        # Ensure all STANDARD_FIELDS are present as columns (add missing ones as empty)
+        for field in STANDARD_FIELDS:
+            if field not in df.columns:
+                df[field] = ""
+
+        # Reorder columns to match STANDARD_FIELDS order; values are normalized
+        # exactly as in the out-of-core pipeline, so both exports are identical
+        df = normalize_standardized_values(df[STANDARD_FIELDS])
+
+        unknown_currencies: List[str] = []
+        unconverted_rows = 0
+        if reporting_currency:
+            df, unknown_currencies, unconverted_rows = ExportService.convert_currency(
+                df, pd.DataFrame(rows), reporting_currency, fx_date_column
+            )
+
+        csv_buffer = io.StringIO()
+        df.to_csv(csv_buffer, index=False, encoding="utf-8")
+
+        return csv_buffer.getvalue(), len(df), len(df.columns), unknown_currencies, unconverted_rows
+
+    async def export_standardized(
+        self,
+        rows: List[Dict[str, str]],
+        mappings: Dict[str, str],
+        reporting_currency: Optional[str] = None,
+        fx_date_column: Optional[str] = None,
+    ) -> Tuple[str, int, int, List[str], int]:
+        """Build the standardized CSV off the event loop."""
+        return await run_cpu_bound(
+            ExportService.build_standardized_csv, rows, mappings, reporting_currency, fx_date_column
+        )
+
+    @staticmethod
+    def convert_currency(
+        standardized: pd.DataFrame,
+        source: pd.DataFrame,
+        reporting_currency: str,
+        fx_date_column: Optional[str] = None,
+    ) -> Tuple[pd.DataFrame, List[str], int]:
+        """
+        Convert salary/bonus of a normalized standardized frame to reporting_currency.
+
+        Args:
+            standardized: Normalized STANDARD_FIELDS frame
+            source: Source rows aligned with ``standardized`` (for non-standard date columns)
+            reporting_currency: Target currency
+            fx_date_column: Standard field or source column selecting as-of
+                historical rates; rows without a usable date use spot rates
+
+        Returns:
+            Tuple of (converted frame, sorted unknown currencies, rows with a
+            rate whose amounts could not be converted)
+        """
+        engine = ExportService.currency_engine
+        if not fx_date_column:
+            return engine.convert_frame(standardized, reporting_currency)
+
+        table = standardized if fx_date_column in standardized.columns else source
+        dates = parse_dates(table[fx_date_column]).to_numpy(dtype="datetime64[D]")
+        currency = normalized_currency(standardized["currency"]).to_numpy()
+        factors, unknown, _ = historical_conversion_factors(
+            dates, currency, reporting_currency, engine, load_fx_history()
+        )
+        converted, unconverted = apply_conversion(standardized, factors, reporting_currency)
+        return converted, unknown, unconverted
+
+    @staticmethod
+    def read_source_headers(path: str, encoding: str = "utf-8") -> List[str]:
+        """Read only the header row of a source CSV file."""
+        return pd.read_csv(path, nrows=0, encoding=encoding).columns.tolist()
+
+    @staticmethod
+    def iter_standardized_csv(
+        path: str,
+        mappings: Dict[str, str],
+        chunk_rows: int = PIPELINE_CHUNK_ROWS,
+        encoding: str = "utf-8",
+        reporting_currency: Optional[str] = None,
+        fx_date_column: Optional[str] = None,
+    ) -> Iterator[str]:
+        """
+        Stream a standardized CSV export of a file, one row chunk at a time.
+
+        Args:
+            path: Source CSV file
+            mappings: Field mappings from source to standard fields
+            chunk_rows: Rows held in memory at once
+            encoding: Source file encoding
+            reporting_currency: Convert salary/bonus to this currency; rows in
+                unknown currencies keep their original amount and currency code
+            fx_date_column: Standard field or source column selecting as-of
+                historical rates for the conversion
+
+        Yields:
+            CSV text: the STANDARD_FIELDS header row, then one piece per chunk
+        """
+        yield ",".join(STANDARD_FIELDS) + "\n"
+
+        reader = pd.read_csv(
+            path,
+            chunksize=max(1, chunk_rows),
+            dtype=str,
+            keep_default_na=False,
+            encoding=encoding,
+        )
+
+        plan = None
+        with reader:
+            for chunk in reader:
+                if plan is None:
+                    plan = build_mapping_plan(chunk.columns.tolist(), mappings)
+                standardized = normalize_standardized_values(
+                    construct_standardized_frame(chunk, plan)
+                )
+                if reporting_currency:
+                    standardized, _, _ = ExportService.convert_currency(
+                        standardized, chunk, reporting_currency, fx_date_column
+                    )
+                buffer = io.StringIO()
+                standardized.to_csv(buffer, index=False, header=False)
+                yield buffer.getvalue()
+
+    @staticmethod
+    def write_standardized_csv(
+        path: str,
+        mappings: Dict[str, str],
+        output: TextIO,
+        chunk_rows: int = PIPELINE_CHUNK_ROWS,
+        encoding: str = "utf-8",
+        reporting_currency: Optional[str] = None,
+        fx_date_column: Optional[str] = None,
+    ) -> int:
+        """
+        Write a standardized CSV export of a file to ``output`` incrementally.
+
+        Returns:
+            Number of characters written
+        """
+        written = 0
+        for piece in ExportService.iter_standardized_csv(
+            path, mappings, chunk_rows, encoding, reporting_currency, fx_date_column
+        ):
+            output.write(piece)
+            written += len(piece)
+        return written
+
+    async def stream_standardized_csv(
+        self,
+        path: str,
+        mappings: Dict[str, str],
+        encoding: str = "utf-8",
+        chunk_rows: int = PIPELINE_CHUNK_ROWS,
+        reporting_currency: Optional[str] = None,
+        fx_date_column: Optional[str] = None,
+    ) -> AsyncIterator[bytes]:
+        """Stream iter_standardized_csv() as UTF-8, advancing it on the thread pool."""
+        iterator = ExportService.iter_standardized_csv(
+            path, mappings, chunk_rows, encoding, reporting_currency, fx_date_column
+        )
+        try:
+            while True:
+                piece = await run_io_bound(next, iterator, None)
+                if piece is None:
+                    break
+                yield piece.encode("utf-8")
+        finally:
+            iterator.close()
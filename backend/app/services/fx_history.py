@@ -0,0 +1,129 @@
+"""
+As-of historical exchange rates for back-dated payroll conversions.
+
+The store is a (dates x currencies) matrix of units per USD loaded from a
+wide CSV (one row per effective date, one column per currency). A rate is
+effective from its date until the next one. Converting a column of rows
+dated d_i takes one ``np.searchsorted`` of all row dates against the sorted
+effective dates, integer currency codes (as in CurrencyEngine) and a 2-D
+gather, so millions of historical conversions cost a few array passes.
+"""
+
+from functools import lru_cache
+from typing import Iterable, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..core.config import FX_HISTORY_PATH
+from .currency_engine import CurrencyEngine, encode_currencies
+
+
+class FXHistory:
+    """Time series of exchange rates with as-of lookups."""
+
+    def __init__(
+        self,
+        dates: Sequence,
+        codes: Sequence[str],
+        rates: np.ndarray,
+        default_currency: str = "USD",
+    ):
+        """
+        Args:
+            dates: Effective date of each rate row
+            codes: Currency code of each rate column
+            rates: (dates x currencies) units per USD
+            default_currency: Currency assumed for rows without one
+        """
+        dates = np.asarray(dates, dtype="datetime64[D]")
+        order = np.argsort(dates, kind="stable")
+        self.dates = dates[order]
+        self.codes: List[str] = [str(code) for code in codes]
+        self.index = {code: position for position, code in enumerate(self.codes)}
+        self.default_currency = default_currency
+        # Trailing NaN row/column: what out-of-range dates and unknown currencies (-1) gather
+        self.rates = np.pad(
+            np.asarray(rates, dtype=np.float64)[order], ((0, 1), (0, 1)), constant_values=np.nan
+        )
+
+    @classmethod
+    def from_csv(cls, path: str) -> "FXHistory":
+        """Load a wide CSV with a ``date`` column and one column per currency."""
+        frame = pd.read_csv(path, comment="#")
+        dates = pd.to_datetime(frame.pop("date")).to_numpy(dtype="datetime64[D]")
+        return cls(dates, list(frame.columns), frame.to_numpy(dtype=np.float64))
+
+    def __contains__(self, code: object) -> bool:
+        return code in self.index
+
+    def row_positions(self, dates: np.ndarray) -> np.ndarray:
+        """Rate row effective at each date; -1 for missing dates or dates before the series."""
+        dates = np.asarray(dates, dtype="datetime64[D]")
+        positions = np.searchsorted(self.dates, dates, side="right") - 1
+        positions[np.isnat(dates)] = -1
+        return positions
+
+    def as_of(self, date) -> CurrencyEngine:
+        """CurrencyEngine with the rates effective at ``date``."""
+        position = int(self.row_positions(np.array([date], dtype="datetime64[D]"))[0])
+        if position < 0:
+            raise ValueError(f"No exchange rates effective at {date}")
+        return CurrencyEngine(
+            dict(zip(self.codes, self.rates[position, :-1])), self.default_currency
+        )
+
+    def conversion_factors(
+        self, dates: np.ndarray, currency: Iterable, target: str
+    ) -> Tuple[np.ndarray, List[str]]:
+        """
+        Per-row factor converting each row's currency into ``target`` at the row's date.
+
+        Returns:
+            Tuple of (factor per row, NaN where the date or currency has no
+            rate; sorted list of unknown currency strings)
+        """
+        codes, unknown = encode_currencies(currency, self.index, self.default_currency)
+        rows = self.row_positions(dates)
+        factors = self.rates[rows, self.index[target]] / self.rates[rows, codes]
+        return factors, unknown
+
+
+def historical_conversion_factors(
+    dates: np.ndarray,
+    currency: np.ndarray,
+    target: str,
+    engine: CurrencyEngine,
+    history: FXHistory,
+) -> Tuple[np.ndarray, List[str], int]:
+    """
+    As-of conversion factors, falling back to spot rates for undated rows.
+
+    Rows whose date is missing or precedes the history use the engine's spot
+    rate; rows with no rate in either are NaN.
+
+    Returns:
+        Tuple of (factor per row, sorted unknown currencies, rows converted
+        at historical rates)
+    """
+    if target in engine:
+        codes, _ = engine.encode(currency)
+        factors = engine.factors(codes, target)
+    else:
+        factors = np.full(len(currency), np.nan)
+    if target in history:
+        historical, _ = history.conversion_factors(dates, currency, target)
+        dated = ~np.isnan(historical)
+        factors = np.where(dated, historical, factors)
+    else:
+        dated = np.zeros(len(currency), dtype=bool)
+
+    missing = np.asarray(currency, dtype=object)[np.isnan(factors)]
+    unknown = sorted({str(code) for code in pd.unique(missing) if code})
+    return factors, unknown, int(dated.sum())
+
+
+@lru_cache(maxsize=4)
+def load_fx_history(path: str = FX_HISTORY_PATH) -> FXHistory:
+    """Load (once per path) the FX history file."""
+    return FXHistory.from_csv(path)
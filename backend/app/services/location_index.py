@@ -0,0 +1,176 @@
+"""
+Gazetteer index resolving free-text locations to country codes.
+
+Location columns hold cities ("Mumbai"), "city, country" pairs, country
+names in several languages and codes. The index is built from a JSON
+gazetteer (GAZETTEER_PATH) of countries with their names, aliases and
+major cities. Lookup keys are normalized (accents folded, punctuation
+dropped, upper case), so "München", "munchen" and "MUNCHEN " are one key.
+
+A value is matched, in order:
+
+1. as a whole against every key (codes, names, aliases, cities);
+2. part by part (split on commas, semicolons, slashes): country names and
+   aliases first, then cities, then a code in the last part - so
+   "San Francisco, CA" is a US city, not Canada;
+3. by closest spelling (``difflib``) against cities only - country names
+   are too alike ("Austria"/"Australia", "Iceland"/"Ireland") to guess,
+   and a country missing from the gazetteer must stay unresolved.
+
+Columns are resolved with ``pd.factorize``: each distinct value is matched
+once and the codes are gathered back to the rows, so the per-row cost is
+array work only. Results of earlier lookups are memoized per index.
+"""
+
+import difflib
+import json
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..core.config import GAZETTEER_PATH, LOCATION_FUZZY_CUTOFF
+
+UNRESOLVED = ""
+
+_PART_SEPARATORS = re.compile(r"[,;/|]")
+_NON_ALPHANUMERIC = re.compile(r"[^0-9A-Z]+")
+
+# Memoized values per index; beyond this the memo starts over
+_MEMO_MAX_ENTRIES = 100_000
+
+
+def normalize_location(value: object) -> str:
+    """Fold accents and case, replace punctuation with single spaces."""
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return ""
+    text = unicodedata.normalize("NFKD", str(value))
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return _NON_ALPHANUMERIC.sub(" ", text.upper()).strip()
+
+
+class LocationIndex:
+    """Normalized country, alias and city keys -> country code."""
+
+    def __init__(
+        self,
+        names: Mapping[str, str],
+        aliases: Optional[Mapping[str, str]] = None,
+        cities: Optional[Mapping[str, str]] = None,
+        currencies: Optional[Mapping[str, str]] = None,
+        fuzzy_cutoff: float = LOCATION_FUZZY_CUTOFF,
+        version: str = "custom",
+    ):
+        """
+        Args:
+            names: Country code -> country name
+            aliases: Alternative country name or code -> country code
+            cities: City name -> country code
+            currencies: Country code -> local currency code
+            fuzzy_cutoff: Minimum similarity (0-1) of a spelling match; 1 disables it
+            version: Gazetteer version
+        """
+        self.names = dict(names)
+        self.currencies = dict(currencies or {})
+        self.version = version
+        self.fuzzy_cutoff = fuzzy_cutoff
+        self._codes = {normalize_location(code): code for code in self.names}
+        self._countries = {normalize_location(name): code for code, name in self.names.items()}
+        for alias, code in (aliases or {}).items():
+            self._countries.setdefault(normalize_location(alias), code)
+        self._cities = {}
+        for city, code in (cities or {}).items():
+            self._cities.setdefault(normalize_location(city), code)
+        # Whole values: country keys win over cities, cities over bare codes
+        self._keys = {**self._codes, **self._cities, **self._countries}
+        self._spellings = [key for key in self._cities if len(key) >= 4]
+        self._memo: Dict[str, str] = {}
+
+    @classmethod
+    def from_file(cls, path: str, fuzzy_cutoff: float = LOCATION_FUZZY_CUTOFF) -> "LocationIndex":
+        with open(path, "r", encoding="utf-8") as handle:
+            data = json.load(handle)
+        countries = data["countries"]
+        return cls(
+            names={code: entry["name"] for code, entry in countries.items()},
+            aliases={alias: code for code, entry in countries.items() for alias in entry.get("aliases", [])},
+            cities={city: code for code, entry in countries.items() for city in entry.get("cities", [])},
+            currencies={code: entry["currency"] for code, entry in countries.items() if entry.get("currency")},
+            fuzzy_cutoff=fuzzy_cutoff,
+            version=str(data.get("version", "")),
+        )
+
+    def name(self, code: str) -> str:
+        """Country name of a code (the code itself when unknown)."""
+        return self.names.get(code, code)
+
+    def resolve_value(self, value: object) -> str:
+        """Country code of one location value, UNRESOLVED when nothing matches."""
+        if value is None or (isinstance(value, float) and np.isnan(value)):
+            return UNRESOLVED
+        raw = str(value).strip()
+        code = self._memo.get(raw)
+        if code is None:
+            code = self._match(raw)
+            if len(self._memo) >= _MEMO_MAX_ENTRIES:
+                self._memo.clear()
+            self._memo[raw] = code
+        return code
+
+    def _match(self, raw: str) -> str:
+        text = normalize_location(raw)
+        if not text:
+            return UNRESOLVED
+        if text in self._keys:
+            return self._keys[text]
+        parts = [part for part in map(normalize_location, _PART_SEPARATORS.split(raw)) if part]
+        for part in reversed(parts):
+            if part in self._countries:
+                return self._countries[part]
+        for part in parts:
+            if part in self._cities:
+                return self._cities[part]
+        if parts and parts[-1] in self._codes:
+            return self._codes[parts[-1]]
+        if self.fuzzy_cutoff < 1:
+            for part in [text] + parts[::-1]:
+                matches = difflib.get_close_matches(part, self._spellings, n=1, cutoff=self.fuzzy_cutoff)
+                if matches:
+                    return self._keys[matches[0]]
+        return UNRESOLVED
+
+    def resolve(
+        self, values: Iterable, countries: Optional[Iterable[str]] = None
+    ) -> Tuple[np.ndarray, List[str]]:
+        """
+        Resolve a whole location column.
+
+        Args:
+            values: Location strings (None/NaN for missing)
+            countries: Accepted country codes; values resolving to any other
+                country are treated as unresolved
+
+        Returns:
+            Tuple of (country code per row, UNRESOLVED where no match; sorted
+            list of non-empty unresolved values)
+        """
+        inverse, uniques = pd.factorize(np.asarray(values, dtype=object))
+        resolved = [self.resolve_value(value) for value in uniques]
+        if countries is not None:
+            accepted = set(countries)
+            resolved = [code if code in accepted else UNRESOLVED for code in resolved]
+        # factorize marks missing values with -1, which gathers the trailing entry
+        lookup = np.array(resolved + [UNRESOLVED], dtype=object)
+        unresolved = sorted(
+            str(value) for value, code in zip(uniques, resolved) if code == UNRESOLVED and str(value).strip()
+        )
+        return lookup[inverse], unresolved
+
+
+@lru_cache(maxsize=4)
+def load_location_index(path: str = GAZETTEER_PATH) -> LocationIndex:
+    """Load (once) the gazetteer index."""
+    return LocationIndex.from_file(path)
@@ -0,0 +1,203 @@
+"""
+Persistent field mapping store for SmartPayMap.
+
+Finalized mappings are kept in a local SQLite database (MAPPING_STORE_PATH)
+so they survive restarts and are shared by every uvicorn worker on the
+host. The database runs in WAL mode: readers never block the writer and
+each worker process holds its own connections (one per thread).
+
+Each mapping is stored with the signature of the schema it was made for:
+the SHA-256 of the source headers, trimmed, case-folded and sorted, so
+the same export with reordered columns finds the same mapping. Composite
+indexes on (header_signature, id) and (source_system, header_signature,
+id) make "latest mapping for this schema" (from any or one source system)
+a single B-tree descent, and bulk inserts run
+in one transaction. Writes take the database write lock up front
+(BEGIN IMMEDIATE) and wait up to MAPPING_STORE_BUSY_TIMEOUT_MS for other
+processes, so concurrent /finalize calls never fail on a locked database.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence
+
+from ..core.config import MAPPING_STORE_BUSY_TIMEOUT_MS, MAPPING_STORE_PATH
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS mappings (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        header_signature TEXT NOT NULL,
+        source_system TEXT NOT NULL DEFAULT '',
+        headers TEXT NOT NULL,
+        mappings TEXT NOT NULL,
+        created_at TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_mappings_signature
+        ON mappings (header_signature, id)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_mappings_source_signature
+        ON mappings (source_system, header_signature, id)
+    """,
+)
+
+
+def header_signature(headers: Iterable[str]) -> str:
+    """SHA-256 of a schema's headers, independent of column order and case."""
+    normalized = sorted({str(header).strip().casefold() for header in headers})
+    return hashlib.sha256("\x1f".join(normalized).encode("utf-8")).hexdigest()
+
+
+class MappingStore:
+    """SQLite-backed store of finalized field mappings."""
+
+    def __init__(self, path: str = MAPPING_STORE_PATH, busy_timeout_ms: int = MAPPING_STORE_BUSY_TIMEOUT_MS):
+        self.path = path
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Transactions are managed explicitly (BEGIN IMMEDIATE for writes)
+            connection = sqlite3.connect(self.path, timeout=self.busy_timeout_ms / 1000, isolation_level=None)
+            connection.row_factory = sqlite3.Row
+            connection.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA synchronous = NORMAL")
+            self._local.connection = connection
+        if not self._schema_ready:
+            with self._schema_lock:
+                if not self._schema_ready:
+                    with self._write(connection):
+                        for statement in _SCHEMA:
+                            connection.execute(statement)
+                    self._schema_ready = True
+        return connection
+
+    @staticmethod
+    @contextmanager
+    def _write(connection: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+        """Write transaction holding the database write lock from the start."""
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    @staticmethod
+    def _row(mappings: Mapping[str, str], headers: Optional[Sequence[str]], source_system: str, created_at: str) -> tuple:
+        headers = list(headers) if headers else list(mappings)
+        return (
+            header_signature(headers),
+            source_system or "",
+            json.dumps(headers),
+            json.dumps(dict(mappings), sort_keys=True),
+            created_at,
+        )
+
+    def save(
+        self,
+        mappings: Mapping[str, str],
+        headers: Optional[Sequence[str]] = None,
+        source_system: str = "",
+    ) -> int:
+        """
+        Store a mapping and return its id.
+
+        Args:
+            mappings: Source field -> standard field
+            headers: Source headers the mapping was made for (the mapped
+                source fields when omitted)
+            source_system: Origin of the file (e.g. "workday", "sap")
+        """
+        connection = self._connection()
+        with self._write(connection):
+            cursor = connection.execute(
+                "INSERT INTO mappings (header_signature, source_system, headers, mappings, created_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                self._row(mappings, headers, source_system, datetime.utcnow().isoformat()),
+            )
+        return int(cursor.lastrowid)
+
+    def save_many(self, records: Iterable[Mapping[str, Any]]) -> int:
+        """
+        Store many mappings in one transaction.
+
+        Args:
+            records: Dictionaries with ``mappings`` and optional ``headers`` and ``source_system``
+
+        Returns:
+            Number of mappings stored
+        """
+        created_at = datetime.utcnow().isoformat()
+        rows = [
+            self._row(record["mappings"], record.get("headers"), record.get("source_system", ""), created_at)
+            for record in records
+        ]
+        connection = self._connection()
+        with self._write(connection):
+            connection.executemany(
+                "INSERT INTO mappings (header_signature, source_system, headers, mappings, created_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    def latest(self, headers: Sequence[str], source_system: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Most recently stored mapping for a schema (optionally from one source system).
+
+        Returns:
+            Stored mapping record, or None if the schema has none
+        """
+        query = "SELECT * FROM mappings WHERE header_signature = ?"
+        parameters: List[Any] = [header_signature(headers)]
+        if source_system is not None:
+            query += " AND source_system = ?"
+            parameters.append(source_system)
+        row = self._connection().execute(query + " ORDER BY id DESC LIMIT 1", parameters).fetchone()
+        return self._record(row) if row else None
+
+    def records(self, limit: Optional[int] = None, source_system: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Stored mappings, oldest first (the newest ``limit`` when given)."""
+        query = "SELECT * FROM mappings"
+        parameters: List[Any] = []
+        if source_system is not None:
+            query += " WHERE source_system = ?"
+            parameters.append(source_system)
+        query += " ORDER BY id DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            parameters.append(limit)
+        rows = self._connection().execute(query, parameters).fetchall()
+        return [self._record(row) for row in reversed(rows)]
+
+    def count(self) -> int:
+        return int(self._connection().execute("SELECT COUNT(*) FROM mappings").fetchone()[0])
+
+    @staticmethod
+    def _record(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            "mapping_id": row["id"],
+            "header_signature": row["header_signature"],
+            "source_system": row["source_system"],
+            "headers": json.loads(row["headers"]),
+            "mappings": json.loads(row["mappings"]),
+            "created_at": row["created_at"],
+        }
@@ -2,7 +2,7 @@ from typing import Any, Dict, List, Optional
 
 import httpx
 
-from ..core.config import STANDARD_FIELDS
+from ..core.config import MAPPING_SUGGESTION_CACHE_MAX_ENTRIES, STANDARD_FIELDS
 from ..core.exceptions import (
     ProcessingAPIError,
     ServiceUnavailableError,
@@ -12,17 +12,22 @@ from ..core.exceptions import (
 # Import from utils module
 from ..utils.llm_utils import MappingSuggestion, get_mapping_suggestions
 from ..models.payroll import PolicyChange
+from .mapping_store import MappingStore
 from .policy_service import PolicySimulationService
+from .shared_cache import create_cache
+from .simulation_cache import content_hash
 
 
 class PayrollService:
     """Service for handling payroll data analysis and mapping."""
 
     def __init__(self):
-        # In-memory storage for mappings (mock database)
-        self.stored_mappings: List[Dict[str, str]] = []
+        # Finalized mappings, persisted and shared by all worker processes
+        self.mapping_store = MappingStore()
         # Policy simulation service
         self.policy_service = PolicySimulationService()
+        # Suggestions depend only on the headers; shared by all workers in multi-worker mode
+        self.suggestion_cache = create_cache("mapping_suggestions", MAPPING_SUGGESTION_CACHE_MAX_ENTRIES)
 
     async def analyze_payroll_data(
         self, headers: List[str], rows: Optional[List[List[str]]] = None
@@ -45,6 +50,11 @@ class PayrollService:
         if not headers:
             raise ValidationAPIError("No headers provided")
 
+        key = ("suggestions", content_hash([headers, STANDARD_FIELDS]))
+        cached = self.suggestion_cache.get(key)
+        if cached is not None:
+            return cached
+
         try:
             # Get mapping suggestions from LLM
             result = get_mapping_suggestions(headers, STANDARD_FIELDS)
@@ -52,6 +62,7 @@ class PayrollService:
             if not result["mappings"]:
                 raise ProcessingAPIError("Failed to generate mapping suggestions")
 
+            self.suggestion_cache.put(key, result)
             return result
 
         except httpx.TimeoutException:
@@ -61,15 +72,22 @@ class PayrollService:
         except Exception as e:
             raise ProcessingAPIError(f"Analysis service error: {str(e)}")
 
-    def finalize_mappings(self, mappings: Dict[str, str]) -> Dict[str, Any]:
+    def finalize_mappings(
+        self,
+        mappings: Dict[str, str],
+        headers: Optional[List[str]] = None,
+        source_system: str = ""
+    ) -> Dict[str, Any]:
         """
         Finalize and store the field mappings.
 
         Args:
             mappings: Dictionary of field mappings
+            headers: Source headers the mapping was made for (optional)
+            source_system: Origin of the source file (optional)
 
         Returns:
-            Dictionary with status and success flag
+            Dictionary with status, success flag and the stored mapping id
 
         Raises:
             ValidationAPIError: If mappings are invalid
@@ -86,23 +104,30 @@ class PayrollService:
                     f"Invalid standard fields: {', '.join(invalid_fields)}"
                 )
 
-            # Store the mapping (mock database operation)
-            self.stored_mappings.append(mappings)
+            mapping_id = self.mapping_store.save(mappings, headers, source_system)
 
-            return {"status": "success", "mapping_saved": True}
+            return {"status": "success", "mapping_saved": True, "mapping_id": mapping_id}
 
         except Exception as e:
             raise ProcessingAPIError(f"Failed to process mapping: {str(e)}")
 
     def get_stored_mappings(self) -> List[Dict[str, str]]:
         """Get all stored mappings."""
-        return self.stored_mappings.copy()
+        return [record["mappings"] for record in self.mapping_store.records()]
+
+    def latest_mapping(
+        self, headers: List[str], source_system: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Most recently finalized mapping for a schema, or None."""
+        return self.mapping_store.latest(headers, source_system)
     
     async def simulate_policy_impact(
         self, 
         headers: List[str], 
         rows: List[List[str]], 
-        policy_change: PolicyChange
+        policy_change: PolicyChange,
+        mappings: Optional[Dict[str, str]] = None,
+        fx_date_column: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Simulate policy impact using the policy simulation service.
@@ -111,10 +136,102 @@ class PayrollService:
             headers: CSV column headers
             rows: CSV data rows
             policy_change: Policy change parameters
+            mappings: Field mappings (inferred from headers when omitted)
+            fx_date_column: Date column selecting as-of historical exchange rates
             
         Returns:
             Dictionary with simulation results
         """
         return await self.policy_service.simulate_policy_impact(
-            headers, rows, policy_change
+            headers, rows, policy_change, mappings, fx_date_column
+        )
+
+    async def simulate_scenarios(
+        self,
+        headers: List[str],
+        rows: List[List[str]],
+        policy_changes: List[PolicyChange],
+        all_countries: bool = False,
+        reporting_currency: str = "USD",
+        mappings: Optional[Dict[str, str]] = None,
+        fx_date_column: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Compare several policy changes using the policy simulation service.
+        
+        Args:
+            headers: CSV column headers
+            rows: CSV data rows
+            policy_changes: Policy changes to compare
+            all_countries: Also evaluate every supported country
+            reporting_currency: Currency for all reported figures
+            mappings: Field mappings (inferred from headers when omitted)
+            fx_date_column: Date column selecting as-of historical exchange rates
+            
+        Returns:
+            Dictionary with scenarios ranked by projected cost
+        """
+        return await self.policy_service.simulate_scenarios(
+            headers, rows, policy_changes, all_countries, reporting_currency, mappings, fx_date_column
         )
+
+    async def simulate_risk(
+        self,
+        headers: List[str],
+        rows: List[List[str]],
+        policy_changes: List[PolicyChange],
+        **options: Any
+    ) -> Dict[str, Any]:
+        """
+        Run a Monte Carlo sensitivity analysis using the policy simulation service.
+        
+        Args:
+            headers: CSV column headers
+            rows: CSV data rows
+            policy_changes: Policy changes to simulate
+            **options: Simulation options (paths, volatilities, seed, ...)
+            
+        Returns:
+            Dictionary with cost percentiles and value-at-risk
+        """
+        return await self.policy_service.simulate_risk(headers, rows, policy_changes, **options)
+
+    async def simulate_projection(
+        self,
+        headers: List[str],
+        rows: List[List[str]],
+        policy_change: PolicyChange,
+        **options: Any
+    ) -> Dict[str, Any]:
+        """
+        Project monthly costs of a policy change using the policy simulation service.
+        
+        Args:
+            headers: CSV column headers
+            rows: CSV data rows
+            policy_change: Policy change to project
+            **options: Projection options (horizon, raise phases, bonus timing, FX drift, ...)
+            
+        Returns:
+            Dictionary with monthly and cumulative cost totals
+        """
+        return await self.policy_service.simulate_projection(headers, rows, policy_change, **options)
+
+    async def simulate_shadow_payroll(
+        self,
+        headers: List[str],
+        rows: List[List[str]],
+        **options: Any
+    ) -> Dict[str, Any]:
+        """
+        Compute a shadow payroll for mobile employees using the policy simulation service.
+        
+        Args:
+            headers: CSV column headers
+            rows: CSV data rows
+            **options: Home country, home country column, reporting currency, mappings
+            
+        Returns:
+            Dictionary with host-country liabilities per country pair
+        """
+        return await self.policy_service.simulate_shadow_payroll(headers, rows, **options)
@@ -5,14 +5,50 @@ This service handles policy impact analysis and cost simulation
 using AI-powered analysis for different countries and currencies.
 """
 
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 import json
-from ..models.payroll import PolicyChange, CostAnalysis
+import numpy as np
+from ..models.payroll import PolicyChange, CostAnalysis, RaisePhase
+from .cost_engine import (
+    EmployeeVectors,
+    Baseline,
+    CurrentTerms,
+    Scenario,
+    compute_policy_costs,
+    current_terms,
+    effective_flat_rates,
+    evaluate_scenarios,
+    vectors_from_rows,
+)
+from .currency_engine import EXCHANGE_RATES, CurrencyEngine
+from .fx_history import FXHistory, load_fx_history
+from .projection_engine import ProjectionAssumptions, project_costs
+from .risk_engine import simulate_cost_distribution
+from .location_index import UNRESOLVED, load_location_index
+from .shadow_payroll import compute_shadow_payroll
+from .shared_cache import create_cache
+from .simulation_cache import CacheKey, content_hash, dataset_hash
+from .tax_engine import CountrySchedule, load_tax_schedules
 from ..utils.llm_utils import get_mapping_suggestions
 from ..utils.mapping_utils import construct_standardized_dataset
-from ..core.config import STANDARD_FIELDS
+from ..core.config import (
+    STANDARD_FIELDS,
+    MONTE_CARLO_DEFAULT_PATHS,
+    MONTE_CARLO_MAX_PATHS,
+    MONTE_CARLO_FX_VOLATILITY,
+    MONTE_CARLO_RATE_VOLATILITY,
+    PROJECTION_DEFAULT_MONTHS,
+    PROJECTION_MAX_MONTHS,
+    SHARED_CACHE_LOCAL_ENTRIES,
+    SIMULATION_CACHE_MAX_ENTRIES,
+    SIMULATION_INTERMEDIATE_MAX_ENTRIES,
+)
+from ..core.exceptions import ValidationAPIError
+from ..core.executor import run_cpu_bound, run_io_bound
 
-# Country-specific data for simulation
+# Country-specific data for simulation. The flat rates are headline figures
+# for narrative notes and a fallback for countries without a tax schedule;
+# costs use the progressive schedules from the tax engine.
 COUNTRY_DATA = {
     "US": {"currency": "USD", "tax_rate": 0.22, "social_security": 0.062},
     "UK": {"currency": "GBP", "tax_rate": 0.20, "social_security": 0.12}, 
@@ -26,20 +62,24 @@ COUNTRY_DATA = {
     "NL": {"currency": "EUR", "tax_rate": 0.37, "social_security": 0.276}
 }
 
-# Currency exchange rates (mock data for simulation)
-EXCHANGE_RATES = {
-    "USD": 1.0,
-    "EUR": 0.85,
-    "GBP": 0.73,
-    "JPY": 110.0,
-    "CAD": 1.25,
-    "AUD": 1.35,
-    "SGD": 1.35,
-    "CHF": 0.92,
-    "SEK": 8.5,
-    "NOK": 8.8
-}
+# Jurisdiction the uploaded payroll is assumed to run in today
+BASELINE_COUNTRY = "US"
+
+# Fallback rates for target countries missing from COUNTRY_DATA
+DEFAULT_COUNTRY_INFO = {"currency": "USD", "tax_rate": 0.22, "social_security": 0.062}
 
+COUNTRY_NAMES = {
+    "US": "United States",
+    "UK": "United Kingdom",
+    "DE": "Germany",
+    "FR": "France",
+    "JP": "Japan",
+    "CA": "Canada",
+    "AU": "Australia",
+    "SG": "Singapore",
+    "CH": "Switzerland",
+    "NL": "Netherlands"
+}
 
 class PolicySimulationService:
     """Service for handling policy simulation and impact analysis."""
@@ -47,12 +87,30 @@ class PolicySimulationService:
     def __init__(self):
         self.country_data = COUNTRY_DATA
         self.exchange_rates = EXCHANGE_RATES
+        self.currency_engine = CurrencyEngine(EXCHANGE_RATES)
+        self.tax_schedules = load_tax_schedules()
+        self.location_index = load_location_index()
+        # Reference data every result depends on; part of every cache key
+        self.data_version = content_hash({
+            "country_data": self.country_data,
+            "exchange_rates": self.exchange_rates,
+            "tax_schedule_version": self.tax_schedules.version,
+            "gazetteer_version": self.location_index.version,
+        })
+        # Shared by all workers on the host in multi-worker mode
+        self.result_cache = create_cache("simulation_results", SIMULATION_CACHE_MAX_ENTRIES)
+        self.intermediates = create_cache(
+            "simulation_intermediates", SIMULATION_INTERMEDIATE_MAX_ENTRIES,
+            copy_values=False, local_entries=SHARED_CACHE_LOCAL_ENTRIES
+        )
     
     async def simulate_policy_impact(
         self, 
         headers: List[str], 
         rows: List[List[str]], 
-        policy_change: PolicyChange
+        policy_change: PolicyChange,
+        mappings: Optional[Dict[str, str]] = None,
+        fx_date_column: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Simulate the impact of policy changes on payroll data.
@@ -61,26 +119,118 @@ class PolicySimulationService:
             headers: CSV column headers
             rows: CSV data rows
             policy_change: Policy change parameters
+            mappings: Field mappings (inferred from headers when omitted)
+            fx_date_column: Date column selecting as-of historical exchange rates
             
         Returns:
             Dictionary with simulation results
         """
+        self._validate_fx_date_column(headers, fx_date_column)
+        policy_change = self._normalize_change(policy_change)
+        self._validate_currencies([self._build_scenario(policy_change)])
+        # Hashing a large dataset is a pass over every row, so keep it off the event loop
+        key = await run_io_bound(
+            self._cache_key, "policy_impact", headers, rows, [mappings, fx_date_column],
+            policy_change.model_dump()
+        )
+        cached = self.result_cache.get(key)
+        if cached is not None:
+            return cached
+
+        dataset_key = key[1]
+        vectors = await self._dataset_vectors(dataset_key, headers, rows, mappings, fx_date_column)
+        # With parsed vectors the rest is NumPy work on the thread pool, which
+        # also keeps the cached intermediates in this process
+        result = await run_io_bound(
+            self._run_simulation, vectors, policy_change, fx_date_column, dataset_key
+        )
+        self.result_cache.put(key, result)
+        return result
+
+    def _cache_key(
+        self,
+        operation: str,
+        headers: List[str],
+        rows: List[List[str]],
+        options: Any,
+        parameters: Any
+    ) -> CacheKey:
+        """Result cache key: operation, dataset content hash, parameter hash, data version."""
+        return (
+            operation, dataset_hash(headers, rows, options), content_hash(parameters), self.data_version
+        )
+
+    async def _dataset_key(
+        self,
+        headers: List[str],
+        rows: List[List[str]],
+        mappings: Optional[Dict[str, str]] = None,
+        fx_date_column: Optional[str] = None
+    ) -> str:
+        """Content hash of a dataset and its reading options, keying its intermediates."""
+        return await run_io_bound(dataset_hash, headers, rows, [mappings, fx_date_column])
+
+    async def _dataset_vectors(
+        self,
+        dataset_key: str,
+        headers: List[str],
+        rows: List[List[str]],
+        mappings: Optional[Dict[str, str]] = None,
+        fx_date_column: Optional[str] = None,
+        hire_dates: bool = False,
+        locations: bool = False
+    ) -> EmployeeVectors:
+        """Employee vectors of a dataset, parsed from the rows once per dataset content."""
+        key = ("vectors", dataset_key, hire_dates, locations)
+        vectors = self.intermediates.get(key)
+        if vectors is None:
+            # Parsing is pure Python; only the rows and options go to the process pool
+            vectors = await run_cpu_bound(
+                vectors_from_rows, headers, rows, mappings, fx_date_column, hire_dates, locations
+            )
+            self.intermediates.put(key, vectors)
+        return vectors
+
+    def _current_terms(
+        self,
+        vectors: EmployeeVectors,
+        currency: str,
+        fx_history: Optional[FXHistory] = None,
+        dataset_key: Optional[str] = None
+    ) -> CurrentTerms:
+        """Current-payroll terms in ``currency``, cached per dataset when it has a key."""
+        if dataset_key is None:
+            return current_terms(vectors, currency, self._baseline(), self.currency_engine, fx_history)
+        key = ("current_terms", dataset_key, currency, self.data_version)
+        terms = self.intermediates.get(key)
+        if terms is None:
+            terms = current_terms(vectors, currency, self._baseline(), self.currency_engine, fx_history)
+            self.intermediates.put(key, terms)
+        return terms
+
+    def _run_simulation(
+        self, 
+        vectors: EmployeeVectors, 
+        policy_change: PolicyChange,
+        fx_date_column: Optional[str] = None,
+        dataset_key: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Run the simulation synchronously (dispatched to the shared executor)."""
         # Get country information
-        country_info = self.country_data.get(policy_change.target_country, {})
-        if not country_info:
-            country_info = {"currency": "USD", "tax_rate": 0.22, "social_security": 0.062}
+        country_info = self.country_data.get(policy_change.target_country) or DEFAULT_COUNTRY_INFO
         
         # Determine currency to use
         target_currency = policy_change.new_currency or country_info["currency"]
         
         # Generate AI-powered analysis
         impact_summary = self._generate_impact_summary(
-            policy_change, country_info, len(rows)
+            policy_change, country_info, vectors.count
         )
         
         # Perform cost analysis
         cost_analysis = self._analyze_costs(
-            headers, rows, policy_change, country_info, target_currency
+            vectors, policy_change, country_info, target_currency,
+            load_fx_history() if fx_date_column else None, dataset_key
         )
         
         # Generate compliance notes
@@ -95,15 +245,353 @@ class PolicySimulationService:
         
         return {
             "impact_summary": impact_summary,
-            "cost_analysis": {
-                "estimated_change": cost_analysis["estimated_change"],
-                "currency_impact": cost_analysis["currency_impact"],
-                "tax_implications": cost_analysis["tax_implications"]
-            },
+            "cost_analysis": cost_analysis,
             "compliance_notes": compliance_notes,
             "recommendations": recommendations
         }
     
+    async def simulate_scenarios(
+        self,
+        headers: List[str],
+        rows: List[List[str]],
+        policy_changes: List[PolicyChange],
+        all_countries: bool = False,
+        reporting_currency: str = "USD",
+        mappings: Optional[Dict[str, str]] = None,
+        fx_date_column: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Compare many policy changes against one dataset in a single evaluation.
+        
+        Args:
+            headers: CSV column headers
+            rows: CSV data rows
+            policy_changes: Policy changes to compare
+            all_countries: Also evaluate a move to every country in COUNTRY_DATA
+            reporting_currency: Currency for all reported figures
+            mappings: Field mappings (inferred from headers when omitted)
+            fx_date_column: Date column selecting as-of historical exchange rates
+            
+        Returns:
+            Dictionary with dataset figures and scenarios ranked by projected cost
+        """
+        if reporting_currency not in self.exchange_rates:
+            raise ValidationAPIError(f"Unsupported reporting currency: {reporting_currency}")
+        self._validate_fx_date_column(headers, fx_date_column)
+        scenarios = self._resolve_scenarios(policy_changes, all_countries)
+
+        dataset_key = await self._dataset_key(headers, rows, mappings, fx_date_column)
+        vectors = await self._dataset_vectors(dataset_key, headers, rows, mappings, fx_date_column)
+        # NumPy work on parsed vectors runs on the thread pool, next to the cached intermediates
+        return await run_io_bound(
+            self._run_scenarios, vectors, scenarios, reporting_currency, fx_date_column, dataset_key
+        )
+
+    def _run_scenarios(
+        self,
+        vectors: EmployeeVectors,
+        scenarios: List[Scenario],
+        reporting_currency: str,
+        fx_date_column: Optional[str] = None,
+        dataset_key: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Evaluate and rank scenarios synchronously (dispatched to the shared executor)."""
+        fx_history = load_fx_history() if fx_date_column else None
+        result = evaluate_scenarios(
+            vectors, scenarios, self._baseline(), self.currency_engine, reporting_currency,
+            fx_history=fx_history, current=self._current_terms(vectors, "USD", fx_history, dataset_key)
+        )
+
+        ranked = sorted(result["scenarios"], key=lambda row: row["total_projected_cost"])
+        for rank, row in enumerate(ranked, start=1):
+            row["rank"] = rank
+            row["country_name"] = self._get_country_name(row["target_country"])
+        result["scenarios"] = ranked
+        result["tax_schedule_version"] = self.tax_schedules.version
+        return result
+
+    async def simulate_risk(
+        self,
+        headers: List[str],
+        rows: List[List[str]],
+        policy_changes: List[PolicyChange],
+        all_countries: bool = False,
+        paths: int = MONTE_CARLO_DEFAULT_PATHS,
+        fx_volatility: float = MONTE_CARLO_FX_VOLATILITY,
+        rate_volatility: float = MONTE_CARLO_RATE_VOLATILITY,
+        horizon_years: float = 1.0,
+        confidence: float = 0.95,
+        seed: Optional[int] = None,
+        currency_volatility: Optional[Dict[str, float]] = None,
+        mappings: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Run a Monte Carlo FX and tax-rate sensitivity analysis.
+        
+        Args:
+            headers: CSV column headers
+            rows: CSV data rows
+            policy_changes: Policy changes to simulate
+            all_countries: Also simulate a move to every country in COUNTRY_DATA
+            paths: Number of sampled paths
+            fx_volatility: Annualized FX volatility against USD
+            rate_volatility: Standard deviation of tax/social security rate shifts
+            horizon_years: Horizon the rates are sampled at
+            confidence: Confidence level for value-at-risk
+            seed: RNG seed for reproducible results
+            currency_volatility: Per-currency FX volatility overrides
+            mappings: Field mappings (inferred from headers when omitted)
+            
+        Returns:
+            Dictionary with P5/P50/P95 costs and value-at-risk per scenario
+            and per target currency
+        """
+        if not 1 <= paths <= MONTE_CARLO_MAX_PATHS:
+            raise ValidationAPIError(f"paths must be between 1 and {MONTE_CARLO_MAX_PATHS}")
+        if not 0 < confidence < 1:
+            raise ValidationAPIError("confidence must be between 0 and 1")
+        scenarios = self._resolve_scenarios(policy_changes, all_countries)
+
+        dataset_key = await self._dataset_key(headers, rows, mappings)
+        vectors = await self._dataset_vectors(dataset_key, headers, rows, mappings)
+        return await run_io_bound(
+            self._run_risk, vectors, scenarios, dataset_key,
+            n_paths=paths,
+            fx_volatility=fx_volatility,
+            rate_volatility=rate_volatility,
+            horizon_years=horizon_years,
+            confidence=confidence,
+            seed=seed,
+            currency_volatility=currency_volatility,
+        )
+
+    def _run_risk(
+        self,
+        vectors: EmployeeVectors,
+        scenarios: List[Scenario],
+        dataset_key: Optional[str] = None,
+        **options: Any
+    ) -> Dict[str, Any]:
+        """Sample cost distributions synchronously (dispatched to the shared executor)."""
+        # Sampling aggregates pay per currency, so schedules become their
+        # effective flat rates at spot FX
+        current = {
+            currency: self._current_terms(vectors, currency, dataset_key=dataset_key)
+            for currency in {scenario.currency for scenario in scenarios} | {"USD"}
+        }
+        flat_scenarios, flat_baseline = effective_flat_rates(
+            vectors, scenarios, self._baseline(), self.currency_engine, current
+        )
+        result = simulate_cost_distribution(
+            vectors, flat_scenarios, flat_baseline, self.currency_engine, **options
+        )
+        for row in result["scenarios"]:
+            row["country_name"] = self._get_country_name(row["target_country"])
+        return result
+
+    async def simulate_projection(
+        self,
+        headers: List[str],
+        rows: List[List[str]],
+        policy_change: PolicyChange,
+        horizon_months: int = PROJECTION_DEFAULT_MONTHS,
+        start_month: Optional[str] = None,
+        raise_phases: Optional[List[RaisePhase]] = None,
+        annual_raise: float = 0.0,
+        bonus_months: Optional[List[int]] = None,
+        fx_drift: Optional[Dict[str, float]] = None,
+        mappings: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Project current and post-change employer costs month by month.
+        
+        Args:
+            headers: CSV column headers
+            rows: CSV data rows
+            policy_change: Policy change to project
+            horizon_months: Number of projected months
+            start_month: First projected month (YYYY-MM, defaults to the current month)
+            raise_phases: Phasing of the move to the adjusted salary (immediate when empty)
+            annual_raise: Merit raise applied at each hire anniversary
+            bonus_months: Calendar months the annual bonus is paid in (December by default)
+            fx_drift: Annual change of each currency's units per USD
+            mappings: Field mappings (inferred from headers when omitted)
+            
+        Returns:
+            Dictionary with monthly and cumulative totals over the horizon
+        """
+        if not 1 <= horizon_months <= PROJECTION_MAX_MONTHS:
+            raise ValidationAPIError(f"horizon_months must be between 1 and {PROJECTION_MAX_MONTHS}")
+        bonus_months = [12] if bonus_months is None else bonus_months
+        if any(not 1 <= month <= 12 for month in bonus_months):
+            raise ValidationAPIError("bonus_months must be calendar months (1-12)")
+        fx_drift = fx_drift or {}
+        unknown = sorted(code for code in fx_drift if code not in self.currency_engine)
+        if unknown:
+            raise ValidationAPIError(f"Unsupported FX drift currencies: {', '.join(unknown)}")
+        if any(drift <= -1 for drift in fx_drift.values()):
+            raise ValidationAPIError("fx_drift must be greater than -1")
+
+        if start_month:
+            try:
+                first_month = np.datetime64(start_month, "M")
+            except ValueError:
+                raise ValidationAPIError(f"Invalid start_month (expected YYYY-MM): {start_month}")
+        else:
+            first_month = np.datetime64("today", "M")
+
+        scenario = self._resolve_scenarios([policy_change], all_countries=False)[0]
+        assumptions = ProjectionAssumptions(
+            start_month=first_month,
+            horizon_months=horizon_months,
+            raise_phases=[(phase.month, phase.fraction) for phase in raise_phases or []],
+            annual_raise=annual_raise,
+            bonus_months=bonus_months,
+            fx_drift=fx_drift,
+        )
+        dataset_key = await self._dataset_key(headers, rows, mappings)
+        vectors = await self._dataset_vectors(dataset_key, headers, rows, mappings, hire_dates=True)
+        return await run_io_bound(self._run_projection, vectors, scenario, assumptions)
+
+    def _run_projection(
+        self,
+        vectors: EmployeeVectors,
+        scenario: Scenario,
+        assumptions: ProjectionAssumptions
+    ) -> Dict[str, Any]:
+        """Project monthly costs synchronously (dispatched to the shared executor)."""
+        result = project_costs(vectors, scenario, self._baseline(), self.currency_engine, assumptions)
+        result["target_country"] = scenario.target_country
+        result["country_name"] = self._get_country_name(scenario.target_country)
+        result["tax_schedule_version"] = scenario.schedule.version if scenario.schedule else None
+        return result
+
+    async def simulate_shadow_payroll(
+        self,
+        headers: List[str],
+        rows: List[List[str]],
+        home_country: str = BASELINE_COUNTRY,
+        home_country_column: Optional[str] = None,
+        reporting_currency: str = "USD",
+        mappings: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Compute host-country tax and social security next to the home payroll.
+        
+        Employees whose location resolves to a country other than their home
+        payroll country are assignees.
+        
+        Args:
+            headers: CSV column headers
+            rows: CSV data rows
+            home_country: Home payroll country for rows without their own
+            home_country_column: Source column holding each row's home payroll country
+            reporting_currency: Currency of all reported figures
+            mappings: Field mappings (inferred from headers when omitted)
+            
+        Returns:
+            Dictionary with totals and liabilities per (home, host) country pair
+        """
+        if home_country not in self.country_data:
+            raise ValidationAPIError(f"Unsupported home country: {home_country}")
+        if home_country_column and home_country_column not in headers:
+            raise ValidationAPIError(f"Unknown home country column: {home_country_column}")
+        if reporting_currency not in self.currency_engine:
+            raise ValidationAPIError(f"Unsupported reporting currency: {reporting_currency}")
+
+        dataset_key = await self._dataset_key(headers, rows, mappings)
+        vectors = await self._dataset_vectors(dataset_key, headers, rows, mappings, locations=True)
+        return await run_io_bound(
+            self._run_shadow_payroll, vectors, headers, rows, home_country, home_country_column,
+            reporting_currency, dataset_key
+        )
+
+    def _run_shadow_payroll(
+        self,
+        vectors: EmployeeVectors,
+        headers: List[str],
+        rows: List[List[str]],
+        home_country: str,
+        home_country_column: Optional[str],
+        reporting_currency: str,
+        dataset_key: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Compute the shadow payroll synchronously (dispatched to the shared executor)."""
+        host, unresolved = self.location_index.resolve(vectors.location, countries=self.country_data)
+        home = np.full(vectors.count, home_country, dtype=object)
+        if home_country_column:
+            position = headers.index(home_country_column)
+            row_home, _ = self.location_index.resolve(
+                [row[position] if position < len(row) else "" for row in rows], countries=self.country_data
+            )
+            home = np.where(row_home == UNRESOLVED, home, row_home)
+
+        schedules = {
+            code: self.tax_schedules.get(code) or CountrySchedule.flat(
+                code, info["currency"], info["tax_rate"], info["social_security"]
+            )
+            for code, info in self.country_data.items()
+        }
+        result = compute_shadow_payroll(
+            vectors, host, home, schedules, self.currency_engine, reporting_currency,
+            current=self._current_terms(vectors, reporting_currency, dataset_key=dataset_key)
+        )
+        # A sample is enough to fix the location data or extend the gazetteer
+        result["unresolved_location_values"] = unresolved[:20]
+        for pair in result["country_pairs"]:
+            pair["host_country_name"] = self._get_country_name(pair["host_country"])
+        return result
+
+    def _resolve_scenarios(
+        self, policy_changes: List[PolicyChange], all_countries: bool
+    ) -> List[Scenario]:
+        """Resolve requested policy changes (plus every country if asked) into scenarios."""
+        changes = list(policy_changes)
+        if all_countries:
+            changes += [PolicyChange(target_country=code) for code in self.country_data]
+        if not changes:
+            raise ValidationAPIError("Provide at least one policy change or set all_countries")
+
+        scenarios = [self._build_scenario(self._normalize_change(change)) for change in changes]
+        self._validate_currencies(scenarios)
+        return scenarios
+
+    @staticmethod
+    def _normalize_change(policy_change: PolicyChange) -> PolicyChange:
+        """Policy change with its currency code upper-cased."""
+        currency = policy_change.new_currency.strip().upper()
+        if currency == policy_change.new_currency:
+            return policy_change
+        return policy_change.model_copy(update={"new_currency": currency})
+
+    def _validate_currencies(self, scenarios: List[Scenario]) -> None:
+        """Reject scenarios in currencies without an exchange rate."""
+        unsupported = sorted({s.currency for s in scenarios if s.currency not in self.exchange_rates})
+        if unsupported:
+            raise ValidationAPIError(f"Unsupported scenario currencies: {', '.join(unsupported)}")
+
+    @staticmethod
+    def _validate_fx_date_column(headers: List[str], fx_date_column: Optional[str]) -> None:
+        """Reject FX date columns that are neither a standard field nor a source header."""
+        if fx_date_column and fx_date_column not in STANDARD_FIELDS and fx_date_column not in headers:
+            raise ValidationAPIError(f"Unknown FX date column: {fx_date_column}")
+
+    def _build_scenario(self, policy_change: PolicyChange) -> Scenario:
+        """Resolve a policy change into scenario parameters."""
+        country_info = self.country_data.get(policy_change.target_country) or DEFAULT_COUNTRY_INFO
+        return Scenario(
+            target_country=policy_change.target_country,
+            currency=policy_change.new_currency or country_info["currency"],
+            tax_rate=country_info.get("tax_rate", 0.22),
+            social_security=country_info.get("social_security", 0.1),
+            adjusted_salary=policy_change.adjusted_salary,
+            schedule=self.tax_schedules.get(policy_change.target_country),
+        )
+
+    def _baseline(self) -> Baseline:
+        """Schedule (or flat rates) of the jurisdiction the payroll runs in today."""
+        return self.tax_schedules.get(BASELINE_COUNTRY) or self.country_data[BASELINE_COUNTRY]
+
     def _generate_impact_summary(
         self, 
         policy_change: PolicyChange, 
@@ -131,43 +619,79 @@ class PolicySimulationService:
     
     def _analyze_costs(
         self, 
-        headers: List[str], 
-        rows: List[List[str]], 
+        vectors: EmployeeVectors, 
         policy_change: PolicyChange, 
         country_info: Dict[str, Any],
-        target_currency: str
-    ) -> Dict[str, str]:
-        """Analyze cost implications of the policy change."""
-        
-        # Calculate estimated cost changes
-        base_cost_change = "15-25% increase" if country_info.get("tax_rate", 0.22) > 0.3 else "5-15% increase"
-        
+        target_currency: str,
+        fx_history: Optional[FXHistory] = None,
+        dataset_key: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Compute exact per-employee costs and summarize the policy change."""
+        scenario = self._build_scenario(policy_change)
+        costs = compute_policy_costs(
+            vectors, scenario, self._baseline(), self.currency_engine, fx_history,
+            self._current_terms(vectors, scenario.currency, fx_history, dataset_key)
+        )
+
+        # Estimated change from the exact totals
+        if costs["employee_count"]:
+            base_cost_change = (
+                f"{costs['delta_percentage']:+.1f}% "
+                f"({target_currency} {costs['total_delta']:+,.0f} across {costs['employee_count']} employees)"
+            )
+        else:
+            base_cost_change = "No employees with usable salary and currency data"
+
         # Currency impact analysis
-        source_currency = "USD"  # Assume USD as base
+        source_currencies = sorted(code for code in costs["currency_breakdown"] if code != "UNSPECIFIED")
         exchange_rate = self.exchange_rates.get(target_currency, 1.0)
         
-        if target_currency != source_currency:
-            currency_impact = f"Currency conversion from {source_currency} to {target_currency} (rate: {exchange_rate:.2f})"
-            if exchange_rate < 1:
-                currency_impact += " - favorable conversion"
-            else:
-                currency_impact += " - requires budget adjustment"
+        if source_currencies and source_currencies != [target_currency]:
+            currency_impact = (
+                f"Currency conversion from {', '.join(source_currencies)} to {target_currency} "
+                f"(rate: {exchange_rate:.2f} per USD)"
+            )
         else:
             currency_impact = "No currency conversion needed"
+        if costs["historical_fx_rows"]:
+            currency_impact += (
+                f"; {costs['historical_fx_rows']} employees converted at historical rates"
+            )
+        if costs["unknown_currencies"]:
+            currency_impact += (
+                f"; {costs['excluded_employees']} employees excluded "
+                f"(no rate for {', '.join(costs['unknown_currencies'])})"
+            )
         
         # Tax implications
-        tax_rate = country_info.get("tax_rate", 0.22)
-        social_rate = country_info.get("social_security", 0.1)
-        
-        tax_implications = f"Income tax: {tax_rate*100:.1f}%, Social contributions: {social_rate*100:.1f}%"
+        if scenario.schedule is not None:
+            projected_gross = costs["total_projected_cost"] - costs["total_employer_social_security"]
+            tax_rate = costs["total_projected_tax"] / projected_gross if projected_gross else 0.0
+            social_rate = costs["total_employer_social_security"] / projected_gross if projected_gross else 0.0
+            tax_implications = (
+                f"Income tax: progressive brackets (schedule {scenario.schedule.version}, "
+                f"effective {tax_rate*100:.1f}%), "
+                f"Social contributions: effective {social_rate*100:.1f}% after caps"
+            )
+        else:
+            tax_rate = scenario.tax_rate
+            social_rate = scenario.social_security
+            tax_implications = f"Income tax: {tax_rate*100:.1f}%, Social contributions: {social_rate*100:.1f}%"
         
         if policy_change.adjusted_salary:
             tax_implications += f", Estimated on {target_currency} {policy_change.adjusted_salary:,.0f}"
+        if costs["employee_count"]:
+            tax_implications += (
+                f"; projected income tax {target_currency} {costs['total_projected_tax']:,.0f}, "
+                f"employer social security {target_currency} {costs['total_employer_social_security']:,.0f}"
+            )
         
         return {
             "estimated_change": base_cost_change,
             "currency_impact": currency_impact,
-            "tax_implications": tax_implications
+            "tax_implications": tax_implications,
+            "tax_schedule_version": scenario.schedule.version if scenario.schedule else None,
+            **costs
         }
     
     def _generate_compliance_notes(
@@ -207,7 +731,7 @@ class PolicySimulationService:
         self, 
         policy_change: PolicyChange, 
         country_info: Dict[str, Any],
-        cost_analysis: Dict[str, str]
+        cost_analysis: Dict[str, Any]
     ) -> List[str]:
         """Generate AI-powered recommendations."""
         recommendations = []
@@ -240,16 +764,4 @@ class PolicySimulationService:
     
     def _get_country_name(self, country_code: str) -> str:
         """Convert country code to full name."""
-        country_names = {
-            "US": "United States",
-            "UK": "United Kingdom", 
-            "DE": "Germany",
-            "FR": "France",
-            "JP": "Japan",
-            "CA": "Canada",
-            "AU": "Australia",
-            "SG": "Singapore",
-            "CH": "Switzerland",
-            "NL": "Netherlands"
-        }
-        return country_names.get(country_code, country_code) 
\ No newline at end of file
+        return COUNTRY_NAMES.get(country_code, country_code) 
\ No newline at end of file
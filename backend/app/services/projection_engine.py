@@ -0,0 +1,244 @@
+"""
+Multi-period (monthly) cost projection for phased policy changes.
+
+Each employee gets one row of an (employees x months) cost matrix over the
+horizon. Everything that varies over time is a per-month vector broadcast
+against per-employee vectors:
+
+- phased raises: the fraction of the move to the adjusted salary applied in
+  each month (a step function of the raise phases)
+- merit raises: compounded at each hire anniversary (month of
+  employment_date); employees hired after the start cost nothing before
+  their hire month
+- bonus timing: the annual bonus is paid in the configured calendar months
+- FX assumptions: a constant annual drift of each currency against USD
+
+Employees are processed in blocks, so the intermediates stay a few MB and
+only the monthly totals (summed over each block) are kept; 60 months over
+100k employees projects in under a second.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .cost_engine import (
+    Baseline,
+    EmployeeVectors,
+    ExchangeRates,
+    Scenario,
+    baseline_schedule,
+    schedule_terms,
+)
+from .currency_engine import CurrencyEngine
+from .tax_engine import CountrySchedule
+
+# Employees per block; a (block x 60 months) float64 matrix is under 8 MB
+PROJECTION_BLOCK_SIZE = 16_384
+
+
+@dataclass
+class ProjectionAssumptions:
+    """Time-dependent assumptions of a projection."""
+
+    start_month: np.datetime64  # first projected month (datetime64[M])
+    horizon_months: int
+    # (month offset, cumulative fraction of the move to the adjusted salary)
+    raise_phases: Sequence[Tuple[int, float]] = ()
+    annual_raise: float = 0.0  # merit raise applied at each hire anniversary
+    bonus_months: Sequence[int] = (12,)  # calendar months the annual bonus is paid in
+    fx_drift: Mapping[str, float] = field(default_factory=dict)  # annual change in units per USD
+
+    @property
+    def months(self) -> np.ndarray:
+        return np.datetime64(self.start_month, "M") + np.arange(self.horizon_months)
+
+
+def phase_fractions(
+    horizon_months: int, raise_phases: Sequence[Tuple[int, float]], adjusted: bool
+) -> np.ndarray:
+    """
+    Fraction of the salary move applied in each month.
+
+    Without phases an adjusted salary applies in full from the first month;
+    without an adjusted salary nothing changes.
+    """
+    if not adjusted:
+        return np.zeros(horizon_months)
+    if not raise_phases:
+        return np.ones(horizon_months)
+    fractions = np.zeros(horizon_months)
+    for month, fraction in sorted(raise_phases):
+        fractions[min(month, horizon_months):] = fraction
+    return fractions
+
+
+def anniversary_terms(
+    hire_date: Optional[np.ndarray], months: np.ndarray, count: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Hire anniversaries passed since the start and employment status per month.
+
+    Returns:
+        Tuple of ((employees x months) anniversary counts,
+        (employees x months) active mask); undated employees are always
+        active and have no anniversaries
+    """
+    if hire_date is None:
+        return np.zeros((count, len(months)), dtype=np.int64), np.ones((count, len(months)), dtype=bool)
+
+    dated = ~np.isnat(hire_date)
+    hire = np.where(dated, hire_date.astype("datetime64[M]").astype(np.int64), 0)[:, None]
+    elapsed = months.astype(np.int64)[None, :] - hire
+    completed = np.maximum(elapsed, 0) // 12
+    anniversaries = np.where(dated[:, None], completed - completed[:, :1], 0)
+    active = ~dated[:, None] | (elapsed >= 0)
+    return anniversaries, active
+
+
+def _monthly_terms(
+    annual_salary: np.ndarray,
+    annual_bonus: np.ndarray,
+    bonus_share: np.ndarray,
+    active: np.ndarray,
+    currency: str,
+    schedule: CountrySchedule,
+    engine: CurrencyEngine,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Monthly gross pay, income tax and employer social security.
+
+    Tax and social security are evaluated on annualized pay (so brackets and
+    caps apply to a full year) and charged in proportion to each month's pay.
+    """
+    gross = np.where(active, annual_salary / 12 + annual_bonus * bonus_share, 0.0)
+    annualized = annual_salary + annual_bonus
+    tax, social = schedule_terms(annualized, currency, schedule, engine)
+    share = np.divide(gross, annualized, out=np.zeros_like(gross), where=annualized > 0)
+    return gross, tax * share, social * share
+
+
+def project_costs(
+    vectors: EmployeeVectors,
+    scenario: Scenario,
+    baseline: Baseline,
+    exchange_rates: ExchangeRates,
+    assumptions: ProjectionAssumptions,
+    block_size: int = PROJECTION_BLOCK_SIZE,
+) -> Dict[str, Any]:
+    """
+    Project current and post-change employer costs month by month.
+
+    Both paths share the FX, merit and bonus assumptions; only the projected
+    path moves towards the adjusted salary and the scenario's schedule. All
+    figures are in the scenario currency.
+
+    Args:
+        vectors: Employee vectors (with ``hire_date`` for anniversaries)
+        scenario: Target scenario
+        baseline: Current jurisdiction schedule or flat rates
+        exchange_rates: CurrencyEngine or spot units of each currency per USD
+        assumptions: Horizon, raise phasing, bonus timing and FX drift
+        block_size: Employees per block
+
+    Returns:
+        Dictionary with monthly and cumulative totals and horizon totals
+    """
+    engine = CurrencyEngine.of(exchange_rates)
+    target = scenario.currency
+    if target not in engine:
+        raise ValueError(f"No exchange rate for scenario currency: {target}")
+
+    months = assumptions.months
+    horizon = len(months)
+    codes, unknown = engine.encode(vectors.currency)
+    spot = engine.factors(codes, target)
+    included = ~np.isnan(spot)
+
+    # Units per USD grow by (1 + drift) per year; the trailing row is what
+    # unknown currencies (-1) gather (their spot factor is NaN anyway)
+    drift = np.array(
+        [1.0 + assumptions.fx_drift.get(code, 0.0) for code in engine.codes] + [1.0]
+    )
+    growth = drift[:, None] ** (np.arange(horizon) / 12)[None, :]
+    relative = growth[engine.index[target]][None, :] / growth
+
+    calendar_month = months.astype(np.int64) % 12 + 1
+    if len(assumptions.bonus_months):
+        paid = np.isin(calendar_month, list(assumptions.bonus_months))
+        bonus_share = paid / len(set(assumptions.bonus_months))
+    else:
+        bonus_share = np.full(horizon, 1 / 12)
+    fractions = phase_fractions(horizon, assumptions.raise_phases, scenario.adjusted_salary is not None)
+    current_schedule = baseline_schedule(baseline, target)
+    projected_schedule = scenario.resolved_schedule()
+
+    totals = {
+        name: np.zeros(horizon)
+        for name in ("headcount", "current_cost", "projected_cost", "projected_tax", "social_security")
+    }
+    for start in range(0, vectors.count, block_size):
+        block = slice(start, start + block_size)
+        keep = included[block]
+        factor = np.where(keep, spot[block], 0.0)[:, None] * relative[codes[block]]
+        anniversaries, active = anniversary_terms(
+            None if vectors.hire_date is None else vectors.hire_date[block], months, len(keep)
+        )
+        active &= keep[:, None]
+        merit = (1.0 + assumptions.annual_raise) ** anniversaries
+
+        salary = vectors.salary[block][:, None] * factor * merit
+        bonus = vectors.bonus[block][:, None] * factor
+        current_gross, _, current_social = _monthly_terms(
+            salary, bonus, bonus_share, active, target, current_schedule, engine
+        )
+        if scenario.adjusted_salary is not None:
+            salary = salary + fractions * (scenario.adjusted_salary * merit - salary)
+        projected_gross, projected_tax, projected_social = _monthly_terms(
+            salary, bonus, bonus_share, active, target, projected_schedule, engine
+        )
+
+        totals["headcount"] += active.sum(axis=0)
+        totals["current_cost"] += (current_gross + current_social).sum(axis=0)
+        totals["projected_cost"] += (projected_gross + projected_social).sum(axis=0)
+        totals["projected_tax"] += projected_tax.sum(axis=0)
+        totals["social_security"] += projected_social.sum(axis=0)
+
+    current = totals["current_cost"]
+    projected = totals["projected_cost"]
+    cumulative_current = np.cumsum(current)
+    cumulative_projected = np.cumsum(projected)
+    total_current = float(cumulative_current[-1]) if horizon else 0.0
+    total_delta = float(cumulative_projected[-1]) - total_current if horizon else 0.0
+
+    monthly = [
+        {
+            "month": str(month),
+            "headcount": int(totals["headcount"][index]),
+            "current_cost": round(float(current[index]), 2),
+            "projected_cost": round(float(projected[index]), 2),
+            "delta": round(float(projected[index] - current[index]), 2),
+            "projected_tax": round(float(totals["projected_tax"][index]), 2),
+            "employer_social_security": round(float(totals["social_security"][index]), 2),
+            "cumulative_current_cost": round(float(cumulative_current[index]), 2),
+            "cumulative_projected_cost": round(float(cumulative_projected[index]), 2),
+            "cumulative_delta": round(float(cumulative_projected[index] - cumulative_current[index]), 2),
+        }
+        for index, month in enumerate(months)
+    ]
+
+    return {
+        "reporting_currency": target,
+        "start_month": str(months[0]) if horizon else str(np.datetime64(assumptions.start_month, "M")),
+        "horizon_months": horizon,
+        "employee_count": int(included.sum()),
+        "excluded_employees": int((~included).sum()),
+        "unknown_currencies": unknown,
+        "missing_salary": vectors.missing_salary,
+        "total_current_cost": round(total_current, 2),
+        "total_projected_cost": round(total_current + total_delta, 2),
+        "total_delta": round(total_delta, 2),
+        "delta_percentage": round(total_delta / total_current * 100, 2) if total_current else 0.0,
+        "months": monthly,
+    }
@@ -0,0 +1,226 @@
+"""
+Monte Carlo FX and tax-rate sensitivity analysis for policy simulation.
+
+Every cost term is linear in each employee's pay, so employees are first
+collapsed into per-source-currency totals (CurrencyEngine integer codes and
+one ``np.bincount`` pass). Each sampled path then only needs a
+(paths x currencies) exchange-rate matrix, which keeps 10k paths over 100k
+employees well inside interactive latency: the employee count only affects
+the initial aggregation.
+
+Exchange rates (units per USD) follow a mean-preserving log-normal model
+``rate * exp(sigma * sqrt(T) * Z - sigma^2 * T / 2)`` with USD as the fixed
+numeraire. Target tax and employer social security rates receive an
+absolute normal shift per path, clipped to valid ranges.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from .cost_engine import EmployeeVectors, ExchangeRates, Scenario
+from .currency_engine import CurrencyEngine
+
+PERCENTILES = (5, 50, 95)
+
+
+@dataclass
+class CurrencyTotals:
+    """Employee pay aggregated per source currency (native amounts)."""
+
+    codes: List[str]
+    salary: np.ndarray
+    bonus: np.ndarray
+    headcount: np.ndarray
+    unknown: List[str]
+    excluded: int
+
+
+def aggregate_by_currency(
+    vectors: EmployeeVectors,
+    exchange_rates: ExchangeRates,
+    default_currency: str = "USD",
+) -> CurrencyTotals:
+    """
+    Collapse employee vectors into salary, bonus and headcount per currency.
+
+    Rows without a currency count as ``default_currency``; rows in currencies
+    without an exchange rate are excluded and reported.
+    """
+    engine = CurrencyEngine.of(exchange_rates)
+    codes, unknown = engine.encode(vectors.currency, default_currency)
+    # Shift by one so UNKNOWN_CURRENCY lands in bin 0
+    bins = codes + 1
+    size = len(engine.codes) + 1
+    salary = np.bincount(bins, weights=vectors.salary, minlength=size)[1:]
+    bonus = np.bincount(bins, weights=vectors.bonus, minlength=size)[1:]
+    headcount = np.bincount(bins, minlength=size)
+
+    present = headcount[1:] > 0
+    return CurrencyTotals(
+        codes=[code for code, used in zip(engine.codes, present) if used],
+        salary=salary[present],
+        bonus=bonus[present],
+        headcount=headcount[1:][present],
+        unknown=unknown,
+        excluded=int(headcount[0]),
+    )
+
+
+def sample_exchange_rates(
+    codes: Sequence[str],
+    exchange_rates: ExchangeRates,
+    n_paths: int,
+    volatility: float,
+    horizon_years: float,
+    rng: np.random.Generator,
+    currency_volatility: Optional[Mapping[str, float]] = None,
+) -> np.ndarray:
+    """
+    Sample log-normal exchange-rate paths.
+
+    Args:
+        codes: Currencies to sample (columns of the result)
+        exchange_rates: CurrencyEngine or spot units of each currency per USD
+        n_paths: Number of paths (rows of the result)
+        volatility: Annualized volatility against USD
+        horizon_years: Horizon the rates are sampled at
+        rng: Random generator
+        currency_volatility: Per-currency volatility overrides
+
+    Returns:
+        (n_paths, len(codes)) matrix of sampled units per USD
+    """
+    engine = CurrencyEngine.of(exchange_rates)
+    overrides = currency_volatility or {}
+    spot = np.array([engine.rate("USD", code) for code in codes], dtype=np.float64)
+    sigma = np.array(
+        [0.0 if code == "USD" else overrides.get(code, volatility) for code in codes],
+        dtype=np.float64,
+    ) * np.sqrt(horizon_years)
+
+    shocks = rng.standard_normal((n_paths, len(codes)))
+    return spot * np.exp(sigma * shocks - 0.5 * sigma ** 2)
+
+
+def _summarize(values: np.ndarray) -> Dict[str, float]:
+    """Mean and P5/P50/P95 of a sampled distribution."""
+    summary = {"mean": round(float(values.mean()), 2)}
+    for percentile, value in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+        summary[f"p{percentile}"] = round(float(value), 2)
+    return summary
+
+
+def _value_at_risk(values: np.ndarray, confidence: float) -> float:
+    """Cost increase over the mean not exceeded with the given confidence."""
+    return round(float(np.quantile(values, confidence) - values.mean()), 2)
+
+
+def simulate_cost_distribution(
+    vectors: EmployeeVectors,
+    scenarios: Sequence[Scenario],
+    baseline: Mapping[str, float],
+    exchange_rates: ExchangeRates,
+    n_paths: int,
+    fx_volatility: float,
+    rate_volatility: float,
+    horizon_years: float = 1.0,
+    confidence: float = 0.95,
+    seed: Optional[int] = None,
+    currency_volatility: Optional[Mapping[str, float]] = None,
+) -> Dict[str, Any]:
+    """
+    Sample cost distributions for scenarios under FX and rate uncertainty.
+
+    All scenarios share the same FX paths (common random numbers), so
+    differences between them are not sampling noise. Figures for a scenario
+    are in that scenario's currency.
+
+    Args:
+        vectors: Employee vectors
+        scenarios: Scenarios to simulate
+        baseline: Current jurisdiction rates ("tax_rate", "social_security")
+        exchange_rates: CurrencyEngine or spot units of each currency per USD
+        n_paths: Number of sampled paths
+        fx_volatility: Annualized FX volatility against USD
+        rate_volatility: Standard deviation of tax/social security rate shifts
+        horizon_years: Horizon the rates are sampled at
+        confidence: Confidence level for value-at-risk
+        seed: RNG seed for reproducible results
+        currency_volatility: Per-currency FX volatility overrides
+
+    Returns:
+        Dictionary with per-scenario distributions and per-target-currency
+        exposure of the current payroll
+    """
+    targets = list(dict.fromkeys(scenario.currency for scenario in scenarios))
+    engine = CurrencyEngine.of(exchange_rates)
+    missing = [code for code in targets if code not in engine]
+    if missing:
+        raise ValueError(f"No exchange rate for scenario currencies: {', '.join(missing)}")
+
+    totals = aggregate_by_currency(vectors, engine)
+    universe = list(dict.fromkeys(totals.codes + targets))
+    column = {code: index for index, code in enumerate(universe)}
+    source = np.array([column[code] for code in totals.codes], dtype=np.intp)
+
+    rng = np.random.default_rng(seed)
+    rates = sample_exchange_rates(
+        universe, engine, n_paths, fx_volatility, horizon_years, rng, currency_volatility
+    )
+    # Native amounts per USD-equivalent on each path: (paths x source currencies)
+    inverse_source = 1.0 / rates[:, source]
+    salary_usd = inverse_source @ totals.salary
+    bonus_usd = inverse_source @ totals.bonus
+    headcount = int(totals.headcount.sum())
+
+    exposure = {}
+    current_cost = {}
+    for code in targets:
+        target_rate = rates[:, column[code]]
+        current_cost[code] = (salary_usd + bonus_usd) * target_rate * (1 + baseline["social_security"])
+        exposure[code] = {
+            "current_cost": _summarize(current_cost[code]),
+            "value_at_risk": _value_at_risk(current_cost[code], confidence),
+        }
+
+    results = []
+    for scenario in scenarios:
+        target_rate = rates[:, column[scenario.currency]]
+        if scenario.adjusted_salary is None:
+            gross = (salary_usd + bonus_usd) * target_rate
+        else:
+            gross = scenario.adjusted_salary * headcount + bonus_usd * target_rate
+
+        tax_rate = np.clip(scenario.tax_rate + rate_volatility * rng.standard_normal(n_paths), 0.0, 1.0)
+        social_rate = np.clip(
+            scenario.social_security + rate_volatility * rng.standard_normal(n_paths), 0.0, None
+        )
+        projected = gross * (1 + social_rate)
+        delta = projected - current_cost[scenario.currency]
+        value_at_risk = _value_at_risk(projected, confidence)
+        mean_cost = float(projected.mean())
+
+        results.append({
+            "target_country": scenario.target_country,
+            "currency": scenario.currency,
+            "adjusted_salary": scenario.adjusted_salary,
+            "projected_cost": _summarize(projected),
+            "delta": _summarize(delta),
+            "projected_tax": _summarize(gross * tax_rate),
+            "value_at_risk": value_at_risk,
+            "value_at_risk_percentage": round(value_at_risk / mean_cost * 100, 2) if mean_cost else 0.0,
+        })
+
+    return {
+        "paths": n_paths,
+        "horizon_years": horizon_years,
+        "confidence": confidence,
+        "seed": seed,
+        "employee_count": headcount,
+        "excluded_employees": totals.excluded,
+        "unknown_currencies": totals.unknown,
+        "currency_exposure": exposure,
+        "scenarios": results,
+    }
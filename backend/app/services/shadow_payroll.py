@@ -0,0 +1,130 @@
+"""
+Dual-jurisdiction shadow payroll for internationally mobile employees.
+
+An employee whose work location resolves to a different country than their
+home payroll country is an assignee: the home payroll keeps running, and
+the host country's income tax and employer social security are computed
+alongside it (the "shadow" payroll).
+
+Work locations are resolved to country codes by the gazetteer index
+(``location_index``) before they get here. Tax terms are then computed
+with one vectorized schedule evaluation per distinct country (host and
+home), and the results are aggregated per (home, host) pair with
+``np.bincount``; the row count only affects array passes, never Python
+loops.
+"""
+
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .cost_engine import CurrentTerms, EmployeeVectors, ExchangeRates, conversion_factors, schedule_terms
+from .currency_engine import CurrencyEngine
+from .location_index import UNRESOLVED
+from .tax_engine import CountrySchedule
+
+
+def _country_terms(
+    gross: np.ndarray,
+    countries: np.ndarray,
+    currency: str,
+    schedules: Mapping[str, CountrySchedule],
+    engine: CurrencyEngine,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Income tax and employer social security of each row under its country's schedule."""
+    tax = np.zeros(len(gross))
+    social = np.zeros(len(gross))
+    for country in pd.unique(countries):
+        if country not in schedules:
+            continue
+        rows = countries == country
+        tax[rows], social[rows] = schedule_terms(gross[rows], currency, schedules[country], engine)
+    return tax, social
+
+
+def compute_shadow_payroll(
+    vectors: EmployeeVectors,
+    host: np.ndarray,
+    home: np.ndarray,
+    schedules: Mapping[str, CountrySchedule],
+    exchange_rates: ExchangeRates,
+    reporting_currency: str = "USD",
+    current: Optional[CurrentTerms] = None,
+) -> Dict[str, Any]:
+    """
+    Host-country liabilities next to the home payroll for every assignee.
+
+    Args:
+        vectors: Employee vectors
+        host: Host (work location) country code per row, UNRESOLVED if unknown
+        home: Home payroll country code per row
+        schedules: Tax schedule per supported country
+        exchange_rates: CurrencyEngine or units of each currency per USD
+        reporting_currency: Currency of all reported figures
+        current: Precomputed spot current terms in reporting_currency
+            (only their converted pay is used)
+
+    Returns:
+        Dictionary with totals and per (home, host) country pair liabilities
+    """
+    engine = CurrencyEngine.of(exchange_rates)
+    if current is not None and current.currency == reporting_currency:
+        included, unknown = current.included, list(current.unknown)
+        gross = current.salary + current.bonus
+    else:
+        factors, unknown = conversion_factors(vectors.currency, engine, reporting_currency)
+        included = ~np.isnan(factors)
+        gross = (vectors.salary + vectors.bonus) * np.where(included, factors, 0.0)
+
+    host = np.asarray(host, dtype=object)
+    home = np.asarray(home, dtype=object)
+    resolved = (host != UNRESOLVED) & np.isin(host, list(schedules)) & np.isin(home, list(schedules))
+    assignee = included & resolved & (host != home)
+
+    rows = np.flatnonzero(assignee)
+    pair_index, pair_keys = pd.factorize(home[rows] + ">" + host[rows])
+    pairs = [key.split(">") for key in pair_keys]
+    gross = gross[rows]
+    home_tax, home_social = _country_terms(gross, home[rows], reporting_currency, schedules, engine)
+    host_tax, host_social = _country_terms(gross, host[rows], reporting_currency, schedules, engine)
+
+    def per_pair(values: np.ndarray) -> np.ndarray:
+        return np.bincount(pair_index, weights=values, minlength=len(pairs))
+
+    sums = {
+        "gross_pay": per_pair(gross),
+        "home_tax": per_pair(home_tax),
+        "home_social_security": per_pair(home_social),
+        "host_tax": per_pair(host_tax),
+        "host_social_security": per_pair(host_social),
+    }
+    headcount = np.bincount(pair_index, minlength=len(pairs))
+
+    country_pairs = []
+    for index, (home_country, host_country) in enumerate(pairs):
+        host_currency = schedules[host_country].currency
+        liability = sums["host_tax"][index] + sums["host_social_security"][index]
+        country_pairs.append({
+            "home_country": home_country,
+            "host_country": host_country,
+            "headcount": int(headcount[index]),
+            **{name: round(float(values[index]), 2) for name, values in sums.items()},
+            "host_liability": round(float(liability), 2),
+            "host_currency": host_currency,
+            "host_liability_local": round(float(liability * engine.rate(reporting_currency, host_currency)), 2),
+        })
+    country_pairs.sort(key=lambda pair: pair["host_liability"], reverse=True)
+
+    totals = {name: round(float(values.sum()), 2) for name, values in sums.items()}
+    totals["host_liability"] = round(totals["host_tax"] + totals["host_social_security"], 2)
+    return {
+        "reporting_currency": reporting_currency,
+        "employee_count": int(included.sum()),
+        "excluded_employees": int((~included).sum()),
+        "unknown_currencies": unknown,
+        "assignee_count": len(rows),
+        "unresolved_locations": int((included & (host == UNRESOLVED)).sum()),
+        "totals": totals,
+        "country_pairs": country_pairs,
+    }
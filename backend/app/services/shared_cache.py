@@ -0,0 +1,382 @@
+"""
+Host-wide shared caches for multi-worker deployments.
+
+Each uvicorn worker is a separate process, so per-process caches and
+datasets are duplicated per worker and a dataset uploaded through one
+worker is unknown to the others. With SHARED_STATE_DIR set (a tmpfs such
+as /dev/shm/smartpaymap) datasets and hot caches are stored there instead
+and every worker on the host reads the same entries.
+
+An entry is one file: a JSON header (entry metadata and layout), the
+pickled value and the value's NumPy buffers. Values are pickled with
+protocol 5 and out-of-band buffers, so the arrays of a value (numeric
+columns, categorical codes, employee vectors) are written as raw,
+64-byte aligned bytes and loading them is a private memory map of the
+file - the pages are shared by all workers through the page cache and
+nothing is copied unless a worker writes to an array. Only the in-band
+part (object arrays, dicts, strings) is deserialized per read.
+
+Reading an entry unpickles it, which can run arbitrary code, and the
+default location (/dev/shm) is writable by every local user. The cache
+directory is therefore created with mode 0700 and refused unless it belongs
+to this user and nobody else can write to it; entry files are written with
+mode 0600, and a file owned by another user or writable by group or others
+is never unpickled.
+
+Entries are written to a temporary file and renamed into place, so a
+reader sees a whole entry or none. Recency is the file modification time
+(touched on every hit); beyond ``max_entries`` the least recently used
+files are removed. Unreadable entries (e.g. written by an older release)
+count as misses and are removed.
+"""
+
+import json
+import logging
+import mmap
+import os
+import pickle
+import stat
+import struct
+import threading
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..core.config import SHARED_STATE_DIR
+from .simulation_cache import CacheKey, SimulationCache, content_hash
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b"SPMSHM01"
+_PREFIX = struct.Struct("<8sQ")  # magic, header length
+_ALIGNMENT = 64
+_SUFFIX = ".entry"
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+def check_private(info: os.stat_result, path: str) -> None:
+    """
+    Refuse files and directories another user could have written.
+
+    Raises:
+        PermissionError: If ``path`` belongs to another user or is writable
+            by group or others
+    """
+    if info.st_uid != os.getuid() or info.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        raise PermissionError(f"{path} must belong to this user and not be group or world writable")
+
+
+def private_directory(path: str) -> None:
+    """
+    Create ``path`` (mode 0700) unless it exists, and check nobody else can write to it.
+
+    Raises:
+        PermissionError: If the directory is a symlink, belongs to another
+            user or is writable by group or others
+    """
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode):
+        raise PermissionError(f"{path} is not a directory")
+    check_private(info, path)
+
+
+def write_entry(path: str, value: Any, meta: Optional[Dict[str, Any]] = None) -> int:
+    """
+    Write ``value`` (and JSON-serializable ``meta``) to an entry file atomically.
+
+    Returns:
+        Size of the entry file in bytes
+    """
+    buffers: List[pickle.PickleBuffer] = []
+    payload = pickle.dumps(value, protocol=5, buffer_callback=buffers.append)
+    views = [memoryview(payload)] + [buffer.raw() for buffer in buffers]
+    # Offsets are relative to the first aligned byte after the header
+    layout, offset = [], 0
+    for view in views:
+        layout.append([offset, view.nbytes])
+        offset = _aligned(offset + view.nbytes)
+    header = json.dumps({"meta": meta or {}, "layout": layout}, default=str).encode("utf-8")
+    data_start = _aligned(_PREFIX.size + len(header))
+
+    temporary = f"{path}.{os.getpid()}.{uuid.uuid4().hex}.tmp"
+    try:
+        with os.fdopen(os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600), "wb") as handle:
+            handle.write(_PREFIX.pack(_MAGIC, len(header)))
+            handle.write(header)
+            for view, (start, _) in zip(views, layout):
+                handle.seek(data_start + start)
+                handle.write(view)
+            size = handle.tell()
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.unlink(temporary)
+        raise
+    return size
+
+
+def _read_header(handle) -> Tuple[Dict[str, Any], int]:
+    magic, header_length = _PREFIX.unpack(handle.read(_PREFIX.size))
+    if magic != _MAGIC:
+        raise ValueError("Not a shared cache entry")
+    header = json.loads(handle.read(header_length))
+    return header, _aligned(_PREFIX.size + header_length)
+
+
+def _open_entry(path: str):
+    # O_NOFOLLOW: a planted symlink must not point the read at another file
+    handle = os.fdopen(os.open(path, os.O_RDONLY | getattr(os, "O_NOFOLLOW", 0)), "rb")
+    try:
+        check_private(os.fstat(handle.fileno()), path)
+    except BaseException:
+        handle.close()
+        raise
+    return handle
+
+
+def read_meta(path: str) -> Dict[str, Any]:
+    """Metadata of an entry file, without loading its value."""
+    with _open_entry(path) as handle:
+        return _read_header(handle)[0]["meta"]
+
+
+def read_entry(path: str) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Load an entry file.
+
+    Returns:
+        Tuple of (value, metadata); the value's arrays are backed by a
+        copy-on-write memory map of the file
+
+    Raises:
+        PermissionError: If the file belongs to another user or is writable
+            by group or others (it is not unpickled)
+    """
+    with _open_entry(path) as handle:
+        header, data_start = _read_header(handle)
+        mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_COPY)
+    view = memoryview(mapped)
+    parts = [view[data_start + start:data_start + start + length] for start, length in header["layout"]]
+    return pickle.loads(parts[0], buffers=parts[1:]), header["meta"]
+
+
+class SharedCache:
+    """LRU cache of files in a directory shared by all worker processes on the host."""
+
+    def __init__(
+        self,
+        namespace: str,
+        max_entries: int,
+        directory: Optional[str] = SHARED_STATE_DIR,
+        local_entries: int = 0,
+    ):
+        """
+        Args:
+            namespace: Subdirectory holding this cache's entries
+            max_entries: Maximum number of entries on the host (0 disables caching)
+            directory: Shared state directory
+            local_entries: Values also kept in this process, for values that
+                are never mutated and costly to deserialize (0 disables)
+
+        Raises:
+            PermissionError: If the directory could have been written by
+                another user
+        """
+        if not directory:
+            raise ValueError("SharedCache requires a shared state directory")
+        self.namespace = namespace
+        self.max_entries = max(0, max_entries)
+        self.directory = directory
+        self.path = os.path.join(directory, namespace)
+        private_directory(directory)
+        private_directory(self.path)
+        self._local = SimulationCache(local_entries, copy_values=False) if local_entries else None
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def _entry_path(self, key: Any) -> str:
+        return os.path.join(self.path, content_hash(list(key) if isinstance(key, tuple) else key) + _SUFFIX)
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self._hits += 1
+            else:
+                self._misses += 1
+
+    def load(self, key: Any) -> Optional[Tuple[Any, Dict[str, Any]]]:
+        """Return (value, metadata) of an entry, or None (counted as a miss)."""
+        if not self.max_entries:
+            self._count(False)
+            return None
+        path = self._entry_path(key)
+        try:
+            entry = read_entry(path)
+        except FileNotFoundError:
+            self._count(False)
+            return None
+        except Exception as e:
+            logger.warning(f"Dropping unreadable shared cache entry {path}: {e}")
+            self._remove(path)
+            self._count(False)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self._count(True)
+        return entry
+
+    def get(self, key: CacheKey) -> Optional[Any]:
+        """Return the cached value, or None (counted as a miss)."""
+        if self._local is not None:
+            value = self._local.get(key)
+            if value is not None:
+                self._count(True)
+                return value
+        entry = self.load(key)
+        if entry is None:
+            return None
+        if self._local is not None:
+            self._local.put(key, entry[0])
+        return entry[0]
+
+    def meta(self, key: Any) -> Optional[Dict[str, Any]]:
+        """Metadata of an entry without loading its value, or None."""
+        try:
+            return read_meta(self._entry_path(key))
+        except (OSError, ValueError):
+            return None
+
+    def store(self, key: Any, value: Any, meta: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Write an entry, evicting the least recently used entries.
+
+        Raises:
+            OSError: If the entry cannot be written (e.g. the tmpfs is full)
+        """
+        if not self.max_entries:
+            return
+        write_entry(self._entry_path(key), value, meta)
+        if self._local is not None:
+            self._local.put(key, value)
+        self._evict()
+
+    def put(self, key: CacheKey, value: Any) -> None:
+        """Store ``value``; a failed write only logs, the cache is best-effort."""
+        try:
+            # The key is kept in the header so items() can list the entries
+            self.store(key, value, {"key": list(key)})
+        except OSError as e:
+            logger.warning(f"Could not write shared cache entry in {self.path}: {e}")
+
+    def delete(self, key: Any) -> bool:
+        """Remove an entry; returns False if it did not exist."""
+        return self._remove(self._entry_path(key))
+
+    def _remove(self, path: str) -> bool:
+        try:
+            os.unlink(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def _entries(self) -> List[os.DirEntry]:
+        try:
+            return [entry for entry in os.scandir(self.path) if entry.name.endswith(_SUFFIX)]
+        except FileNotFoundError:
+            return []
+
+    def _evict(self) -> None:
+        entries = self._entries()
+        if len(entries) <= self.max_entries:
+            return
+        ages = []
+        for entry in entries:
+            try:
+                ages.append((entry.stat().st_mtime_ns, entry.path))
+            except FileNotFoundError:
+                continue
+        ages.sort()
+        for _, path in ages[:max(0, len(ages) - self.max_entries)]:
+            # Another worker may have evicted the same entry first
+            if self._remove(path):
+                with self._lock:
+                    self._evictions += 1
+
+    def items(self) -> List[Tuple[CacheKey, Any]]:
+        """Entries stored with put(), least recently used first."""
+        ages = []
+        for entry in self._entries():
+            try:
+                ages.append((entry.stat().st_mtime_ns, entry.path))
+            except FileNotFoundError:
+                continue
+        items = []
+        for _, path in sorted(ages):
+            try:
+                value, meta = read_entry(path)
+            except Exception:
+                continue
+            if "key" in meta:
+                items.append((tuple(meta["key"]), value))
+        return items
+
+    def metas(self) -> List[Dict[str, Any]]:
+        """Metadata of every entry (in no particular order)."""
+        metas = []
+        for entry in self._entries():
+            try:
+                metas.append(read_meta(entry.path))
+            except (OSError, ValueError):
+                continue
+        return metas
+
+    def clear(self) -> None:
+        """Drop all entries on the host (metrics are kept)."""
+        for entry in self._entries():
+            self._remove(entry.path)
+        if self._local is not None:
+            self._local.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Host-wide size and this process's hit metrics."""
+        sizes = []
+        for entry in self._entries():
+            try:
+                sizes.append(entry.stat().st_size)
+            except FileNotFoundError:
+                continue
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(sizes),
+                "max_entries": self.max_entries,
+                "bytes": sum(sizes),
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+                "shared": True,
+            }
+
+
+def create_cache(namespace: str, max_entries: int, copy_values: bool = True, local_entries: int = 0):
+    """
+    A result cache for ``namespace``: host-wide when SHARED_STATE_DIR is set,
+    otherwise an in-process SimulationCache.
+
+    Args:
+        namespace: Name of the cache (its subdirectory in shared mode)
+        max_entries: Maximum number of entries (0 disables caching)
+        copy_values: In-process mode only; shared values are fresh per read
+        local_entries: Shared mode only; values also kept in this process
+    """
+    if SHARED_STATE_DIR:
+        return SharedCache(namespace, max_entries, SHARED_STATE_DIR, local_entries)
+    return SimulationCache(max_entries, copy_values)
@@ -0,0 +1,119 @@
+"""
+Result cache for policy simulations.
+
+Exploring policy changes re-submits the same dataset and parameters again
+and again. Results are keyed by a content hash of the dataset (headers,
+rows, mappings and options that change how rows are read), a canonical
+hash of the policy parameters and the version of the country data
+(rates, tax schedules), so any change to inputs or reference data misses.
+Entries are evicted least-recently-used beyond a fixed size.
+
+The same cache type holds per-dataset intermediates (employee vectors,
+current-payroll terms) that later simulations of the same dataset reuse;
+those are shared read-only instead of copied.
+"""
+
+import copy
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from ..core.config import SIMULATION_CACHE_MAX_ENTRIES
+
+CacheKey = Tuple[Hashable, ...]
+
+
+def content_hash(value: Any) -> str:
+    """
+    SHA-256 of the canonical JSON form of ``value``.
+
+    Keys are sorted and separators fixed, so equal values (e.g. the same
+    dict built in a different order) always hash the same.
+    """
+    canonical = json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def dataset_hash(headers: List[str], rows: List[List[str]], options: Any = None) -> str:
+    """
+    SHA-256 of a dataset's headers, rows and reading options.
+
+    Cells are joined with ASCII unit/record separators, several times faster
+    than canonical JSON for large datasets. When the separator counts show
+    that a cell contains a separator (or a row is empty) the join would be
+    ambiguous, so the canonical JSON hash is used instead.
+    """
+    body = "\x1e".join(map("\x1f".join, rows))
+    expected_units = sum(map(len, rows)) - len(rows)
+    if body.count("\x1f") != expected_units or body.count("\x1e") != max(len(rows) - 1, 0):
+        return content_hash([headers, rows, options])
+    hasher = hashlib.sha256(content_hash([headers, options]).encode("ascii"))
+    hasher.update(body.encode("utf-8", "surrogatepass"))
+    return hasher.hexdigest()
+
+
+class SimulationCache:
+    """Size-bounded LRU cache of simulation results with hit metrics."""
+
+    def __init__(self, max_entries: int = SIMULATION_CACHE_MAX_ENTRIES, copy_values: bool = True):
+        """
+        Args:
+            max_entries: Maximum number of cached results (0 disables caching)
+            copy_values: Deep-copy values in and out; disable for values
+                that are never mutated (e.g. NumPy intermediates)
+        """
+        self.max_entries = max(0, max_entries)
+        self.copy_values = copy_values
+        self._entries: "OrderedDict[CacheKey, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: CacheKey) -> Optional[Any]:
+        """Return (a copy of) the cached value, or None (counted as a miss)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+        return copy.deepcopy(entry) if self.copy_values else entry
+
+    def put(self, key: CacheKey, value: Any) -> None:
+        """Store (a copy of) ``value``, evicting the least recently used entries."""
+        if not self.max_entries:
+            return
+        entry = copy.deepcopy(value) if self.copy_values else value
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def items(self) -> List[Tuple[CacheKey, Any]]:
+        """All entries, least recently used first (values are not copied)."""
+        with self._lock:
+            return list(self._entries.items())
+
+    def clear(self) -> None:
+        """Drop all entries (metrics are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache size and hit metrics."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+            }
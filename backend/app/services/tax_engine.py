@@ -0,0 +1,212 @@
+"""
+Progressive income tax and capped social security schedules.
+
+Schedules are loaded from versioned JSON files (TAX_SCHEDULE_DIR/<year>.json)
+holding, per country, income tax brackets as ``[lower_bound, marginal_rate]``
+pairs and employer social security components as ``rate`` applied between
+an optional ``floor`` and ``cap``, all in the country's local currency.
+
+Tax for a whole income column is one ``np.searchsorted`` over the bracket
+lower bounds plus a gather from the precomputed tax due at each bound, so
+the cost is O(n log b) array work rather than a per-employee loop. Both
+schedules accept arrays of any shape (e.g. a scenarios x employees block).
+``StackedSchedule`` evaluates a different schedule on each row of such a
+block with a single ``np.searchsorted``.
+"""
+
+import json
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from ..core.config import TAX_SCHEDULE_DIR, TAX_SCHEDULE_VERSION
+
+
+@dataclass
+class ProgressiveSchedule:
+    """Marginal-rate brackets with precomputed cumulative tax at each bound."""
+
+    thresholds: np.ndarray  # ascending lower bounds, first is 0
+    rates: np.ndarray  # marginal rate from each bound
+    cumulative: np.ndarray  # tax due on income exactly at each bound
+
+    @classmethod
+    def from_brackets(cls, brackets: Sequence[Sequence[float]]) -> "ProgressiveSchedule":
+        """Build from ``[lower_bound, rate]`` pairs (a 0 bound is implied at rate 0)."""
+        pairs = sorted((float(bound), float(rate)) for bound, rate in brackets)
+        if not pairs or pairs[0][0] > 0:
+            pairs.insert(0, (0.0, 0.0))
+        thresholds = np.array([bound for bound, _ in pairs])
+        rates = np.array([rate for _, rate in pairs])
+        cumulative = np.concatenate([[0.0], np.cumsum(np.diff(thresholds) * rates[:-1])])
+        return cls(thresholds, rates, cumulative)
+
+    @classmethod
+    def flat(cls, rate: float) -> "ProgressiveSchedule":
+        return cls.from_brackets([[0.0, rate]])
+
+    def tax(self, income: np.ndarray) -> np.ndarray:
+        """Tax due on each income (0 for non-positive income)."""
+        income = np.maximum(np.asarray(income, dtype=np.float64), 0.0)
+        bracket = np.searchsorted(self.thresholds, income, side="right") - 1
+        return self.cumulative[bracket] + (income - self.thresholds[bracket]) * self.rates[bracket]
+
+
+@dataclass
+class StackedSchedule:
+    """
+    Several progressive schedules evaluated together, one per row of an income block.
+
+    Tax is continuous and piecewise linear in income, so a schedule is the
+    interpolation through its bounds and the tax due at each. Each row's
+    bounds are shifted by a multiple of a power of two above every income
+    and bound, which keeps the rows apart on one axis: a single ``np.interp``
+    over the stacked bounds evaluates the whole block.
+    """
+
+    thresholds: np.ndarray  # stacked bounds of all schedules (unshifted)
+    cumulative: np.ndarray  # tax due at each stacked bound
+    rows: np.ndarray  # schedule (row) index of each stacked bound
+    ends: np.ndarray  # index after the last stacked bound of each row
+    top_rates: np.ndarray  # marginal rate above each schedule's last bound
+
+    @classmethod
+    def stack(
+        cls, schedules: Sequence[ProgressiveSchedule], scales: Optional[Sequence[float]] = None
+    ) -> "StackedSchedule":
+        """
+        Args:
+            schedules: One schedule per row of the income blocks
+            scales: Units of the income currency per unit of each schedule's
+                currency (1 when omitted); converting incomes to each
+                schedule's currency and the tax back is folded into the stack
+        """
+        scales = [1.0] * len(schedules) if scales is None else list(scales)
+        return cls(
+            thresholds=np.concatenate([[]] + [s.thresholds * k for s, k in zip(schedules, scales)]),
+            cumulative=np.concatenate([[]] + [s.cumulative * k for s, k in zip(schedules, scales)]),
+            rows=np.concatenate([[]] + [np.full(len(s.thresholds), row) for row, s in enumerate(schedules)]),
+            ends=np.cumsum([len(s.thresholds) for s in schedules], dtype=np.intp),
+            top_rates=np.array([s.rates[-1] for s in schedules], dtype=np.float64),
+        )
+
+    def tax(self, income: np.ndarray) -> np.ndarray:
+        """Tax due on each income of a (schedules x n) block under its row's schedule."""
+        income = np.maximum(np.asarray(income, dtype=np.float64), 0.0)
+        # A closing bound above every income extends each top bracket
+        top = max(float(income.max(initial=0.0)), float(self.thresholds.max(initial=0.0))) + 1.0
+        span = 2.0 ** np.ceil(np.log2(top + 1.0))
+        last = self.ends - 1
+        bounds = np.insert(self.thresholds + self.rows * span, self.ends, top + np.arange(len(self.ends)) * span)
+        values = np.insert(
+            self.cumulative, self.ends,
+            self.cumulative[last] + (top - self.thresholds[last]) * self.top_rates,
+        )
+        offsets = np.arange(len(self.ends))[:, None] * span
+        return np.interp(income + offsets, bounds, values)
+
+
+@dataclass
+class ContributionSchedule:
+    """Social security components, each a rate applied between a floor and a cap."""
+
+    rates: np.ndarray
+    floors: np.ndarray
+    spans: np.ndarray  # cap - floor (inf when uncapped)
+
+    def __post_init__(self):
+        # The summed components are piecewise linear in income with kinks at
+        # every floor and cap, i.e. a bracket schedule over those breakpoints
+        caps = self.floors + self.spans
+        bounds = np.unique(np.concatenate([[0.0], self.floors, caps[np.isfinite(caps)]]))
+        active = (bounds[:, None] >= self.floors) & (bounds[:, None] < caps)
+        self.piecewise = ProgressiveSchedule.from_brackets(
+            list(zip(bounds, active.astype(np.float64) @ self.rates))
+        )
+
+    @classmethod
+    def from_components(cls, components: Sequence[Mapping[str, Any]]) -> "ContributionSchedule":
+        rates = np.array([float(item["rate"]) for item in components], dtype=np.float64)
+        floors = np.array([float(item.get("floor", 0.0)) for item in components], dtype=np.float64)
+        caps = np.array(
+            [np.inf if item.get("cap") is None else float(item["cap"]) for item in components],
+            dtype=np.float64,
+        )
+        return cls(rates, floors, np.maximum(caps - floors, 0.0))
+
+    @classmethod
+    def flat(cls, rate: float) -> "ContributionSchedule":
+        return cls.from_components([{"rate": rate}])
+
+    def contribution(self, income: np.ndarray) -> np.ndarray:
+        """Total contribution due on each income."""
+        return self.piecewise.tax(income)
+
+
+@dataclass
+class CountrySchedule:
+    """Income tax and employer social security for one country."""
+
+    country: str
+    currency: str
+    income_tax: ProgressiveSchedule
+    social_security: ContributionSchedule
+    version: str = "flat"
+
+    @classmethod
+    def flat(cls, country: str, currency: str, tax_rate: float, social_security: float) -> "CountrySchedule":
+        """Schedule equivalent to single flat rates (no brackets, no caps)."""
+        return cls(
+            country, currency, ProgressiveSchedule.flat(tax_rate), ContributionSchedule.flat(social_security)
+        )
+
+
+class TaxSchedules:
+    """One version of the per-country schedules."""
+
+    def __init__(self, version: str, effective_date: str, countries: Dict[str, CountrySchedule]):
+        self.version = version
+        self.effective_date = effective_date
+        self.countries = countries
+
+    @classmethod
+    def from_file(cls, path: str) -> "TaxSchedules":
+        with open(path, "r", encoding="utf-8") as handle:
+            data = json.load(handle)
+        version = str(data["version"])
+        countries = {
+            code: CountrySchedule(
+                country=code,
+                currency=entry["currency"],
+                income_tax=ProgressiveSchedule.from_brackets(entry["income_tax"]),
+                social_security=ContributionSchedule.from_components(entry["employer_social_security"]),
+                version=version,
+            )
+            for code, entry in data["countries"].items()
+        }
+        return cls(version, data.get("effective_date", ""), countries)
+
+    def get(self, country: str) -> Optional[CountrySchedule]:
+        return self.countries.get(country)
+
+
+def available_versions(directory: str = TAX_SCHEDULE_DIR) -> List[str]:
+    """Schedule file versions in ``directory`` (file names without .json), sorted."""
+    return sorted(name[:-5] for name in os.listdir(directory) if name.endswith(".json"))
+
+
+@lru_cache(maxsize=8)
+def load_tax_schedules(
+    version: Optional[str] = TAX_SCHEDULE_VERSION, directory: str = TAX_SCHEDULE_DIR
+) -> TaxSchedules:
+    """Load (once) the given schedule version, or the latest file when version is None."""
+    versions = available_versions(directory)
+    if not versions:
+        raise FileNotFoundError(f"No tax schedule files in {directory}")
+    selected = version or versions[-1]
+    if selected not in versions:
+        raise ValueError(f"Unknown tax schedule version {selected}; available: {', '.join(versions)}")
+    return TaxSchedules.from_file(os.path.join(directory, f"{selected}.json"))
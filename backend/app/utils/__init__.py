@@ -10,6 +10,11 @@ from .mapping_utils import (
     extract_or_default_with_headers,
     construct_standardized_row,
     construct_standardized_dataset,
+    infer_mapping_from_headers,
+    build_mapping_plan,
+    construct_standardized_frame,
+    normalize_standardized_values,
+    parse_dates,
     validate_mapping,
     get_missing_standard_fields,
     get_mapping_coverage_stats,
@@ -24,6 +29,11 @@ __all__ = [
     "extract_or_default_with_headers",
     "construct_standardized_row",
     "construct_standardized_dataset",
+    "infer_mapping_from_headers",
+    "build_mapping_plan",
+    "construct_standardized_frame",
+    "normalize_standardized_values",
+    "parse_dates",
     "validate_mapping",
     "get_missing_standard_fields",
     "get_mapping_coverage_stats",
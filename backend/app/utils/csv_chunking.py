@@ -0,0 +1,153 @@
+"""
+Parallel chunked CSV parsing utilities.
+
+Large payroll files are split into byte ranges that start and end on record
+boundaries, parsed independently on the shared process pool and reassembled
+into a single DataFrame with consistent column dtypes.
+
+Record boundaries are found by tracking the parity of quote characters: a
+newline only ends a record when an even number of quotes precedes it, so
+newlines embedded in quoted fields never split a record. Escaped quotes are
+doubled (RFC 4180) and therefore keep the parity unchanged.
+"""
+
+import io
+import mmap
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+from pandas.api.types import is_bool_dtype, is_numeric_dtype
+
+# Window used when counting quote characters, keeps transient copies bounded
+_SCAN_WINDOW_BYTES = 8 * 1024 * 1024
+
+
+def _count_quotes(buffer: mmap.mmap, start: int, end: int, quotechar: bytes) -> int:
+    """Count quote characters in buffer[start:end] in bounded windows."""
+    count = 0
+    for window_start in range(start, end, _SCAN_WINDOW_BYTES):
+        window_end = min(end, window_start + _SCAN_WINDOW_BYTES)
+        count += buffer[window_start:window_end].count(quotechar)
+    return count
+
+
+def _next_record_end(
+    buffer: mmap.mmap, start: int, target: int, quotechar: bytes
+) -> int:
+    """
+    Return the offset just past the first record-ending newline at or after target.
+
+    ``start`` must be a record boundary. Returns ``len(buffer)`` if no
+    boundary exists after target.
+    """
+    size = len(buffer)
+    parity = _count_quotes(buffer, start, target, quotechar) & 1
+    position = target
+
+    while position < size:
+        newline = buffer.find(b"\n", position)
+        if newline == -1:
+            return size
+        parity ^= _count_quotes(buffer, position, newline, quotechar) & 1
+        if parity == 0:
+            return newline + 1
+        position = newline + 1
+
+    return size
+
+
+def find_record_boundaries(
+    path: str, n_chunks: int, quotechar: str = '"'
+) -> Tuple[int, List[Tuple[int, int]]]:
+    """
+    Split a CSV file into byte ranges aligned on record boundaries.
+
+    Args:
+        path: Path to the CSV file
+        n_chunks: Desired number of chunks (fewer are returned for small files)
+        quotechar: CSV quote character
+
+    Returns:
+        Tuple of (header_end_offset, list of (start, end) data ranges)
+    """
+    quote = quotechar.encode()
+    with open(path, "rb") as handle:
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            size = len(buffer)
+            header_end = _next_record_end(buffer, 0, 0, quote)
+            data_size = size - header_end
+
+            ranges: List[Tuple[int, int]] = []
+            start = header_end
+            for index in range(1, max(1, n_chunks)):
+                target = header_end + (data_size * index) // n_chunks
+                if target <= start:
+                    continue
+                end = _next_record_end(buffer, start, target, quote)
+                if end >= size:
+                    break
+                ranges.append((start, end))
+                start = end
+
+            if start < size:
+                ranges.append((start, size))
+
+    return header_end, ranges
+
+
+def read_header(path: str, header_end: int, encoding: str) -> List[str]:
+    """Parse the header record of a CSV file."""
+    with open(path, "rb") as handle:
+        header_bytes = handle.read(header_end)
+    return pd.read_csv(io.BytesIO(header_bytes), encoding=encoding, nrows=0).columns.tolist()
+
+
+def parse_chunk(
+    path: str,
+    start: int,
+    end: int,
+    headers: Sequence[str],
+    encoding: str,
+    dtype: Optional[Dict[str, type]] = None,
+) -> pd.DataFrame:
+    """
+    Parse one byte range of a CSV file (runs inside a worker process).
+
+    Workers read their own range from disk so only offsets are pickled on the
+    way in.
+    """
+    with open(path, "rb") as handle:
+        handle.seek(start)
+        data = handle.read(end - start)
+
+    return pd.read_csv(
+        io.BytesIO(data), header=None, names=list(headers), encoding=encoding, dtype=dtype
+    )
+
+
+def find_inconsistent_columns(chunks: Sequence[pd.DataFrame]) -> List[str]:
+    """
+    Return columns whose inferred dtypes cannot be concatenated losslessly.
+
+    Numeric chunks (int/float) are compatible with each other; any mix of
+    numeric with text or boolean columns, or text with boolean, is not.
+    """
+    if len(chunks) < 2:
+        return []
+
+    inconsistent = []
+    for column in chunks[0].columns:
+        kinds = set()
+        for chunk in chunks:
+            column_dtype = chunk[column].dtype
+            if chunk[column].isna().all():
+                continue  # all-empty chunks adopt whatever the other chunks infer
+            if is_bool_dtype(column_dtype):
+                kinds.add("bool")
+            elif is_numeric_dtype(column_dtype):
+                kinds.add("numeric")
+            else:
+                kinds.add("text")
+        if len(kinds) > 1:
+            inconsistent.append(column)
+    return inconsistent
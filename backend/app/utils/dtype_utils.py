@@ -0,0 +1,117 @@
+"""
+Memory-efficient dtype inference for ingested datasets.
+
+Payroll exports repeat a handful of values (currencies, regions, cities)
+across millions of rows and store IDs and amounts in 64-bit columns. This
+module shrinks a parsed DataFrame in place of re-reading it:
+
+- low-cardinality text columns become categoricals
+- integer columns are downcast to the smallest signed/unsigned type
+- float columns become float32 when every value survives the round trip
+  to FLOAT32_MAX_DECIMALS decimal places, except money columns (salary,
+  bonus and tax rate, recognized from the headers): the cost engine reads
+  amounts back as float64, and float32 values such as 0.2199999988 for
+  0.22 drift by cents once multiplied and summed over many rows
+"""
+
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_float_dtype, is_integer_dtype, is_object_dtype, is_string_dtype
+
+from ..core.config import DTYPE_CATEGORICAL_MAX_RATIO, DTYPE_FLOAT32_MAX_DECIMALS
+from .mapping_utils import NUMERIC_STANDARD_FIELDS, infer_mapping_from_headers
+
+
+def monetary_columns(headers: Iterable[Any]) -> Set[str]:
+    """Headers inferred to hold salary, bonus or tax rate amounts."""
+    mapping = infer_mapping_from_headers([str(header) for header in headers])
+    return {header for header, field in mapping.items() if field in NUMERIC_STANDARD_FIELDS}
+
+
+def _is_float32_safe(column: pd.Series, decimals: int) -> bool:
+    """Check that float32 reproduces every value to ``decimals`` places."""
+    values = column.to_numpy(dtype=np.float64)
+    finite = np.isfinite(values)
+    if not finite.any():
+        return True
+    values = values[finite]
+    rounded = np.round(values, decimals)
+    if not np.array_equal(rounded, values):
+        return False  # more precision than we promise to keep
+    round_trip = np.round(values.astype(np.float32).astype(np.float64), decimals)
+    return bool(np.array_equal(round_trip, rounded))
+
+
+def _optimize_column(
+    column: pd.Series, categorical_max_ratio: float, float32_decimals: int, monetary: bool = False
+) -> pd.Series:
+    """Return the most compact lossless representation of a column."""
+    if is_integer_dtype(column.dtype):
+        downcast = "unsigned" if len(column) and column.min() >= 0 else "integer"
+        return pd.to_numeric(column, downcast=downcast)
+
+    if is_float_dtype(column.dtype):
+        if not monetary and column.dtype != np.float32 and _is_float32_safe(column, float32_decimals):
+            return column.astype(np.float32)
+        return column
+
+    if is_object_dtype(column.dtype) or is_string_dtype(column.dtype):
+        non_null = column.count()
+        if non_null and column.nunique(dropna=True) <= categorical_max_ratio * non_null:
+            return column.astype("category")
+
+    return column
+
+
+def optimize_dtypes(
+    df: pd.DataFrame,
+    categorical_max_ratio: float = DTYPE_CATEGORICAL_MAX_RATIO,
+    float32_decimals: int = DTYPE_FLOAT32_MAX_DECIMALS,
+    monetary: Optional[Iterable[str]] = None,
+) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Convert a DataFrame to compact dtypes and report the memory saved.
+
+    Args:
+        df: Parsed dataset
+        categorical_max_ratio: Max distinct/non-null ratio for categorical text columns
+        float32_decimals: Decimal places float32 must reproduce exactly
+        monetary: Float columns kept at float64 (inferred from the headers when omitted)
+
+    Returns:
+        Tuple of (optimized DataFrame, memory report). The report has
+        per-column dtypes and byte counts before and after, plus totals.
+    """
+    bytes_before = df.memory_usage(deep=True, index=False)
+    monetary = monetary_columns(df.columns) if monetary is None else set(monetary)
+    optimized = pd.DataFrame(
+        {
+            column: _optimize_column(
+                df[column], categorical_max_ratio, float32_decimals, str(column) in monetary
+            )
+            for column in df.columns
+        },
+        index=df.index,
+    )
+    bytes_after = optimized.memory_usage(deep=True, index=False)
+
+    columns = {
+        str(column): {
+            "dtype_before": str(df[column].dtype),
+            "dtype_after": str(optimized[column].dtype),
+            "bytes_before": int(bytes_before[column]),
+            "bytes_after": int(bytes_after[column]),
+        }
+        for column in df.columns
+    }
+    total_before = int(bytes_before.sum())
+    total_after = int(bytes_after.sum())
+
+    return optimized, {
+        "bytes_before": total_before,
+        "bytes_after": total_after,
+        "reduction_ratio": round(total_before / total_after, 2) if total_after else 1.0,
+        "columns": columns,
+    }
@@ -6,10 +6,34 @@ according to the canonical STANDARD_FIELDS schema for consistent export
 and processing across the SmartPayMap system.
 """
 
+import re
 from typing import Dict, List, Optional, Any
 
+import pandas as pd
+
 from ..core.config import STANDARD_FIELDS
 
+# Standard fields holding amounts; thousands separators, currency symbols and
+# percent signs are stripped (export normalization and cost parsing alike).
+# Only commas followed by a group of three digits are thousands separators
+NUMERIC_STANDARD_FIELDS = ["salary", "bonus", "tax_rate"]
+NUMERIC_NOISE_PATTERN = r"[\s$€£¥₹%]|,(?=\d{3}(?!\d))"
+# A comma after a dot is a decimal comma ("1.234,56"), not a thousands separator
+_DECIMAL_COMMA_PATTERN = r"\.\d*,"
+
+# Known header spellings (lower-case, alphanumerics only) for each standard field,
+# used when a request carries rows but no confirmed mapping
+HEADER_ALIASES: Dict[str, List[str]] = {
+    "full_name": ["fullname", "name", "employeename"],
+    "employee_id": ["employeeid", "empid", "empcode", "employeenumber", "id"],
+    "salary": ["salary", "basicsalary", "salarybase", "basesalary", "basepay", "monthlypay", "amount"],
+    "bonus": ["bonus", "bonusamt", "bonusamount", "additionalincentive"],
+    "currency": ["currency", "currencycode", "curr", "paycurrency"],
+    "tax_rate": ["taxrate", "taxpercent", "tax", "taxbracket"],
+    "location": ["location", "locationcode", "city", "region"],
+    "employment_date": ["employmentdate", "hiredate", "startdate", "joiningdate", "date"],
+}
+
 
 def extract_or_default(
     row: List[str], mapping: Dict[str, str], standard_field: str
@@ -179,6 +203,152 @@ def construct_standardized_dataset(
     ]
 
 
+def infer_mapping_from_headers(headers: List[str]) -> Dict[str, str]:
+    """
+    Infer a field mapping from header names using HEADER_ALIASES.
+
+    Args:
+        headers: List of CSV column headers
+
+    Returns:
+        Dictionary mapping source headers to standard fields (first match wins)
+
+    Example:
+        >>> infer_mapping_from_headers(["Emp Code", "Base Pay", "Currency"])
+        {"Emp Code": "employee_id", "Base Pay": "salary", "Currency": "currency"}
+    """
+    normalized = {header: re.sub(r"[^a-z0-9]", "", header.lower()) for header in headers}
+    mapping: Dict[str, str] = {}
+
+    for standard_field, aliases in HEADER_ALIASES.items():
+        for alias in aliases:
+            source = next(
+                (h for h, norm in normalized.items() if norm == alias and h not in mapping), None
+            )
+            if source is not None:
+                mapping[source] = standard_field
+                break
+
+    return mapping
+
+
+def build_mapping_plan(headers: List[str], mapping: Dict[str, str]) -> Dict[str, Optional[str]]:
+    """
+    Resolve, once per dataset, which source column feeds each standard field.
+
+    Follows the same rules as extract_or_default_with_headers(): the first
+    source field mapped to a standard field wins, and it only contributes
+    when it is one of the headers.
+
+    Args:
+        headers: List of CSV column headers
+        mapping: Dictionary mapping source field names to standard field names
+
+    Returns:
+        Dictionary of standard field -> source column (None if unmapped)
+    """
+    header_set = set(headers)
+    plan: Dict[str, Optional[str]] = {}
+
+    for standard_field in STANDARD_FIELDS:
+        source_field = next(
+            (src for src, std in mapping.items() if std == standard_field), None
+        )
+        plan[standard_field] = source_field if source_field in header_set else None
+
+    return plan
+
+
+def construct_standardized_frame(
+    df: pd.DataFrame, plan: Dict[str, Optional[str]]
+) -> pd.DataFrame:
+    """
+    Vectorized construct_standardized_dataset() over a DataFrame.
+
+    Args:
+        df: Source data (any dtypes)
+        plan: Mapping plan from build_mapping_plan()
+
+    Returns:
+        DataFrame with STANDARD_FIELDS columns (None where unmapped)
+    """
+    columns = {}
+    for standard_field in STANDARD_FIELDS:
+        source_field = plan.get(standard_field)
+        if source_field is None:
+            columns[standard_field] = pd.Series(None, index=df.index, dtype=object)
+        else:
+            columns[standard_field] = df[source_field]
+    return pd.DataFrame(columns, index=df.index)
+
+
+def parse_dates(raw_dates: pd.Series) -> pd.Series:
+    """
+    Parse a column of date strings, NaT where unparseable.
+
+    A fast ISO 8601 pass runs first; only the leftovers go through
+    per-value format inference.
+    """
+    raw_dates = raw_dates.astype(object).where(raw_dates.notna(), "").astype(str).str.strip()
+    dates = pd.to_datetime(raw_dates, errors="coerce", format="ISO8601")
+    leftover = dates.isna() & (raw_dates != "")
+    if leftover.any():
+        dates[leftover] = pd.to_datetime(raw_dates[leftover], errors="coerce", format="mixed")
+    return dates
+
+
+def strip_numeric_noise(values: pd.Series) -> pd.Series:
+    """
+    Remove thousands separators, currency symbols and percent signs from amounts.
+
+    Values that would not become a plain number (decimal commas, free text)
+    are returned unchanged rather than turned into a different number.
+
+    Args:
+        values: Series of strings
+
+    Returns:
+        Series of cleaned strings
+    """
+    cleaned = values.str.replace(NUMERIC_NOISE_PATTERN, "", regex=True)
+    plain = pd.to_numeric(cleaned, errors="coerce").notna() | (cleaned == "")
+    plain &= ~values.str.contains(_DECIMAL_COMMA_PATTERN, regex=True)
+    return cleaned.where(plain, values)
+
+
+def normalize_standardized_values(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Normalize values of a standardized frame for export.
+
+    - All values become trimmed strings (missing values become "")
+    - currency codes are upper-cased
+    - numeric fields lose thousands separators, currency symbols and percent
+      signs; values that would not become a plain number are kept as they are
+    - parseable employment dates are rewritten as ISO dates (YYYY-MM-DD)
+
+    Args:
+        df: DataFrame with STANDARD_FIELDS columns
+
+    Returns:
+        Normalized DataFrame of strings
+    """
+    normalized = df.astype(object).where(df.notna(), "").astype(str)
+    for field in normalized.columns:
+        if df[field].notna().any():
+            normalized[field] = normalized[field].str.strip()
+
+    normalized["currency"] = normalized["currency"].str.upper()
+    for field in NUMERIC_STANDARD_FIELDS:
+        normalized[field] = strip_numeric_noise(normalized[field])
+
+    dates = parse_dates(normalized["employment_date"])
+    parsed = dates.notna()
+    if parsed.any():
+        normalized.loc[parsed, "employment_date"] = dates[parsed].dt.strftime("%Y-%m-%d")
+
+    return normalized
+
+
 def validate_mapping(mapping: Dict[str, str]) -> List[str]:
     """
     Validate that mapping values are all valid standard fields.
@@ -0,0 +1,154 @@
+"""
+Upload spooling utilities.
+
+Uploads are streamed to a temporary file on disk in fixed-size chunks while a
+running SHA-256 is computed and the size limit is enforced, so oversize
+uploads are rejected as soon as they cross the limit and the content is never
+held as a single ``bytes`` object. Parsers then read the spooled file through
+a memory map: concurrent uploads share the OS page cache instead of each
+holding a private copy of the file in the process heap.
+"""
+
+import hashlib
+import io
+import mmap
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import UploadFile
+
+from ..core.config import UPLOAD_CHUNK_BYTES, UPLOAD_SPOOL_DIR
+from ..core.exceptions import PayloadTooLargeError
+from ..core.executor import run_io_bound
+
+
+@dataclass
+class SpooledUpload:
+    """An upload spooled to a temporary file."""
+
+    path: str
+    size: int
+    sha256: str
+
+    def cleanup(self) -> None:
+        """Delete the spooled file."""
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self) -> "SpooledUpload":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.cleanup()
+
+
+def _format_size(size: int) -> str:
+    return f"{size / (1024 * 1024):.0f}MB"
+
+
+async def spool_upload(
+    file: UploadFile, max_size: int, chunk_size: int = UPLOAD_CHUNK_BYTES
+) -> SpooledUpload:
+    """
+    Stream an upload to a temporary file, hashing it and enforcing max_size.
+
+    Args:
+        file: The uploaded file
+        max_size: Maximum accepted size in bytes
+        chunk_size: Bytes read per chunk
+
+    Returns:
+        SpooledUpload describing the temporary file (caller must clean it up)
+
+    Raises:
+        PayloadTooLargeError: As soon as the upload exceeds max_size
+    """
+    # The multipart parser already knows the size; reject without copying anything
+    if file.size is not None and file.size > max_size:
+        raise PayloadTooLargeError(f"File exceeds maximum size of {_format_size(max_size)}")
+
+    handle = tempfile.NamedTemporaryFile(
+        prefix="smartpaymap-", suffix=".csv", dir=UPLOAD_SPOOL_DIR, delete=False
+    )
+    hasher = hashlib.sha256()
+    size = 0
+
+    def write_block(block: bytes) -> None:
+        # hashlib and file writes release the GIL for large buffers
+        hasher.update(block)
+        handle.write(block)
+
+    try:
+        await file.seek(0)
+        while block := await file.read(chunk_size):
+            size += len(block)
+            if size > max_size:
+                raise PayloadTooLargeError(f"File exceeds maximum size of {_format_size(max_size)}")
+            await run_io_bound(write_block, block)
+        handle.close()
+    except BaseException:
+        handle.close()
+        os.unlink(handle.name)
+        raise
+
+    return SpooledUpload(path=handle.name, size=size, sha256=hasher.hexdigest())
+
+
+class MappedFileReader(io.RawIOBase):
+    """
+    Read-only raw stream over a memory-mapped file.
+
+    pandas treats this as a binary handle and decodes it with the requested
+    encoding, while the bytes themselves are served from the page cache.
+    """
+
+    def __init__(self, path: str):
+        super().__init__()
+        self._file = open(path, "rb")
+        self._size = os.fstat(self._file.fileno()).st_size
+        # mmap cannot map empty files; an empty reader just returns EOF
+        self._map: Optional[mmap.mmap] = (
+            mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self._size else None
+        )
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        count = min(len(buffer), self._size - self._position)
+        if count <= 0 or self._map is None:
+            return 0
+        with memoryview(self._map) as view:
+            buffer[:count] = view[self._position:self._position + count]
+        self._position += count
+        return count
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self._size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        self._position = max(0, position)
+        return self._position
+
+    def tell(self) -> int:
+        return self._position
+
+    def close(self) -> None:
+        if not self.closed:
+            if self._map is not None:
+                self._map.close()
+            self._file.close()
+        super().close()
@@ -10,5 +10,8 @@ echo "API Documentation: http://localhost:8000/docs"
 echo "Health Check: http://localhost:8000/health"
 echo "================================"
 
+# Workers share datasets and caches through a tmpfs directory
+export SHARED_STATE_DIR="${SHARED_STATE_DIR:-/dev/shm/smartpaymap}"
+
 # Start with production settings
-uvicorn main:app --host 0.0.0.0 --port 8000 --workers 4 
\ No newline at end of file
+uvicorn main:app --host 0.0.0.0 --port 8000 --workers "${WEB_CONCURRENCY:-4}" 
\ No newline at end of file
@@ -0,0 +1,96 @@
+"""
+Response serialization before/after on a row-heavy payload.
+
+Serves the same CSVResponse-shaped payload (headers plus N rows of
+strings taken from a DataFrame) through an in-process app three ways:
+
+- default: a CSVResponse model returned through FastAPI's response model
+  validation, ``jsonable_encoder`` and ``json.dumps``;
+- fast: ``fast_response`` with rows from ``frame_rows`` (orjson when installed);
+- fast+gzip: the same with ``Accept-Encoding: gzip``.
+
+Usage (from the repository root):
+
+    python test/benchmarks/benchmark_json.py --rows 100000
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from fastapi import FastAPI, Header
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from backend.app.core.responses import JSON_BACKEND, fast_response, frame_rows  # noqa: E402
+from backend.app.models import CSVResponse  # noqa: E402
+
+
+def build_frame(rows: int) -> pd.DataFrame:
+    generator = np.random.default_rng(7)
+    ids = np.arange(rows)
+    return pd.DataFrame({
+        "Employee ID": [f"E{value:07d}" for value in ids],
+        "Name": [f"Employee {value}" for value in ids],
+        "Salary": generator.integers(20_000, 200_000, rows).astype(str),
+        "Currency": generator.choice(["USD", "EUR", "GBP", "INR"], rows),
+        "Location": generator.choice(["New York, USA", "Berlin", "London, UK", "Mumbai"], rows),
+        "Hire Date": generator.choice(["2019-03-01", "2021-07-15", "2023-01-09"], rows),
+        "Tax Rate": generator.uniform(0.1, 0.45, rows).round(3).astype(str),
+        "Bonus": generator.integers(0, 20_000, rows).astype(str),
+    })
+
+
+def build_app(df: pd.DataFrame) -> FastAPI:
+    app = FastAPI()
+    headers = list(df.columns)
+
+    @app.get("/default", response_model=CSVResponse)
+    async def default() -> CSVResponse:
+        return CSVResponse(headers=headers, rows=df.fillna("").astype(str).values.tolist())
+
+    @app.get("/fast", response_model=CSVResponse)
+    async def fast(accept_encoding: Optional[str] = Header(default=None)):
+        return await fast_response({"headers": headers, "rows": frame_rows(df)}, accept_encoding)
+
+    return app
+
+
+def measure(client: TestClient, path: str, encoding: str, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = client.get(path, headers={"Accept-Encoding": encoding})
+        timings.append(time.perf_counter() - started)
+        response.raise_for_status()
+    wire_bytes = int(response.headers.get("content-length", len(response.content)))
+    return min(timings) * 1000, wire_bytes, response.json()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    df = build_frame(args.rows)
+    client = TestClient(build_app(df))
+    print(f"{args.rows} rows x {len(df.columns)} columns, JSON backend: {JSON_BACKEND}")
+    print(f"{'path':>10} {'best ms':>9} {'wire bytes':>12}")
+    results = {}
+    for name, path, encoding in [
+        ("default", "/default", "identity"), ("fast", "/fast", "identity"), ("fast+gzip", "/fast", "gzip")
+    ]:
+        elapsed, wire_bytes, body = measure(client, path, encoding, args.repeat)
+        results[name] = body
+        print(f"{name:>10} {elapsed:>9.1f} {wire_bytes:>12}")
+    assert results["default"] == results["fast"] == results["fast+gzip"]
+
+
+if __name__ == "__main__":
+    main()
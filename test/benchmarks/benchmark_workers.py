@@ -0,0 +1,141 @@
+"""
+Throughput of the API by uvicorn worker count, with shared state.
+
+Starts the backend with 1, 2, 4... workers and a fresh shared state
+directory, uploads one dataset, then keeps CONCURRENCY requests in flight
+against an endpoint reading that dataset by id for DURATION seconds.
+Every worker serves the dataset stored by whichever worker handled the
+upload; with ``--no-shared`` each worker has its own store and the other
+workers answer 404.
+
+Usage (from the repository root):
+
+    python test/benchmarks/benchmark_workers.py --workers 1 2 4 --rows 50000
+"""
+
+import argparse
+import asyncio
+import csv
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "backend")
+LOCATIONS = ["New York, USA", "Berlin", "London, UK", "Mumbai", "Paris, France", "Singapore", "Toronto"]
+CURRENCIES = ["USD", "EUR", "GBP", "INR", "EUR", "SGD", "CAD"]
+
+
+def write_dataset(path: str, rows: int) -> None:
+    generator = random.Random(7)
+    with open(path, "w", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["Employee ID", "Name", "Salary", "Currency", "Location", "Hire Date", "Tax Rate"])
+        for row in range(rows):
+            place = generator.randrange(len(LOCATIONS))
+            writer.writerow([
+                f"E{row:07d}", f"Employee {row}", generator.randrange(20_000, 200_000),
+                CURRENCIES[place], LOCATIONS[place], f"20{generator.randrange(10, 24)}-01-15",
+                round(generator.uniform(0.1, 0.45), 3),
+            ])
+
+
+def start_server(workers: int, port: int, shared_dir: str) -> subprocess.Popen:
+    env = {**os.environ, "SHARED_STATE_DIR": shared_dir}
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env,
+    )
+
+
+def wait_ready(base_url: str, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("Server did not become ready")
+
+
+async def load(base_url: str, dataset_id: str, endpoint: str, concurrency: int, duration: float):
+    latencies, errors = [], 0
+    deadline = time.monotonic() + duration
+
+    async def client_loop(client: httpx.AsyncClient) -> None:
+        nonlocal errors
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            response = await client.post(endpoint, json={"dataset_id": dataset_id})
+            if response.status_code == 200:
+                latencies.append(time.perf_counter() - started)
+            else:
+                errors += 1
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits) as client:
+        started = time.monotonic()
+        await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+        elapsed = time.monotonic() - started
+    latencies.sort()
+    return len(latencies) / elapsed, latencies, errors
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--endpoint", default="/compliance_analysis")
+    parser.add_argument("--port", type=int, default=8123)
+    parser.add_argument("--no-shared", action="store_true", help="Per-worker stores (SHARED_STATE_DIR unset)")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="smartpaymap-bench-")
+    dataset = os.path.join(work_dir, "payroll.csv")
+    write_dataset(dataset, args.rows)
+    shm = "/dev/shm" if os.path.isdir("/dev/shm") else None
+    base_url = f"http://127.0.0.1:{args.port}"
+
+    print(f"{os.cpu_count()} CPUs, {args.rows} rows, {args.concurrency} concurrent requests to {args.endpoint}")
+    print(f"{'workers':>7} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'errors':>7}")
+    try:
+        for workers in args.workers:
+            shared_dir = "" if args.no_shared else tempfile.mkdtemp(prefix="smartpaymap-", dir=shm)
+            server = start_server(workers, args.port, shared_dir)
+            try:
+                wait_ready(base_url)
+                with open(dataset, "rb") as handle:
+                    response = httpx.post(
+                        f"{base_url}/upload_dataset", files={"file": ("payroll.csv", handle, "text/csv")}, timeout=300
+                    )
+                response.raise_for_status()
+                dataset_id = response.json()["dataset_id"]
+                # Warm up every worker (imports, gazetteer memo) before measuring
+                asyncio.run(load(base_url, dataset_id, args.endpoint, args.concurrency, 2.0))
+                rate, latencies, errors = asyncio.run(
+                    load(base_url, dataset_id, args.endpoint, args.concurrency, args.duration)
+                )
+                p50 = latencies[len(latencies) // 2] * 1000 if latencies else float("nan")
+                p95 = latencies[int(len(latencies) * 0.95)] * 1000 if latencies else float("nan")
+                print(f"{workers:>7} {rate:>9.1f} {p50:>8.1f} {p95:>8.1f} {errors:>7}")
+            finally:
+                server.terminate()
+                server.wait(30)
+                if shared_dir:
+                    shutil.rmtree(shared_dir, ignore_errors=True)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.app.core.admission import (
+    AdmissionController,
+    AdmissionLimit,
+    AdmissionMiddleware,
+    client_key,
+    proxy_networks,
+)
+from backend.app.core.exceptions import ServerBusyError, TooManyRequestsError
+
+
+def test_requests_beyond_the_cap_queue_and_a_full_queue_rejects_fast():
+    async def scenario():
+        limit = AdmissionLimit("compute", max_concurrent=1, max_queue=1, queue_timeout=5)
+        await limit.acquire("a")
+        waiting = asyncio.ensure_future(limit.acquire("b"))
+        await asyncio.sleep(0)
+
+        with pytest.raises(ServerBusyError) as rejected:
+            await limit.acquire("c")
+        assert rejected.value.status_code == 503 and rejected.value.retry_after >= 1
+        assert limit.stats()["queue_depth"] == 1
+
+        limit.release(0.5)
+        await waiting
+        limit.release(0.5)
+        return limit.stats()
+
+    stats = asyncio.run(scenario())
+    assert (stats["active"], stats["queue_depth"]) == (0, 0)
+    assert (stats["admitted"], stats["rejected_queue_full"]) == (2, 1)
+
+
+def test_freed_slots_go_round_robin_and_clients_have_a_queue_cap():
+    async def scenario():
+        limit = AdmissionLimit("llm", max_concurrent=1, max_queue=10, queue_timeout=5, client_queue=3)
+        order = []
+
+        async def request(client, name):
+            await limit.acquire(client)
+            order.append(name)
+
+        await limit.acquire("first")
+        tasks = [asyncio.ensure_future(request("busy", f"busy{index}")) for index in range(3)]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.ensure_future(request("quiet", "quiet0")))
+        await asyncio.sleep(0)
+
+        with pytest.raises(TooManyRequestsError):
+            await limit.acquire("busy")
+        for _ in range(4):
+            limit.release()
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+        return order, limit.stats()
+
+    order, stats = asyncio.run(scenario())
+    assert order == ["busy0", "quiet0", "busy1", "busy2"]
+    assert stats["rejected_client"] == 1
+
+
+def test_waits_time_out_and_leave_the_queue():
+    async def scenario():
+        limit = AdmissionLimit("bulk", max_concurrent=1, max_queue=4, queue_timeout=0.01)
+        await limit.acquire("a")
+        with pytest.raises(ServerBusyError):
+            await limit.acquire("b")
+        return limit.stats()
+
+    stats = asyncio.run(scenario())
+    assert (stats["timeouts"], stats["queue_depth"], stats["waiting_clients"]) == (1, 0, 0)
+
+
+def test_middleware_rejects_saturated_routes_only():
+    limit = AdmissionLimit("compute", max_concurrent=1, max_queue=0)
+    app = FastAPI()
+    app.add_middleware(AdmissionMiddleware, controller=AdmissionController({"compute": limit}, {"/heavy": "compute"}))
+
+    @app.get("/heavy")
+    async def heavy():
+        return {"ok": True}
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    client = TestClient(app)
+    assert client.get("/heavy").status_code == 200
+    assert limit.stats()["active"] == 0
+
+    limit._active = 1  # another request holds the only slot
+    response = client.get("/heavy")
+    assert response.status_code == 503 and response.headers["Retry-After"] == "1"
+    assert response.json()["type"] == "ServerBusyError"
+    assert client.get("/health").status_code == 200
+
+
+def test_forwarded_addresses_count_only_behind_trusted_proxies():
+    trusted = proxy_networks(["172.18.0.0/16"])
+    forwarded = [(b"x-forwarded-for", b"6.6.6.6, 10.0.0.7, 172.18.0.3")]
+
+    # Hops a client prepended are ignored: the rightmost untrusted hop is the client
+    assert client_key({"headers": forwarded, "client": ("172.18.0.2", 5000)}, trusted) == "10.0.0.7"
+    # A client talking to the backend directly cannot choose its key
+    assert client_key({"headers": forwarded, "client": ("203.0.113.9", 5000)}, trusted) == "203.0.113.9"
+    assert client_key({"headers": [], "client": ("172.18.0.2", 5000)}, trusted) == "172.18.0.2"
+    assert client_key({"headers": [], "client": ("127.0.0.1", 5000)}) == "127.0.0.1"
@@ -0,0 +1,103 @@
+import asyncio
+
+from backend.app.core.config import API_VERSION
+from backend.app.services.cache_snapshot import SNAPSHOT_FORMAT, CacheSnapshot, WarmUp
+from backend.app.services.shared_cache import write_entry
+from backend.app.services.simulation_cache import SimulationCache
+
+
+def test_snapshot_restores_entries_in_recency_order(tmp_path):
+    path = str(tmp_path / "snapshot.bin")
+    suggestions = SimulationCache(8)
+    suggestions.put(("suggestions", "a"), {"mappings": {"Pay": "salary"}})
+    suggestions.put(("suggestions", "b"), {"mappings": {"Name": "full_name"}})
+    suggestions.get(("suggestions", "a"))
+    snapshot = CacheSnapshot({"mapping_suggestions": suggestions}, path)
+    snapshot.restore()
+    assert snapshot.save() == 2
+
+    restarted = SimulationCache(8)
+    warm = CacheSnapshot({"mapping_suggestions": restarted, "simulation_results": SimulationCache(8)}, path)
+
+    assert warm.restore() == 2
+    assert [key for key, _ in restarted.items()] == [("suggestions", "b"), ("suggestions", "a")]
+    assert restarted.get(("suggestions", "a")) == {"mappings": {"Pay": "salary"}}
+
+
+def test_nothing_is_saved_before_the_restore_finished(tmp_path):
+    path = tmp_path / "snapshot.bin"
+    cache = SimulationCache(8)
+    cache.put(("key",), 1)
+
+    assert CacheSnapshot({"results": cache}, str(path)).save() == 0
+    assert not path.exists()
+
+
+def test_snapshots_of_other_versions_are_ignored(tmp_path):
+    path = str(tmp_path / "snapshot.bin")
+    write_entry(path, {"results": [(("key",), 1)]}, {"format": 1, "api_version": "0.0.0"})
+    cache = SimulationCache(8)
+
+    assert CacheSnapshot({"results": cache}, path).restore() == 0
+    assert cache.items() == []
+
+
+def test_warm_caches_are_not_overwritten(tmp_path):
+    path = str(tmp_path / "snapshot.bin")
+    old = SimulationCache(8)
+    old.put(("key",), "old")
+    snapshot = CacheSnapshot({"results": old}, path)
+    snapshot.restore()
+    snapshot.save()
+    warm = SimulationCache(8)
+    warm.put(("key",), "new")
+
+    assert CacheSnapshot({"results": warm}, path).restore() == 0
+    assert warm.get(("key",)) == "new"
+
+
+def test_warm_up_reports_ready_after_its_steps_even_if_one_fails():
+    calls = []
+
+    def failing():
+        raise RuntimeError("gazetteer missing")
+
+    warm_up = WarmUp()
+    assert not warm_up.ready
+    asyncio.run(warm_up.run(lambda: calls.append("restore"), failing))
+
+    assert calls == ["restore"]
+    assert warm_up.ready and warm_up.error == "gazetteer missing"
+
+
+def test_only_one_worker_writes_the_snapshot(tmp_path):
+    path = tmp_path / "snapshot.bin"
+    first, second = SimulationCache(8), SimulationCache(8)
+    first.put(("key",), "first")
+    second.put(("key",), "second")
+    owner = CacheSnapshot({"results": first}, str(path))
+    other = CacheSnapshot({"results": second}, str(path))
+    owner.restore()
+    other.restore()
+
+    assert owner.save() == 1 and other.save() == 0
+    assert owner.owner and not other.owner
+    assert [file.name for file in tmp_path.iterdir() if file.suffix == ".tmp"] == []
+
+    # Ownership passes on once the owner lets go
+    owner.release()
+    assert other.save() == 1 and other.owner
+    restored = SimulationCache(8)
+    CacheSnapshot({"results": restored}, str(path)).restore()
+    assert restored.get(("key",)) == "second"
+    other.release()
+
+
+def test_snapshots_writable_by_others_are_not_unpickled(tmp_path):
+    path = tmp_path / "snapshot.bin"
+    write_entry(str(path), {"results": [(("key",), 1)]}, {"format": SNAPSHOT_FORMAT, "api_version": API_VERSION})
+    path.chmod(0o666)
+    cache = SimulationCache(8)
+
+    assert CacheSnapshot({"results": cache}, str(path)).restore() == 0
+    assert cache.items() == []
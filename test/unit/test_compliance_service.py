@@ -0,0 +1,106 @@
+import json
+
+import numpy as np
+import pytest
+
+from backend.app.api.routes import _etag_matches
+from backend.app.core.exceptions import ValidationAPIError
+from backend.app.services.compliance_rules import load_compliance_rules
+from backend.app.services.compliance_service import ComplianceAnalysisService
+from backend.app.services.cost_engine import rows_frame
+
+
+def test_heatmap_snapshot_is_built_once_per_risk_data_version():
+    service = ComplianceAnalysisService()
+
+    first = service.heatmap_snapshot()
+    assert service.heatmap_snapshot() is first
+    body = json.loads(first.body)
+    assert body["total_countries"] == len(service.COUNTRY_RISK_FACTORS)
+    assert body["compliance_heatmap"] == service.analyze_compliance_risks()
+
+    service.set_risk_factors({"Singapore": service.COUNTRY_RISK_FACTORS["Singapore"]})
+    second = service.heatmap_snapshot()
+    assert second.etag != first.etag
+    assert list(json.loads(second.body)["compliance_heatmap"]) == ["Singapore"]
+
+
+def test_if_none_match_comparison():
+    etag = '"abc"'
+    assert _etag_matches('"abc"', etag)
+    assert _etag_matches('"x", W/"abc"', etag)
+    assert _etag_matches("*", etag)
+    assert not _etag_matches('"abd"', etag)
+    assert not _etag_matches(None, etag)
+
+
+def test_dataset_analysis_groups_employees_by_location_country():
+    service = ComplianceAnalysisService()
+    headers = ["name", "salary", "currency", "location", "employment_date", "tax_rate"]
+    df = rows_frame(headers, [
+        ["A", "100000", "USD", "New York, USA", "2020-01-01", "0.2"],
+        ["B", "50000", "USD", "Berlin, Germany", "", "0.3"],
+        ["C", "0", "USD", "germany", "2021-01-01", ""],
+        ["D", "50000", "USD", "Atlantis", "2019-01-01", "0.1"],
+        ["E", "40000", "USD", "Mumbai", "2022-01-01", "0.1"],
+    ])
+
+    result = service.analyze_dataset(df)
+
+    assert result["unresolved_locations"] == 1 and result["unresolved_location_values"] == ["ATLANTIS"]
+    # Mumbai is a known location in a country without risk data, not a bad value
+    assert result["uncovered_locations"] == 1 and result["uncovered_countries"] == {"India": 1}
+    by_country = {item["country"]: item for item in result["countries"]}
+    assert set(by_country) == set(result["compliance_heatmap"]) == {"Germany", "United States"}
+    germany = by_country["Germany"]
+    assert (germany["headcount"], germany["payroll_volume"]) == (2, 50000.0)
+    assert germany["data_gaps"] == {"salary": 1, "currency": 0, "employment_date": 1, "tax_rate": 1}
+    assert germany["completeness"] == pytest.approx(5 / 8)
+    assert by_country["United States"]["completeness"] == 1.0
+    # Exposure is the mean of headcount and payroll share of located employees
+    assert germany["weighted_risk"] == pytest.approx(germany["risk_score"] * (2 / 3 + 1 / 3) / 2, abs=1e-4)
+    assert result["overall_risk_score"] == pytest.approx(sum(item["weighted_risk"] for item in result["countries"]))
+
+
+def test_incomplete_rows_raise_the_country_risk_score():
+    service = ComplianceAnalysisService()
+    headers = ["name", "salary", "currency", "location", "employment_date", "tax_rate"]
+    complete = service.analyze_dataset(rows_frame(headers, [["A", "1000", "EUR", "France", "2020-01-01", "0.2"]]))
+    missing = service.analyze_dataset(rows_frame(headers, [["A", "", "", "France", "", ""]]))
+
+    assert missing["countries"][0]["risk_score"] > complete["countries"][0]["risk_score"]
+
+
+def test_unsupported_reporting_currencies_are_rejected():
+    service = ComplianceAnalysisService()
+    headers = ["name", "salary", "currency", "location"]
+    df = rows_frame(headers, [["A", "1000", "EUR", "Germany"]])
+
+    with pytest.raises(ValidationAPIError, match="Unsupported reporting currency: XYZ"):
+        service.analyze_dataset(df, reporting_currency="XYZ")
+
+
+def test_compiled_rules_score_many_quality_vectors_at_once():
+    model = load_compliance_rules().compile()
+    germany, singapore = model.index("Germany"), model.index("Singapore")
+
+    # Base risk (medium 5) + high tax complexity (2) + GDPR (1.5) + comprehensive labor law (1)
+    assert model.base_scores[germany] == 9.5
+    # One row per dataset; the quality bands add 0, 1 or 2 points
+    scores = model.scores(np.array([[1.0], [0.8], [0.5]]))
+    assert scores.shape == (3, len(model.countries))
+    assert scores[:, singapore].tolist() == [2.0, 3.0, 4.0]
+    assert model.describe(singapore, scores[1, singapore]) == "Low Risk - Streamlined tax system"
+    assert model.describe(singapore, scores[2, singapore]) == "Moderate - Multiple compliance areas need attention"
+
+
+def test_countries_added_as_data_use_the_rule_tables():
+    service = ComplianceAnalysisService()
+    service.set_risk_factors({"Ireland": {"base_risk": "low", "tax_complexity": "medium", "data_protection": "GDPR"}})
+
+    assert service.analyze_compliance_risks() == {
+        "Ireland": "Moderate - Multiple compliance areas need attention"
+    }
+    assert service.get_country_details("Ireland")["recommendations"] == [
+        "Ensure GDPR compliance for employee data", "Implement data subject rights procedures",
+    ]
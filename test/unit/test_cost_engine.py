@@ -0,0 +1,84 @@
+import pytest
+
+from backend.app.services.cost_engine import (
+    Scenario,
+    compute_policy_costs,
+    evaluate_scenarios,
+    vectors_from_rows,
+)
+
+EXCHANGE_RATES = {"USD": 1.0, "EUR": 0.5}
+BASELINE = {"tax_rate": 0.2, "social_security": 0.1}
+
+HEADERS = ["Emp Code", "Base Pay", "Bonus", "Currency", "TAX %"]
+ROWS = [
+    ["1", "100,000", "10000", "USD", "0.3"],
+    ["2", "40000", "", "eur", ""],
+    ["3", "50000", "0", "XYZ", "0.2"],
+]
+
+
+def test_vectors_infer_mapping_and_parse_values():
+    vectors = vectors_from_rows(HEADERS, ROWS)
+
+    assert vectors.salary.tolist() == [100000.0, 40000.0, 50000.0]
+    assert vectors.bonus.tolist() == [10000.0, 0.0, 0.0]
+    assert vectors.currency.tolist() == ["USD", "EUR", "XYZ"]
+    assert vectors.tax_rate[0] == pytest.approx(0.3)
+
+
+def test_compute_policy_costs_exact_totals():
+    vectors = vectors_from_rows(HEADERS, ROWS)
+    scenario = Scenario("DE", "EUR", tax_rate=0.4, social_security=0.2)
+
+    costs = compute_policy_costs(vectors, scenario, BASELINE, EXCHANGE_RATES)
+
+    # Employee 1: 110,000 USD -> 55,000 EUR; employee 2: 40,000 EUR; employee 3 excluded
+    assert costs["employee_count"] == 2
+    assert costs["excluded_employees"] == 1
+    assert costs["unknown_currencies"] == ["XYZ"]
+    assert costs["total_current_cost"] == pytest.approx(95000 * 1.1)
+    assert costs["total_projected_cost"] == pytest.approx(95000 * 1.2)
+    assert costs["total_delta"] == pytest.approx(95000 * 0.1)
+    assert costs["total_current_tax"] == pytest.approx(55000 * 0.3 + 40000 * 0.2)
+    assert costs["total_projected_tax"] == pytest.approx(95000 * 0.4)
+    assert costs["currency_breakdown"]["USD"]["headcount"] == 1
+    assert costs["currency_breakdown"]["EUR"]["projected_cost"] == pytest.approx(48000)
+    assert "XYZ" not in costs["currency_breakdown"]
+
+
+def test_adjusted_salary_replaces_base_pay():
+    vectors = vectors_from_rows(HEADERS, ROWS[:2])
+    scenario = Scenario("DE", "EUR", tax_rate=0.4, social_security=0.0, adjusted_salary=60000)
+
+    costs = compute_policy_costs(vectors, scenario, BASELINE, EXCHANGE_RATES)
+
+    # Salaries replaced by 60,000 EUR each, bonus (5,000 EUR) kept
+    assert costs["total_projected_cost"] == pytest.approx(125000)
+
+
+def test_evaluate_scenarios_matches_single_scenario_costs():
+    vectors = vectors_from_rows(HEADERS, ROWS)
+    scenarios = [
+        Scenario("DE", "EUR", tax_rate=0.4, social_security=0.2),
+        Scenario("US", "USD", tax_rate=0.2, social_security=0.1, adjusted_salary=90000),
+        Scenario("DE", "EUR", tax_rate=0.4, social_security=0.0, adjusted_salary=60000),
+    ]
+
+    # Small blocks exercise the blockwise accumulation
+    matrix = evaluate_scenarios(vectors, scenarios, BASELINE, EXCHANGE_RATES, "EUR", block_size=2)
+
+    assert matrix["employee_count"] == 2
+    assert matrix["unknown_currencies"] == ["XYZ"]
+    for scenario, result in zip(scenarios, matrix["scenarios"]):
+        single = compute_policy_costs(vectors, scenario, BASELINE, EXCHANGE_RATES)
+        to_eur = EXCHANGE_RATES["EUR"] / EXCHANGE_RATES[scenario.currency]
+        assert result["total_projected_cost"] == pytest.approx(single["total_projected_cost"] * to_eur)
+        assert result["total_projected_tax"] == pytest.approx(single["total_projected_tax"] * to_eur)
+        assert matrix["total_current_cost"] == pytest.approx(single["total_current_cost"] * to_eur)
+
+
+def test_evaluate_scenarios_rejects_unknown_reporting_currency():
+    vectors = vectors_from_rows(HEADERS, ROWS)
+    with pytest.raises(ValueError):
+        evaluate_scenarios(vectors, [], BASELINE, EXCHANGE_RATES, "XYZ")
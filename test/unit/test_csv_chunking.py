@@ -0,0 +1,61 @@
+import asyncio
+
+import pandas as pd
+
+from backend.app.services.csv_service import CSVService
+from backend.app.utils.csv_chunking import (
+    find_inconsistent_columns,
+    find_record_boundaries,
+    parse_chunk,
+    read_header,
+)
+
+
+def _write_csv(tmp_path, rows=200):
+    lines = ['employee_id,full_name,notes,salary']
+    for i in range(rows):
+        # Every third record has a quoted newline and an escaped quote
+        notes = f'"line one\nline ""two"" {i}"' if i % 3 == 0 else f"plain {i}"
+        lines.append(f"{i},Name {i},{notes},{50000 + i}")
+    path = tmp_path / "payroll.csv"
+    path.write_text("\n".join(lines) + "\n")
+    return str(path)
+
+
+def test_boundaries_respect_quoted_newlines(tmp_path):
+    path = _write_csv(tmp_path)
+    expected = pd.read_csv(path)
+
+    header_end, ranges = find_record_boundaries(path, 7)
+    assert len(ranges) > 1
+    assert ranges[0][0] == header_end
+    assert all(prev[1] == nxt[0] for prev, nxt in zip(ranges, ranges[1:]))
+
+    headers = read_header(path, header_end, "utf-8")
+    chunks = [parse_chunk(path, start, end, headers, "utf-8") for start, end in ranges]
+    result = pd.concat(chunks, ignore_index=True)
+
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_inconsistent_columns_detected():
+    numeric = pd.DataFrame({"employee_id": [1, 2], "salary": [1.0, 2.0]})
+    text = pd.DataFrame({"employee_id": ["E3", "E4"], "salary": [3, 4]})
+    assert find_inconsistent_columns([numeric, text]) == ["employee_id"]
+
+
+def test_read_dataset_parallel_matches_serial(tmp_path, monkeypatch):
+    path = tmp_path / "mixed.csv"
+    # employee_id is numeric in the first half and alphanumeric in the second
+    rows = [f"{i},{1000 + i}" for i in range(100)] + [f"E{i},{1000 + i}" for i in range(100)]
+    path.write_text("employee_id,salary\n" + "\n".join(rows) + "\n")
+
+    monkeypatch.setattr("backend.app.services.csv_service.PARALLEL_PARSE_MIN_BYTES", 0)
+    monkeypatch.setattr("backend.app.services.csv_service.PARALLEL_PARSE_CHUNKS", 4)
+
+    result = asyncio.run(CSVService.read_dataset(str(path)))
+
+    assert len(result) == 200
+    assert result["employee_id"].tolist()[:2] == ["0", "1"]
+    assert result["employee_id"].tolist()[-1] == "E99"
+    assert result["salary"].dtype.kind == "i"
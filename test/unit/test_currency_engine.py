@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.app.services.currency_engine import UNKNOWN_CURRENCY, CurrencyEngine
+
+RATES = {"USD": 1.0, "EUR": 0.5, "INR": 80.0}
+
+
+def test_cross_rates_and_integer_codes():
+    engine = CurrencyEngine(RATES)
+
+    assert engine.rate("EUR", "INR") == pytest.approx(160.0)
+    assert engine.rate("INR", "USD") == pytest.approx(1 / 80)
+
+    codes, unknown = engine.encode(["INR", "", "XYZ", "EUR", "INR"])
+    assert codes.tolist() == [
+        engine.index["INR"], engine.index["USD"], UNKNOWN_CURRENCY, engine.index["EUR"], engine.index["INR"]
+    ]
+    assert unknown == ["XYZ"]
+
+
+def test_convert_mixed_currency_column():
+    engine = CurrencyEngine(RATES)
+
+    converted, unknown = engine.convert(
+        np.array([8000.0, 100.0, 50.0, 10.0]), ["INR", "EUR", "XYZ", "USD"], "EUR"
+    )
+
+    np.testing.assert_allclose(converted[[0, 1, 3]], [50.0, 100.0, 5.0])
+    assert np.isnan(converted[2])
+    assert unknown == ["XYZ"]
+
+
+def test_convert_frame_leaves_unknown_rows_untouched():
+    engine = CurrencyEngine(RATES)
+    frame = pd.DataFrame({
+        "salary": ["8000", "1000", "", "abc", ""],
+        "bonus": ["", "10", "5", "0.00", ""],
+        "currency": ["INR", "XYZ", "EUR", "EUR", "EUR"],
+    })
+
+    converted, unknown, unconverted = engine.convert_frame(frame, "USD")
+
+    assert converted["salary"].tolist() == ["100.00", "1000", "", "abc", ""]
+    assert converted["bonus"].tolist() == ["", "10", "10.00", "0.00", ""]
+    assert converted["currency"].tolist() == ["USD", "XYZ", "USD", "EUR", "EUR"]
+    assert unknown == ["XYZ"]
+    assert unconverted == 1
+    assert frame["currency"].tolist() == ["INR", "XYZ", "EUR", "EUR", "EUR"], "input frame must not change"
+
+
+def test_rows_with_an_unparsable_amount_are_not_converted_or_relabeled():
+    engine = CurrencyEngine(RATES)
+    frame = pd.DataFrame({"salary": ["abc", "4000"], "bonus": ["50", "n/a"], "currency": ["EUR", "INR"]})
+
+    converted, unknown, unconverted = engine.convert_frame(frame, "USD")
+
+    assert converted.to_dict("records") == frame.to_dict("records")
+    assert (unknown, unconverted) == ([], 2)
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+from backend.app.services.cost_engine import numeric_column
+from backend.app.utils.dtype_utils import optimize_dtypes
+
+
+def test_optimize_dtypes_compacts_columns_losslessly():
+    rows = 1000
+    df = pd.DataFrame({
+        "emp_id": np.arange(2001, 2001 + rows),
+        "full_name": [f"Employee {i}" for i in range(rows)],
+        "currency_code": np.tile(["USD", "GBP", "INR", "MXN"], rows // 4),
+        "tax_percent": np.tile([0.18, 0.2, 0.28, 0.3], rows // 4),
+        "fte": np.tile([1.0, 0.5, 0.75, 0.8], rows // 4),
+        "salary": np.round(np.linspace(30000.25, 90000.75, rows), 2),
+        "delta": np.full(rows, -5),
+    })
+    df.loc[3, "fte"] = np.nan
+
+    optimized, report = optimize_dtypes(df)
+
+    assert optimized["emp_id"].dtype == np.uint16
+    assert optimized["delta"].dtype == np.int8
+    assert optimized["currency_code"].dtype == "category"
+    assert optimized["full_name"].dtype == object, "unique text must stay plain strings"
+    assert optimized["fte"].dtype == np.float32
+    # Money columns stay float64
+    assert optimized["tax_percent"].dtype == np.float64
+    assert optimized["salary"].dtype == np.float64
+
+    assert optimized["currency_code"].astype(str).tolist() == df["currency_code"].tolist()
+    np.testing.assert_allclose(optimized["fte"].to_numpy(np.float64), df["fte"], rtol=1e-6)
+
+    assert report["bytes_after"] < report["bytes_before"]
+    assert report["columns"]["currency_code"]["dtype_before"] == "object"
+    assert report["columns"]["currency_code"]["bytes_after"] < report["columns"]["currency_code"]["bytes_before"]
+
+
+def test_money_columns_sum_to_the_cent():
+    rows = 100_000
+    # Both survive a float32 round trip to 4 decimals, but not a sum over many rows
+    df = pd.DataFrame({"Base Pay": np.full(rows, 100.05), "Tax Rate": np.full(rows, 0.22)})
+
+    optimized, _ = optimize_dtypes(df)
+
+    salary = numeric_column(optimized["Base Pay"])
+    assert round(float(salary.sum()), 2) == 10_005_000.00
+    assert round(float((salary * numeric_column(optimized["Tax Rate"])).sum()), 2) == 2_201_100.00
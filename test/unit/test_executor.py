@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+
+from backend.app.core.executor import ExecutorPool
+
+
+def _square(value):
+    return value * value
+
+
+def _fail():
+    raise ValueError("boom")
+
+
+def test_thread_pool_runs_and_records_metrics():
+    pool = ExecutorPool("test-io", "thread", 2)
+
+    async def run_all():
+        return await asyncio.gather(*(pool.run(_square, i) for i in range(6)))
+
+    try:
+        assert asyncio.run(run_all()) == [0, 1, 4, 9, 16, 25]
+        stats = pool.stats()
+        assert stats["submitted"] == 6
+        assert stats["completed"] == 6
+        assert stats["in_flight"] == 0
+        assert stats["queue_depth"] == 0
+        assert stats["max_queue_depth"] >= 1, "6 tasks on 2 workers should have queued"
+    finally:
+        pool.shutdown()
+
+
+def test_process_pool_runs_module_level_functions():
+    pool = ExecutorPool("test-cpu", "process", 1)
+    try:
+        assert asyncio.run(pool.run(_square, 7)) == 49
+        assert pool.stats()["completed"] == 1
+    finally:
+        pool.shutdown()
+
+
+def test_failures_are_counted_and_propagated():
+    pool = ExecutorPool("test-fail", "thread", 1)
+    try:
+        with pytest.raises(ValueError):
+            asyncio.run(pool.run(_fail))
+        stats = pool.stats()
+        assert stats["failed"] == 1
+        assert stats["in_flight"] == 0
+    finally:
+        pool.shutdown()
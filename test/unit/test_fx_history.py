@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from backend.app.services.cost_engine import Scenario, compute_policy_costs, vectors_from_rows
+from backend.app.services.currency_engine import CurrencyEngine
+from backend.app.services.fx_history import FXHistory, historical_conversion_factors
+
+SPOT = CurrencyEngine({"USD": 1.0, "EUR": 0.5, "INR": 80.0})
+
+
+@pytest.fixture
+def history(tmp_path):
+    path = tmp_path / "fx.csv"
+    path.write_text(
+        "# units per USD\n"
+        "date,USD,EUR,INR\n"
+        "2023-01-01,1.0,0.9,82.0\n"
+        "2022-01-01,1.0,0.8,75.0\n"  # rows need not be sorted
+        "2024-01-01,1.0,0.95,84.0\n"
+    )
+    return FXHistory.from_csv(str(path))
+
+
+def test_as_of_lookup_picks_latest_effective_rate(history):
+    dates = np.array(["2022-06-30", "2023-01-01", "2030-01-01", "2021-12-31", "NaT"], dtype="datetime64[D]")
+
+    factors, unknown = history.conversion_factors(dates, ["EUR", "EUR", "INR", "EUR", "EUR"], "USD")
+
+    np.testing.assert_allclose(factors[:3], [1 / 0.8, 1 / 0.9, 1 / 84.0])
+    assert np.isnan(factors[3]) and np.isnan(factors[4]), "no rate before the series or without a date"
+    assert unknown == []
+    assert history.as_of("2023-06-01").rate("EUR", "INR") == pytest.approx(82.0 / 0.9)
+
+
+def test_undated_rows_fall_back_to_spot_rates(history):
+    dates = np.array(["2022-03-01", "NaT", "2023-03-01"], dtype="datetime64[D]")
+    currency = np.array(["EUR", "EUR", "XYZ"], dtype=object)
+
+    factors, unknown, dated = historical_conversion_factors(dates, currency, "USD", SPOT, history)
+
+    np.testing.assert_allclose(factors[:2], [1 / 0.8, 1 / 0.5])
+    assert np.isnan(factors[2])
+    assert unknown == ["XYZ"]
+    assert dated == 1
+
+
+def test_policy_costs_use_rates_at_each_employment_date(history):
+    headers = ["employee_id", "salary", "currency", "employment_date"]
+    rows = [["1", "800", "EUR", "2022-05-01"], ["2", "900", "EUR", "05/01/2023"]]
+    vectors = vectors_from_rows(headers, rows, fx_date_column="employment_date")
+    scenario = Scenario("US", "USD", tax_rate=0.2, social_security=0.0)
+
+    costs = compute_policy_costs(vectors, scenario, {"tax_rate": 0.2, "social_security": 0.0}, SPOT, history)
+
+    assert costs["historical_fx_rows"] == 2
+    assert costs["total_projected_cost"] == pytest.approx(800 / 0.8 + 900 / 0.9)
@@ -0,0 +1,37 @@
+from backend.app.services.location_index import UNRESOLVED, LocationIndex, load_location_index, normalize_location
+
+
+def test_gazetteer_resolves_cities_names_and_codes():
+    index = load_location_index()
+    values = [
+        "London", "Mumbai", "Berlin", "Mexico City", "Sydney", "Toronto", "New York",
+        "München", "munich, germany", "San Francisco, CA", "Somewhere, DE", "Deutschland", "uk",
+    ]
+
+    codes, unresolved = index.resolve(values)
+
+    assert codes.tolist() == ["UK", "IN", "DE", "MX", "AU", "CA", "US", "DE", "DE", "US", "DE", "DE", "UK"]
+    assert unresolved == []
+
+
+def test_fuzzy_fallback_and_unresolved_values():
+    index = load_location_index()
+
+    assert index.resolve_value("Frankfrut") == "DE"
+    assert index.resolve_value("Amsterdm, Netherland") == "NL"
+    assert index.resolve_value("Atlantis") == UNRESOLVED
+    # Countries missing from the gazetteer are not taken for a similar name
+    assert index.resolve_value("Austria") == UNRESOLVED
+    assert index.resolve_value("Iceland") == UNRESOLVED
+    assert index.resolve_value("Reykjavik, Iceland") == UNRESOLVED
+    assert LocationIndex({"DE": "Germany"}, fuzzy_cutoff=1).resolve_value("Germny") == UNRESOLVED
+
+
+def test_column_resolution_broadcasts_distinct_values():
+    index = LocationIndex({"US": "United States", "IN": "India"}, cities={"Mumbai": "IN"})
+    codes, unresolved = index.resolve(["Mumbai", None, "United States", "Mumbai", "Atlantis"], countries=["US"])
+
+    # India is not an accepted country here, so Mumbai is reported as unresolved
+    assert codes.tolist() == [UNRESOLVED, UNRESOLVED, "US", UNRESOLVED, UNRESOLVED]
+    assert unresolved == ["Atlantis", "Mumbai"]
+    assert normalize_location("  Zürich/Genève ") == "ZURICH GENEVE"
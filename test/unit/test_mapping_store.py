@@ -0,0 +1,56 @@
+import multiprocessing
+
+from backend.app.services.mapping_store import MappingStore, header_signature
+
+
+def _finalize_many(path, worker, count):
+    store = MappingStore(path)
+    for index in range(count):
+        store.save({"Pay": "salary", "Worker": f"w{worker}-{index}"}, source_system=f"worker{worker}")
+
+
+def test_signature_ignores_column_order_case_and_padding():
+    assert header_signature(["Name", "Salary "]) == header_signature(["salary", "NAME"])
+    assert header_signature(["Name"]) != header_signature(["Name", "Salary"])
+
+
+def test_latest_mapping_per_schema_and_source_system(tmp_path):
+    store = MappingStore(str(tmp_path / "mappings.sqlite3"))
+    headers = ["Emp Name", "Pay"]
+    first = store.save({"Emp Name": "name", "Pay": "salary"}, headers, "workday")
+    second = store.save({"Emp Name": "name", "Pay": "bonus"}, headers, "sap")
+
+    assert store.latest(["PAY", "emp name"])["mapping_id"] == second
+    workday = store.latest(headers, "workday")
+    assert workday["mapping_id"] == first and workday["mappings"] == {"Emp Name": "name", "Pay": "salary"}
+    assert store.latest(headers, "adp") is None
+    assert store.latest(["Other"]) is None
+
+
+def test_bulk_insert_and_records_survive_reopening(tmp_path):
+    path = str(tmp_path / "mappings.sqlite3")
+    saved = MappingStore(path).save_many(
+        {"mappings": {f"col{index}": "name"}, "source_system": "bulk"} for index in range(50)
+    )
+
+    reopened = MappingStore(path)
+    assert saved == reopened.count() == 50
+    assert [record["mappings"] for record in reopened.records(limit=2)] == [{"col48": "name"}, {"col49": "name"}]
+    # Headers default to the mapped source fields
+    assert reopened.latest(["col7"])["headers"] == ["col7"]
+
+
+def test_concurrent_writers_from_several_processes(tmp_path):
+    path = str(tmp_path / "mappings.sqlite3")
+    MappingStore(path).count()
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=_finalize_many, args=(path, worker, 25)) for worker in range(4)]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join(60)
+
+    assert [process.exitcode for process in workers] == [0] * 4
+    store = MappingStore(path)
+    assert store.count() == 100
+    assert len(store.records(source_system="worker3")) == 25
@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from backend.app.services.cost_engine import Scenario, compute_policy_costs, vectors_from_rows
+from backend.app.services.currency_engine import CurrencyEngine
+from backend.app.services.projection_engine import (
+    ProjectionAssumptions,
+    anniversary_terms,
+    phase_fractions,
+    project_costs,
+)
+
+ENGINE = CurrencyEngine({"USD": 1.0, "EUR": 0.5})
+BASELINE = {"tax_rate": 0.2, "social_security": 0.1}
+HEADERS = ["name", "salary", "bonus", "currency", "hire_date"]
+
+
+def _vectors(rows):
+    return vectors_from_rows(HEADERS, rows, hire_dates=True)
+
+
+def test_flat_projection_sums_to_annual_costs():
+    vectors = _vectors([["A", "120000", "12000", "USD", ""], ["B", "60000", "0", "EUR", ""], ["C", "1", "", "XYZ", ""]])
+    scenario = Scenario("DE", "USD", 0.3, 0.2)
+    assumptions = ProjectionAssumptions(np.datetime64("2025-01"), 12)
+
+    result = project_costs(vectors, scenario, BASELINE, ENGINE, assumptions, block_size=2)
+    annual = compute_policy_costs(vectors, scenario, BASELINE, ENGINE)
+
+    assert result["total_current_cost"] == pytest.approx(annual["total_current_cost"])
+    assert result["total_projected_cost"] == pytest.approx(annual["total_projected_cost"])
+    assert result["excluded_employees"] == 1 and result["unknown_currencies"] == ["XYZ"]
+    months = result["months"]
+    assert [m["month"] for m in months[:2]] == ["2025-01", "2025-02"]
+    # The bonus is paid in December only
+    assert months[11]["current_cost"] - months[0]["current_cost"] == pytest.approx(12000 * 1.1)
+    assert months[-1]["cumulative_delta"] == pytest.approx(result["total_delta"])
+
+
+def test_phased_raise_moves_salary_in_steps():
+    fractions = phase_fractions(8, [(6, 1.0), (2, 0.5)], adjusted=True)
+    np.testing.assert_allclose(fractions, [0, 0, 0.5, 0.5, 0.5, 0.5, 1, 1])
+    assert not phase_fractions(3, [], adjusted=False).any()
+
+    vectors = _vectors([["A", "60000", "", "USD", ""]])
+    result = project_costs(
+        vectors,
+        Scenario("US", "USD", 0.2, 0.0, adjusted_salary=120000),
+        {"tax_rate": 0.2, "social_security": 0.0},
+        ENGINE,
+        ProjectionAssumptions(np.datetime64("2025-01"), 8, raise_phases=[(2, 0.5), (6, 1.0)]),
+    )
+
+    assert [m["projected_cost"] for m in result["months"]] == [5000.0] * 2 + [7500.0] * 4 + [10000.0] * 2
+
+
+def test_hire_anniversaries_drive_merit_raises_and_start_dates():
+    months = np.datetime64("2025-01") + np.arange(14)
+    hire = np.array(["2020-03-15", "2025-06-01", "NaT"], dtype="datetime64[D]")
+
+    anniversaries, active = anniversary_terms(hire, months, 3)
+
+    assert anniversaries[0].tolist() == [0, 0] + [1] * 12  # from March 2025
+    assert anniversaries[1].tolist() == [0] * 14  # first anniversary is June 2026
+    assert active[1].tolist() == [False] * 5 + [True] * 9
+    assert active[2].all() and not anniversaries[2].any()
+
+    vectors = _vectors([["A", "12000", "", "USD", "2020-03-15"]])
+    result = project_costs(
+        vectors,
+        Scenario("US", "USD", 0.0, 0.0),
+        {"tax_rate": 0.0, "social_security": 0.0},
+        ENGINE,
+        ProjectionAssumptions(np.datetime64("2025-01"), 3, annual_raise=0.1),
+    )
+    assert [m["current_cost"] for m in result["months"]] == [1000.0, 1000.0, 1100.0]
+
+
+def test_fx_drift_changes_converted_costs_over_time():
+    vectors = _vectors([["A", "12000", "", "EUR", ""]])
+    result = project_costs(
+        vectors,
+        Scenario("US", "USD", 0.0, 0.0),
+        {"tax_rate": 0.0, "social_security": 0.0},
+        ENGINE,
+        ProjectionAssumptions(np.datetime64("2025-01"), 13, fx_drift={"EUR": 0.25}),
+    )
+
+    costs = [m["current_cost"] for m in result["months"]]
+    assert costs[0] == pytest.approx(2000.0)
+    # EUR units per USD up 25% after a year: each EUR buys fewer USD
+    assert costs[12] == pytest.approx(1600.0)
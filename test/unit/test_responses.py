@@ -0,0 +1,52 @@
+import gzip
+import json
+
+import numpy as np
+import pandas as pd
+
+from backend.app.core import responses
+from backend.app.core.responses import accepts_gzip, dumps, encode_body, frame_rows
+from backend.app.models import CSVResponse
+
+
+def test_frame_rows_are_strings_with_blank_missing_values():
+    df = pd.DataFrame({
+        "tax_rate": np.array([0.22, np.nan], dtype=np.float32),
+        "currency": pd.Categorical(["EUR", None]),
+        "name": ["Ann", None],
+    })
+
+    assert frame_rows(df) == [("0.22", "EUR", "Ann"), ("", "", "")]
+
+
+def test_gzip_negotiation():
+    assert accepts_gzip("gzip, deflate, br")
+    assert accepts_gzip("deflate, gzip;q=0.5")
+    assert accepts_gzip("*")
+    assert not accepts_gzip("gzip;q=0")
+    assert not accepts_gzip("identity")
+    assert not accepts_gzip(None)
+
+
+def test_large_bodies_are_gzipped_only_for_clients_that_accept_it(monkeypatch):
+    monkeypatch.setattr(responses, "GZIP_MIN_BYTES", 1024)
+    content = {"headers": ["name"], "rows": [[f"Employee {index}"] for index in range(200)]}
+
+    small, small_headers = encode_body({"rows": []}, "gzip")
+    plain, plain_headers = encode_body(content, None)
+    compressed, compressed_headers = encode_body(content, "gzip")
+
+    assert small_headers == {} and json.loads(small) == {"rows": []}
+    assert plain_headers == {"Vary": "Accept-Encoding"}
+    assert compressed_headers == {"Vary": "Accept-Encoding", "Content-Encoding": "gzip"}
+    assert gzip.decompress(compressed) == plain and len(compressed) < len(plain)
+
+
+def test_models_and_both_encoders_produce_the_same_json(monkeypatch):
+    model = CSVResponse(headers=["name", "city"], rows=[["Zoë", "Zürich"]])
+    body, _ = encode_body(model)
+    fast = dumps(model.model_dump())
+    monkeypatch.setattr(responses, "orjson", None)
+
+    assert json.loads(body) == json.loads(fast) == model.model_dump()
+    assert dumps(model.model_dump()) == fast
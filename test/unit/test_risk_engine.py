@@ -0,0 +1,68 @@
+import pytest
+
+from backend.app.services.cost_engine import Scenario, compute_policy_costs, vectors_from_rows
+from backend.app.services.risk_engine import aggregate_by_currency, simulate_cost_distribution
+
+EXCHANGE_RATES = {"USD": 1.0, "EUR": 0.5, "JPY": 100.0}
+BASELINE = {"tax_rate": 0.2, "social_security": 0.1}
+
+HEADERS = ["employee_id", "salary", "bonus", "currency"]
+ROWS = [
+    ["1", "100000", "10000", "USD"],
+    ["2", "40000", "", "EUR"],
+    ["3", "50000", "0", ""],
+    ["4", "70000", "0", "XYZ"],
+]
+SCENARIOS = [
+    Scenario("DE", "EUR", tax_rate=0.4, social_security=0.2),
+    Scenario("JP", "JPY", tax_rate=0.5, social_security=0.15, adjusted_salary=9_000_000),
+]
+
+
+def test_aggregate_by_currency_defaults_blank_to_usd():
+    totals = aggregate_by_currency(vectors_from_rows(HEADERS, ROWS), EXCHANGE_RATES)
+
+    by_code = dict(zip(totals.codes, totals.salary))
+    assert by_code == {"USD": 150000.0, "EUR": 40000.0}
+    assert totals.unknown == ["XYZ"]
+    assert totals.excluded == 1
+
+
+def test_zero_volatility_matches_deterministic_costs():
+    vectors = vectors_from_rows(HEADERS, ROWS)
+
+    result = simulate_cost_distribution(
+        vectors, SCENARIOS, BASELINE, EXCHANGE_RATES, n_paths=50,
+        fx_volatility=0.0, rate_volatility=0.0, seed=1,
+    )
+
+    for scenario, row in zip(SCENARIOS, result["scenarios"]):
+        expected = compute_policy_costs(vectors, scenario, BASELINE, EXCHANGE_RATES)
+        summary = row["projected_cost"]
+        assert summary["p5"] == summary["p95"] == pytest.approx(expected["total_projected_cost"])
+        assert row["value_at_risk"] == pytest.approx(0.0, abs=0.01)
+
+
+def test_seeded_runs_are_reproducible_and_spread_with_volatility():
+    vectors = vectors_from_rows(HEADERS, ROWS)
+    options = dict(n_paths=5000, fx_volatility=0.2, rate_volatility=0.01)
+
+    first = simulate_cost_distribution(vectors, SCENARIOS, BASELINE, EXCHANGE_RATES, seed=42, **options)
+    second = simulate_cost_distribution(vectors, SCENARIOS, BASELINE, EXCHANGE_RATES, seed=42, **options)
+
+    assert first == second
+    summary = first["scenarios"][0]["projected_cost"]
+    assert summary["p5"] < summary["p50"] < summary["p95"]
+    assert first["currency_exposure"]["EUR"]["value_at_risk"] > 0
+    # Mean-preserving log-normal: the sampled mean stays near the spot figure
+    spot = compute_policy_costs(vectors, SCENARIOS[0], BASELINE, EXCHANGE_RATES)
+    assert summary["mean"] == pytest.approx(spot["total_projected_cost"], rel=0.02)
+
+
+def test_unknown_scenario_currency_is_rejected():
+    vectors = vectors_from_rows(HEADERS, ROWS)
+    with pytest.raises(ValueError):
+        simulate_cost_distribution(
+            vectors, [Scenario("XX", "XYZ", 0.2, 0.1)], BASELINE, EXCHANGE_RATES,
+            n_paths=10, fx_volatility=0.1, rate_volatility=0.0,
+        )
@@ -0,0 +1,47 @@
+import pytest
+
+from backend.app.services.cost_engine import vectors_from_rows
+from backend.app.services.currency_engine import CurrencyEngine
+from backend.app.services.location_index import UNRESOLVED, LocationIndex
+from backend.app.services.shadow_payroll import compute_shadow_payroll
+from backend.app.services.tax_engine import CountrySchedule
+
+ENGINE = CurrencyEngine({"USD": 1.0, "EUR": 0.5})
+SCHEDULES = {
+    "US": CountrySchedule.flat("US", "USD", 0.2, 0.1),
+    "DE": CountrySchedule.flat("DE", "EUR", 0.4, 0.2),
+}
+INDEX = LocationIndex({"US": "United States", "DE": "Germany"}, fuzzy_cutoff=1)
+
+
+def test_locations_resolve_by_name_code_or_last_part():
+    codes, unresolved = INDEX.resolve(["Berlin, Germany", "de", None, "Atlantis", "", "United States"])
+
+    assert codes.tolist() == ["DE", "DE", UNRESOLVED, UNRESOLVED, UNRESOLVED, "US"]
+    assert unresolved == ["Atlantis"]
+
+
+def test_assignees_get_host_liability_next_to_home_payroll():
+    vectors = vectors_from_rows(
+        ["name", "salary", "currency", "location"],
+        [
+            ["A", "100000", "USD", "Berlin, Germany"],
+            ["B", "50000", "USD", "Munich, Germany"],
+            ["C", "80000", "USD", "United States"],  # at home
+            ["D", "1", "XYZ", "Germany"],  # no exchange rate
+        ],
+        locations=True,
+    )
+    host, _ = INDEX.resolve(vectors.location)
+
+    result = compute_shadow_payroll(vectors, host, ["US"] * 4, SCHEDULES, ENGINE)
+
+    assert result["assignee_count"] == 2
+    assert result["excluded_employees"] == 1 and result["unknown_currencies"] == ["XYZ"]
+    [pair] = result["country_pairs"]
+    assert (pair["home_country"], pair["host_country"], pair["headcount"]) == ("US", "DE", 2)
+    assert pair["home_tax"] == pytest.approx(30000.0)
+    assert pair["host_tax"] == pytest.approx(60000.0)
+    assert pair["host_liability"] == pytest.approx(90000.0)
+    assert pair["host_liability_local"] == pytest.approx(45000.0)
+    assert result["totals"]["host_liability"] == pytest.approx(90000.0)
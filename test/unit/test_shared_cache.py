@@ -0,0 +1,95 @@
+import mmap
+import multiprocessing
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.app.services.dataset_service import SharedDatasetStore
+from backend.app.services.shared_cache import SharedCache, create_cache
+from backend.app.services.simulation_cache import SimulationCache
+
+
+def _store_dataset(directory, queue):
+    store = SharedDatasetStore(4, directory)
+    df = pd.DataFrame({"salary": np.arange(1000.0), "currency": pd.Categorical(["USD", "EUR"] * 500)})
+    queue.put(store.put(df, {"filename": "payroll.csv"}))
+
+
+def _mapped_file(array):
+    base = array
+    while isinstance(base, np.ndarray):
+        base = base.base
+    return isinstance(base, memoryview) and isinstance(base.obj, mmap.mmap)
+
+
+def test_dataset_stored_by_one_worker_is_read_by_another_without_copies(tmp_path):
+    directory = str(tmp_path)
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    writer = context.Process(target=_store_dataset, args=(directory, queue))
+    writer.start()
+    dataset_id = queue.get(timeout=60)
+    writer.join(60)
+
+    store = SharedDatasetStore(4, directory)
+    df = store.get(dataset_id)
+    assert df["salary"].sum() == sum(range(1000))
+    assert df["currency"].tolist()[:2] == ["USD", "EUR"]
+    # Numeric columns and categorical codes are memory-mapped from the entry file
+    assert _mapped_file(df["salary"].to_numpy())
+    assert _mapped_file(df["currency"].cat.codes.to_numpy())
+    assert store.get_metadata(dataset_id)["filename"] == "payroll.csv"
+    assert store.stats()["rows"] == 1000
+
+    # Writes stay private to the worker that makes them
+    df.loc[0, "salary"] = -1.0
+    assert store.get(dataset_id)["salary"].iloc[0] == 0.0
+
+
+def test_least_recently_used_entries_are_evicted_across_workers(tmp_path):
+    first = SharedCache("results", 2, str(tmp_path))
+    second = SharedCache("results", 2, str(tmp_path))
+    first.put(("a",), {"value": 1})
+    second.put(("b",), {"value": 2})
+    os.utime(first._entry_path(("a",)), ns=(0, 0))
+    os.utime(first._entry_path(("b",)), ns=(1, 1))
+    assert second.get(("a",)) == {"value": 1}
+
+    first.put(("c",), {"value": 3})
+
+    assert second.get(("b",)) is None
+    assert [second.get(("a",)), second.get(("c",))] == [{"value": 1}, {"value": 3}]
+    assert first.stats()["entries"] == 2 and first.stats()["evictions"] == 1
+
+
+def test_unreadable_entries_are_misses(tmp_path):
+    cache = SharedCache("results", 4, str(tmp_path))
+    cache.put(("key",), [1, 2])
+    with open(cache._entry_path(("key",)), "wb") as handle:
+        handle.write(b"truncated")
+
+    assert cache.get(("key",)) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_directories_and_entries_others_can_write_are_refused(tmp_path):
+    cache = SharedCache("results", 4, str(tmp_path / "state"))
+    assert os.stat(cache.path).st_mode & 0o777 == 0o700
+
+    # An entry file someone else could have planted is never unpickled
+    cache.put(("key",), [1, 2])
+    os.chmod(cache._entry_path(("key",)), 0o666)
+    assert cache.get(("key",)) is None
+    assert cache.meta(("key",)) is None
+
+    planted = tmp_path / "planted"
+    planted.mkdir(mode=0o777)
+    planted.chmod(0o777)
+    with pytest.raises(PermissionError):
+        SharedCache("results", 4, str(planted))
+
+
+def test_in_process_cache_without_a_shared_directory():
+    assert isinstance(create_cache("results", 4), SimulationCache)
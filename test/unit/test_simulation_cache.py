@@ -0,0 +1,128 @@
+import asyncio
+
+import pytest
+
+from backend.app.core.exceptions import ValidationAPIError
+from backend.app.models import PolicyChange
+from backend.app.services.cost_engine import vectors_from_rows
+from backend.app.services.policy_service import PolicySimulationService
+from backend.app.services.simulation_cache import SimulationCache, content_hash, dataset_hash
+
+
+def test_lru_eviction_and_hit_metrics():
+    cache = SimulationCache(max_entries=2)
+    cache.put(("a",), {"value": 1})
+    cache.put(("b",), {"value": 2})
+    assert cache.get(("a",)) == {"value": 1}  # "a" becomes most recently used
+    cache.put(("c",), {"value": 3})
+
+    assert cache.get(("b",)) is None
+    assert cache.get(("c",)) == {"value": 3}
+    assert cache.stats() == {
+        "entries": 2, "max_entries": 2, "hits": 2, "misses": 1, "evictions": 1, "hit_rate": 0.6667,
+    }
+
+
+def test_cached_results_are_copies():
+    cache = SimulationCache(max_entries=4)
+    result = {"cost_analysis": {"total": 1.0}}
+    cache.put(("k",), result)
+    result["cost_analysis"]["total"] = 2.0
+    cache.get(("k",))["cost_analysis"]["total"] = 3.0
+
+    assert cache.get(("k",)) == {"cost_analysis": {"total": 1.0}}
+
+
+def test_content_hash_is_canonical():
+    assert content_hash({"a": 1, "b": [1, 2]}) == content_hash({"b": [1, 2], "a": 1})
+    assert content_hash({"a": 1}) != content_hash({"a": 2})
+
+
+def test_dataset_hash_is_unambiguous():
+    headers = ["a", "b"]
+    assert dataset_hash(headers, [["1", "2"], ["3", "4"]]) == dataset_hash(headers, [["1", "2"], ["3", "4"]])
+    assert dataset_hash(headers, [["1", "2"]]) != dataset_hash(headers, [["1", "2"]], options={"b": "salary"})
+    # Cells containing separators or empty rows must not collide with other splits
+    assert dataset_hash(headers, [["1\x1f2"]]) != dataset_hash(headers, [["1", "2"]])
+    assert dataset_hash(headers, [["1\x1e2"]]) != dataset_hash(headers, [["1"], ["2"]])
+    assert dataset_hash(headers, [[], ["1"]]) != dataset_hash(headers, [[""], ["1"]])
+
+
+def test_identical_simulations_hit_the_cache():
+    service = PolicySimulationService()
+    headers = ["name", "salary", "currency"]
+    rows = [["A", "50000", "USD"], ["B", "70000", "EUR"]]
+
+    async def run(change, data_rows):
+        return await service.simulate_policy_impact(headers, data_rows, change)
+
+    first = asyncio.run(run(PolicyChange(target_country="DE"), rows))
+    again = asyncio.run(run(PolicyChange(target_country="DE"), [list(row) for row in rows]))
+    asyncio.run(run(PolicyChange(target_country="DE", adjusted_salary=60000), rows))
+    asyncio.run(run(PolicyChange(target_country="DE"), rows + [["C", "1", "USD"]]))
+
+    assert again == first
+    stats = service.result_cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 3, 3)
+
+
+def test_parameter_changes_reuse_dataset_intermediates():
+    service = PolicySimulationService()
+    headers = ["name", "salary", "bonus", "currency"]
+    rows = [["A", "50000", "1000", "USD"], ["B", "70000", "", "EUR"], ["C", "1", "", "XYZ"]]
+    changes = [
+        PolicyChange(target_country="DE"),
+        PolicyChange(target_country="DE", adjusted_salary=60000),
+        PolicyChange(target_country="FR", adjusted_salary=61000),
+        PolicyChange(target_country="DE", new_currency="USD"),
+    ]
+
+    async def run(change):
+        return await service.simulate_policy_impact(headers, rows, change)
+
+    incremental = [asyncio.run(run(change)) for change in changes]
+    vectors = vectors_from_rows(headers, rows)
+    fresh = [PolicySimulationService()._run_simulation(vectors, change) for change in changes]
+
+    assert incremental == fresh
+    # Rows are parsed once; EUR current terms are computed once and reused twice
+    stats = service.intermediates.stats()
+    assert (stats["entries"], stats["hits"]) == (3, 5)
+
+
+def test_every_simulation_reuses_the_dataset_intermediates():
+    service = PolicySimulationService()
+    headers = ["name", "salary", "bonus", "currency", "location"]
+    rows = [["A", "50000", "1000", "USD", "Berlin"], ["B", "70000", "", "EUR", "New York"], ["C", "1", "", "XYZ", ""]]
+    change = PolicyChange(target_country="DE")
+
+    async def run_all():
+        return [
+            await service.simulate_scenarios(headers, rows, [change]),
+            await service.simulate_risk(headers, rows, [change], paths=100, seed=7),
+            await service.simulate_shadow_payroll(headers, rows),
+        ]
+
+    first = asyncio.run(run_all())
+    # Vectors are parsed once per option set; USD current terms serve all three
+    stats = service.intermediates.stats()
+    assert (stats["entries"], stats["hits"]) == (4, 3)
+
+    assert asyncio.run(run_all()) == first
+    assert service.intermediates.stats()["hits"] == 3 + 7
+
+
+def test_simulation_currencies_are_upper_cased_and_validated():
+    service = PolicySimulationService()
+    headers = ["name", "salary", "currency"]
+    rows = [["A", "50000", "USD"], ["B", "70000", "EUR"]]
+
+    async def run(currency):
+        change = PolicyChange(target_country="DE", new_currency=currency)
+        return await service.simulate_policy_impact(headers, rows, change)
+
+    lower = asyncio.run(run("eur"))
+    assert lower == asyncio.run(run("EUR"))
+    assert service.result_cache.stats()["entries"] == 1
+    with pytest.raises(ValidationAPIError, match="Unsupported scenario currencies: XYZ"):
+        asyncio.run(run("XYZ"))
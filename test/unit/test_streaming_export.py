@@ -0,0 +1,106 @@
+import io
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from backend.app.core.config import STANDARD_FIELDS
+from backend.app.services.cost_engine import numeric_column
+from backend.app.services.export_service import ExportService
+from backend.app.utils.mapping_utils import normalize_standardized_values
+
+MAPPINGS = {
+    "emp_id": "employee_id",
+    "name": "full_name",
+    "salary_base": "salary",
+    "curr": "currency",
+    "hire_date": "employment_date",
+}
+
+
+def _write_source(path, rows):
+    with open(path, "w") as handle:
+        handle.write("emp_id,name,salary_base,curr,hire_date,notes\n")
+        for i in range(rows):
+            handle.write(f'{i}, Employee {i} ,"{50000 + i:,}",usd,2021-03-{i % 28 + 1:02d},{"x" * 1000}\n')
+
+
+def test_chunked_export_maps_and_normalizes(tmp_path):
+    source = tmp_path / "source.csv"
+    _write_source(source, 5)
+
+    output = io.StringIO()
+    ExportService.write_standardized_csv(str(source), MAPPINGS, output, chunk_rows=2)
+
+    result = pd.read_csv(io.StringIO(output.getvalue()), dtype=str, keep_default_na=False)
+    assert result.columns.tolist() == STANDARD_FIELDS
+    assert len(result) == 5
+    assert result.loc[0, "full_name"] == "Employee 0"
+    assert result.loc[1, "salary"] == "50001"
+    assert result.loc[2, "currency"] == "USD"
+    assert result.loc[3, "employment_date"] == "2021-03-04"
+    assert result.loc[4, "bonus"] == ""
+
+
+def test_in_memory_and_streaming_exports_are_identical(tmp_path):
+    source = tmp_path / "source.csv"
+    _write_source(source, 6)
+    rows = pd.read_csv(source, dtype=str, keep_default_na=False).to_dict("records")
+
+    for reporting_currency in (None, "EUR"):
+        streamed = io.StringIO()
+        ExportService.write_standardized_csv(
+            str(source), MAPPINGS, streamed, chunk_rows=4, reporting_currency=reporting_currency
+        )
+        in_memory = ExportService.build_standardized_csv(rows, MAPPINGS, reporting_currency)[0]
+
+        assert in_memory == streamed.getvalue()
+
+
+def test_out_of_core_export_memory_is_bounded_by_chunk_size(tmp_path):
+    """End-to-end: the source is several times larger than peak traced memory."""
+    source = tmp_path / "large.csv"
+    target = tmp_path / "standardized.csv"
+    rows = 10_000
+    _write_source(source, rows)
+    source_bytes = source.stat().st_size
+
+    # Warm up so one-time import and cache allocations are not traced
+    warmup = tmp_path / "warmup.csv"
+    _write_source(warmup, 3)
+    ExportService.write_standardized_csv(str(warmup), MAPPINGS, io.StringIO(), chunk_rows=2)
+
+    tracemalloc.start()
+    try:
+        with open(target, "w") as output:
+            ExportService.write_standardized_csv(str(source), MAPPINGS, output, chunk_rows=250)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert peak * 4 < source_bytes, f"peak {peak} bytes for a {source_bytes} byte source"
+    with open(target) as handle:
+        assert sum(1 for _ in handle) == rows + 1
+
+
+def test_export_and_cost_engine_clean_amounts_alike():
+    frame = pd.DataFrame({field: [""] for field in STANDARD_FIELDS})
+    frame.loc[0, ["salary", "tax_rate"]] = ["$ 52,000", "28 %"]
+
+    normalized = normalize_standardized_values(frame)
+
+    assert normalized.loc[0, ["salary", "tax_rate"]].tolist() == ["52000", "28"]
+    assert numeric_column(frame["tax_rate"]).tolist() == [28.0]
+
+
+def test_amounts_that_are_not_plain_numbers_are_exported_unchanged():
+    frame = pd.DataFrame({field: ["", "", ""] for field in STANDARD_FIELDS})
+    frame["salary"] = ["1.234,56", "1,5", "1,234,567.89"]
+    frame["bonus"] = ["n/a", "€ 2.500,00", "12,000"]
+
+    normalized = normalize_standardized_values(frame)
+
+    assert normalized["salary"].tolist() == ["1.234,56", "1,5", "1234567.89"]
+    assert normalized["bonus"].tolist() == ["n/a", "€ 2.500,00", "12000"]
+    # The cost engine does not read a decimal comma as a different number either
+    assert np.isnan(numeric_column(frame["salary"])[:2]).all()
@@ -0,0 +1,109 @@
+import json
+
+import numpy as np
+import pytest
+
+from backend.app.services.cost_engine import Scenario, compute_policy_costs, vectors_from_rows
+from backend.app.services.currency_engine import CurrencyEngine
+from backend.app.services.tax_engine import (
+    ContributionSchedule,
+    CountrySchedule,
+    ProgressiveSchedule,
+    StackedSchedule,
+    available_versions,
+    load_tax_schedules,
+)
+
+BRACKETS = [[0, 0.0], [10000, 0.1], [40000, 0.2], [100000, 0.4]]
+
+
+def _brute_force_tax(income, brackets):
+    tax = 0.0
+    for (lower, rate), upper in zip(brackets, [b for b, _ in brackets[1:]] + [float("inf")]):
+        tax += max(0.0, min(income, upper) - lower) * rate
+    return tax
+
+
+def test_progressive_tax_matches_bracket_by_bracket_sum():
+    schedule = ProgressiveSchedule.from_brackets(BRACKETS)
+    incomes = np.array([-5.0, 0.0, 9999.0, 10000.0, 25000.0, 40000.0, 99999.0, 250000.0])
+
+    expected = [_brute_force_tax(max(income, 0.0), BRACKETS) for income in incomes]
+
+    np.testing.assert_allclose(schedule.tax(incomes), expected)
+    # Any shape works, e.g. a scenarios x employees block
+    assert schedule.tax(incomes.reshape(2, 4)).shape == (2, 4)
+
+
+def test_stacked_schedules_match_each_schedule_on_its_row():
+    schedules = [
+        ProgressiveSchedule.from_brackets(BRACKETS),
+        ProgressiveSchedule.flat(0.3),
+        ContributionSchedule.from_components([{"rate": 0.1, "cap": 50000}]).piecewise,
+    ]
+    incomes = np.array([[-5.0, 0.0, 10000.0, 39999.5, 1e9], [0.0, 1.0, 5e4, 2e5, 3e6], [1.0, 5e4, 6e4, 0.0, 1e7]])
+    scales = [1.0, 0.5, 2.0]  # income currency units per schedule currency unit
+
+    stacked = StackedSchedule.stack(schedules, scales)
+
+    expected = [schedule.tax(row / scale) * scale for schedule, row, scale in zip(schedules, incomes, scales)]
+    np.testing.assert_allclose(stacked.tax(incomes), expected, rtol=1e-12, atol=1e-6)
+
+
+def test_contributions_respect_floor_and_cap():
+    schedule = ContributionSchedule.from_components([
+        {"name": "pension", "rate": 0.1, "cap": 50000},
+        {"name": "health", "rate": 0.05, "floor": 20000},
+    ])
+    incomes = np.array([10000.0, 30000.0, 80000.0])
+
+    np.testing.assert_allclose(
+        schedule.contribution(incomes),
+        [1000.0, 3000.0 + 500.0, 5000.0 + 3000.0],
+    )
+
+
+def test_policy_costs_apply_schedule_in_local_currency():
+    engine = CurrencyEngine({"USD": 1.0, "EUR": 0.5})
+    schedule = CountrySchedule(
+        "DE", "EUR",
+        ProgressiveSchedule.from_brackets([[0, 0.0], [10000, 0.5]]),
+        ContributionSchedule.from_components([{"rate": 0.2, "cap": 20000}]),
+    )
+    baseline = CountrySchedule.flat("US", "USD", 0.25, 0.1)
+    vectors = vectors_from_rows(
+        ["name", "salary", "currency"], [["A", "20000", "USD"], ["B", "100000", "USD"]]
+    )
+
+    result = compute_policy_costs(
+        vectors, Scenario("DE", "USD", 0.0, 0.0, schedule=schedule), baseline, engine
+    )
+
+    # Local EUR pay is 10k and 50k: tax 0 and 20k EUR, social 2k and 4k (capped) EUR
+    assert result["total_projected_tax"] == pytest.approx(40000.0)
+    assert result["total_employer_social_security"] == pytest.approx(12000.0)
+    assert result["total_current_tax"] == pytest.approx(30000.0)
+    assert result["total_current_employer_social_security"] == pytest.approx(12000.0)
+    assert result["total_projected_cost"] == pytest.approx(132000.0)
+
+
+def test_schedule_versions_load_from_directory(tmp_path):
+    for version, rate in (("2024", 0.3), ("2025", 0.35)):
+        (tmp_path / f"{version}.json").write_text(json.dumps({
+            "version": version,
+            "countries": {
+                "XX": {
+                    "currency": "USD",
+                    "income_tax": [[0, rate]],
+                    "employer_social_security": [{"name": "ss", "rate": 0.1}],
+                }
+            },
+        }))
+
+    assert available_versions(str(tmp_path)) == ["2024", "2025"]
+    latest = load_tax_schedules(None, str(tmp_path))
+    assert latest.version == "2025"
+    assert latest.get("XX").income_tax.tax(np.array([100.0]))[0] == pytest.approx(35.0)
+    assert load_tax_schedules("2024", str(tmp_path)).get("XX").version == "2024"
+    with pytest.raises(ValueError):
+        load_tax_schedules("1999", str(tmp_path))
@@ -0,0 +1,50 @@
+import asyncio
+import hashlib
+import io
+import os
+
+import pandas as pd
+import pytest
+from fastapi import UploadFile
+
+from backend.app.core.exceptions import PayloadTooLargeError
+from backend.app.utils.upload_spool import MappedFileReader, spool_upload
+
+
+def test_spool_upload_hashes_and_writes_in_chunks():
+    content = b"employee_id,salary\n" + b"".join(f"{i},{i * 10}\n".encode() for i in range(1000))
+    upload = UploadFile(file=io.BytesIO(content), filename="payroll.csv")
+
+    spooled = asyncio.run(spool_upload(upload, max_size=len(content), chunk_size=512))
+    with spooled:
+        assert spooled.size == len(content)
+        assert spooled.sha256 == hashlib.sha256(content).hexdigest()
+        with open(spooled.path, "rb") as handle:
+            assert handle.read() == content
+    assert not os.path.exists(spooled.path)
+
+
+def test_spool_upload_rejects_oversize_incrementally():
+    upload = UploadFile(file=io.BytesIO(b"x" * 4096), filename="payroll.csv")
+    with pytest.raises(PayloadTooLargeError):
+        asyncio.run(spool_upload(upload, max_size=1000, chunk_size=256))
+    # Only the chunks up to the limit were consumed
+    assert upload.file.tell() <= 1024
+
+
+def test_spool_upload_rejects_known_size_without_reading():
+    upload = UploadFile(file=io.BytesIO(b"x" * 4096), filename="payroll.csv", size=4096)
+    with pytest.raises(PayloadTooLargeError):
+        asyncio.run(spool_upload(upload, max_size=1000))
+    assert upload.file.tell() == 0
+
+
+def test_mapped_reader_parses_non_utf8_csv(tmp_path):
+    path = tmp_path / "latin1.csv"
+    path.write_bytes("name,city\nJosé,Zürich\n".encode("latin1"))
+
+    with MappedFileReader(str(path)) as raw:
+        df = pd.read_csv(io.BufferedReader(raw), encoding="latin1")
+
+    assert df.loc[0, "name"] == "José"
+    assert df.loc[0, "city"] == "Zürich"
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+
+from backend.app.services.cost_engine import rows_frame
+from backend.app.services.validation_service import ValidationService
+
+HEADERS = ["employee_id", "name", "salary", "currency", "tax_rate", "location", "employment_date"]
+
+
+def _report(rows, **options):
+    result = ValidationService.validate_frame(rows_frame(HEADERS, rows), **options)
+    return result, {rule["rule"]: rule for rule in result["rules"]}
+
+
+def test_rules_count_offending_rows_with_their_indices():
+    result, rules = _report([
+        ["E1", "Ana", "50000", "EUR", "0.3", "Berlin", "2020-01-01"],
+        ["", "Ben", "-10", "USD", "150", "New York", "2099-01-01"],
+        ["E3", "Cy", "abc", "XYZ", "28", "London", "not a date"],
+        ["E4", "Di", "60,000", "USD", "", "Mumbai", ""],
+    ])
+
+    assert (result["rows_checked"], result["invalid_rows"], result["valid"]) == (4, 2, False)
+    assert rules["missing_employee_id"]["rows"] == [1]
+    assert rules["negative_salary"]["rows"] == [1]
+    # 28 is read as 28%, like the cost engine does; 150 is out of range
+    assert rules["tax_rate_out_of_range"]["rows"] == [1]
+    assert rules["future_employment_date"]["rows"] == [1]
+    assert rules["invalid_salary"]["rows"] == [2]
+    assert rules["unknown_currency"]["rows"] == [2]
+    assert rules["invalid_employment_date"]["rows"] == [2]
+    # London is paid in XYZ (unknown, already an error) and Mumbai in USD
+    assert rules["currency_location_mismatch"]["rows"] == [3]
+    assert rules["currency_location_mismatch"]["severity"] == "warning"
+
+
+def test_error_budget_stops_the_scan_early(tmp_path):
+    n = 20_000
+    df = pd.DataFrame({
+        "employee_id": np.arange(n).astype(str),
+        "salary": "-1",
+        "currency": "USD",
+    })
+    path = tmp_path / "broken.csv"
+    df.to_csv(path, index=False)
+
+    result = ValidationService.validate_file(str(path), max_errors=10, sample_rows=3)
+
+    assert not result["complete"] and not result["valid"]
+    assert result["rows_checked"] < n
+    negative = next(rule for rule in result["rules"] if rule["rule"] == "negative_salary")
+    assert negative["rows"] == [0, 1, 2]
+
+    full = ValidationService.validate_frame(df, chunk_rows=3_000)
+    assert full["complete"] and full["rows_checked"] == n and full["invalid_rows"] == n